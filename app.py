@@ -1,29 +1,20 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import io
-from PIL import Image as PILImage
-import plotly.io as pio
-
-# Cores da Paleta Living Spa
-VERDE_SALVIA = "#98A869"
-VERDE_MUSGO = "#6D7649"
-BEGE_NEUTRO = "#E6D6CC"
-CREME_SUAVE = "#FAFFE7"
-MARROM_TERRA = "#A39384"
-BRANCO_PURO = "#FFFFFF"
-VERDE_OLIVA_ESCURO = "#3B3418"
-
-# Cores para o gráfico (vibrantes e destacadas)
-COR_SEM_PROMO = "#E74C3C"  # Vermelho vibrante
-COR_COM_PROMO = "#27AE60"  # Verde vibrante
+import math
+from precificador.palette import VERDE_MUSGO, CREME_SUAVE, MARROM_TERRA, VERDE_OLIVA_ESCURO
+from precificador.assets import APP_CSS, LOGO_WIDTH, logo_png
+from precificador.seasonal_store import MONTHS, get_store, service_plural
+from precificador.columnar import ensure_parquet
+from precificador.elasticity import get_model
+from precificador.forecast import HOLT_WINTERS, get_forecast
+from precificador.scenario_history import DEFAULT_PAGE_SIZE as HISTORY_PAGE_SIZE, get_history
+from precificador.charts import create_comparison_chart, sensitivity_figures
+from precificador.seasonal_charts import get_view, tab_label
+from precificador.promo_solver import solve_promotional_price
+from precificador.portfolio import SLOT_MINUTES, demand_matrix, plan_frame, plan_portfolio
+from precificador.demand_risk import DEFAULT_DRAWS, simulate_promotions
+from precificador.report_jobs import FAILED, RUNNING, get_report_queue
+from precificador.profiling import TIMING_LOG_PATH, RerunProfiler, debug_enabled, rerun_timer
 
 # Configuração da página
 st.set_page_config(
@@ -33,6 +24,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Depuração (?debug=1 ou PRECIFICADOR_DEBUG=1): tempo por etapa do rerun e cProfile opcional
+debug_mode = debug_enabled(st.query_params.get("debug"))
+timer = rerun_timer(debug_mode)
+rerun_profiler = RerunProfiler() if debug_mode and st.session_state.pop("profile_next_rerun", False) else None
+
 # Detecta o tema do Streamlit
 def get_theme_mode():
     """Detecta se o tema é dark ou light"""
@@ -45,402 +41,59 @@ def get_theme_mode():
 
 # Carrega os dados sazonais
 def load_seasonal_data():
-    """Carrega os dados sazonais do arquivo CSV"""
-    df = pd.read_csv('dados_sazonais.csv')
-    return df
+    """Retorna os dados sazonais indexados e a previsão do próximo ano, compartilhados entre sessões"""
+    # O CSV é convertido para Parquet uma vez e daí em diante lido em formato colunar
+    path = ensure_parquet('dados_sazonais.csv')
+    return get_store(path), get_forecast(path)
 
-# Função para gerar gráfico de comparação
-def create_comparison_chart(demand, original_price, promotional_price, commission_percentage, service_cost, required_quantity):
-    """Cria um gráfico comparativo de receita e lucro"""
-    
-    # Cálculos
-    commission_decimal = commission_percentage / 100
-    
-    # Sem promoção
-    revenue_without = original_price * demand
-    commission_without = revenue_without * commission_decimal
-    cost_without = service_cost * demand
-    profit_without = revenue_without - commission_without - cost_without
-    
-    # Com promoção (usando quantidade necessária)
-    revenue_with = promotional_price * required_quantity
-    commission_with = revenue_with * commission_decimal
-    cost_with = service_cost * required_quantity
-    profit_with = revenue_with - commission_with - cost_with
-    
-    categories = ['Receita', 'Comissão', 'Custo', 'Lucro']
-    sem_promo = [revenue_without, commission_without, cost_without, profit_without]
-    com_promo = [revenue_with, commission_with, cost_with, profit_with]
-    
-    fig = go.Figure(data=[
-        go.Bar(name='Sem Promoção', x=categories, y=sem_promo, marker_color=COR_SEM_PROMO),
-        go.Bar(name='Com Promoção', x=categories, y=com_promo, marker_color=COR_COM_PROMO)
-    ])
-    
-    fig.update_layout(
-        title="Comparação: Sem Promoção vs Com Promoção",
-        barmode='group',
-        template='plotly_dark',
-        height=400,
-        showlegend=True,
-        yaxis_title="Valor (R$)",
-        hovermode='x unified',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color=BRANCO_PURO)
-    )
-    
-    return fig
+# Acompanha um relatório da fila; quando ele termina, reexecuta a página para liberar o download
+@st.fragment(run_every="1s")
+def report_job_status(job):
+    """Mostra se o relatório está na fila ou sendo gerado"""
+    if job.done:
+        st.rerun()
+    if job.state == RUNNING:
+        st.info(f"⏳ Gerando o relatório em PDF... ({job.elapsed:.0f}s)")
+    else:
+        ahead = report_queue.position(job)
+        st.info(f"🕒 Relatório na fila de geração ({ahead} pedido(s) na frente)")
 
-# Função para gerar gráfico para PDF com cores e texto preto
-def create_comparison_chart_for_pdf(demand, original_price, promotional_price, commission_percentage, service_cost, required_quantity):
-    """Cria um gráfico comparativo para PDF com texto preto"""
-    
-    # Cálculos
-    commission_decimal = commission_percentage / 100
-    
-    # Sem promoção
-    revenue_without = original_price * demand
-    commission_without = revenue_without * commission_decimal
-    cost_without = service_cost * demand
-    profit_without = revenue_without - commission_without - cost_without
-    
-    # Com promoção (usando quantidade necessária)
-    revenue_with = promotional_price * required_quantity
-    commission_with = revenue_with * commission_decimal
-    cost_with = service_cost * required_quantity
-    profit_with = revenue_with - commission_with - cost_with
-    
-    categories = ['Receita', 'Comissão', 'Custo', 'Lucro']
-    sem_promo = [revenue_without, commission_without, cost_without, profit_without]
-    com_promo = [revenue_with, commission_with, cost_with, profit_with]
-    
-    fig = go.Figure(data=[
-        go.Bar(name='Sem Promoção', x=categories, y=sem_promo, marker_color=COR_SEM_PROMO),
-        go.Bar(name='Com Promoção', x=categories, y=com_promo, marker_color=COR_COM_PROMO)
-    ])
-    
-    fig.update_layout(
-        title="Comparação: Sem Promoção vs Com Promoção",
-        barmode='group',
-        template='plotly_white',  # Fundo branco para PDF
-        height=400,
-        showlegend=True,
-        yaxis_title="Valor (R$)",
-        hovermode='x unified',
-        plot_bgcolor='rgba(255,255,255,1)',
-        paper_bgcolor='rgba(255,255,255,1)',
-        font=dict(color='#000000')  # Texto preto
-    )
-    
-    return fig
+# Tempos de uma execução (rerun completo ou do fragmento da precificação) no modo de depuração
+def show_timing(title, timing, profiler, profile_key, scope="app"):
+    """Expander com o tempo por etapa e, se houve captura, o resumo do cProfile"""
+    with st.expander(title, expanded=True):
+        st.caption(f"Total: {timing['total_ms']:.1f} ms · registrado em {TIMING_LOG_PATH}")
+        st.caption(f"Relatórios na fila ou em geração: {report_queue.pending()}")
+        st.dataframe(
+            [{"Etapa": name, "ms": ms} for name, ms in
+             sorted(timing['stages_ms'].items(), key=lambda item: item[1], reverse=True)],
+            use_container_width=True,
+            hide_index=True
+        )
+        if st.button("🔬 Perfilar próxima execução (cProfile)", key=f"{profile_key}_button",
+                     use_container_width=True):
+            st.session_state[profile_key] = True
+            st.rerun(scope=scope)
+        if profiler is not None:
+            st.code(profiler.summary(), language=None)
+            st.download_button("📥 Baixar perfil (.prof)", data=profiler.dump(), key=f"{profile_key}_dump",
+                               file_name=f"{profile_key}.prof", use_container_width=True)
 
-# Função para gerar PDF
-def generate_pdf_report(service, month, demand, std_dev, original_price, service_cost, 
-                        commission_percentage, desired_profit_increase, promotional_price,
-                        revenue_without_promo, commission_without_promo, total_service_cost_without_promo,
-                        spa_revenue_without_promo, desired_spa_revenue, required_quantity,
-                        total_promo_revenue, final_commission, total_service_cost_with_promo,
-                        spa_revenue_with_promo, comparison_chart, is_custom=False):
-    """Gera um relatório em PDF com todas as informações da estratégia de promoção"""
-    
-    # Define o nome do serviço em singular
-    if is_custom:
-        service_singular = "do serviço"
-        service_name_display = "Outros"
-    else:
-        service_singular = "drenagem" if "Drenagem" in service else "massagem"
-        service_name_display = service
-    
-    # Cria buffer para o PDF
-    pdf_buffer = io.BytesIO()
-    
-    # Cria o documento PDF
-    doc = SimpleDocTemplate(pdf_buffer, pagesize=A4,
-                           rightMargin=0.5*inch, leftMargin=0.5*inch,
-                           topMargin=0.5*inch, bottomMargin=0.5*inch)
-    
-    # Lista de elementos do PDF
-    elements = []
-    
-    # Estilos
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor(VERDE_SALVIA),
-        spaceAfter=6,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor(VERDE_MUSGO),
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName='Helvetica-Bold'
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor(VERDE_OLIVA_ESCURO),
-        spaceAfter=6,
-        leading=14
-    )
-    
-    # Título
-    elements.append(Paragraph("🌿 RELATÓRIO DE ESTRATÉGIA DE PROMOÇÃO", title_style))
-    elements.append(Paragraph(f"Living Spa - {datetime.now().strftime('%d/%m/%Y às %H:%M')}", 
-                             ParagraphStyle('subtitle', parent=styles['Normal'], fontSize=10, 
-                                          textColor=colors.HexColor(MARROM_TERRA), alignment=TA_CENTER)))
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Seção 1: Informações Gerais
-    elements.append(Paragraph("1. INFORMAÇÕES GERAIS", heading_style))
-    
-    if is_custom:
-        info_text = f"""
-        <b>Serviço:</b> {service_name_display}<br/>
-        <b>Demanda Esperada:</b> {int(demand)} atendimentos<br/>
-        <b>Data do Relatório:</b> {datetime.now().strftime('%d/%m/%Y')}
-        """
-    else:
-        info_text = f"""
-        <b>Serviço:</b> {service_name_display}<br/>
-        <b>Mês da Promoção:</b> {month}<br/>
-        <b>Data do Relatório:</b> {datetime.now().strftime('%d/%m/%Y')}
-        """
-    elements.append(Paragraph(info_text, normal_style))
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Seção 2: Análise de Demanda (apenas se não for custom)
-    if not is_custom:
-        elements.append(Paragraph("2. ANÁLISE DE DEMANDA", heading_style))
-        
-        demand_text = f"""
-        <b>Demanda Esperada:</b> {int(demand)} atendimentos<br/>
-        <b>Desvio Padrão:</b> ±{std_dev:.2f}
-        """
-        elements.append(Paragraph(demand_text, normal_style))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        section_number = 3
-    else:
-        section_number = 2
-    
-    # Seção de Parâmetros de Precificação
-    elements.append(Paragraph(f"{section_number}. PARÂMETROS DE PRECIFICAÇÃO", heading_style))
-    
-    pricing_text = f"""
-    <b>Preço Original:</b> R$ {original_price:.2f}<br/>
-    <b>Preço Promocional:</b> R$ {promotional_price:.2f}<br/>
-    <b>Desconto:</b> {((1 - promotional_price/original_price) * 100):.1f}%<br/>
-    <b>Custo por Serviço:</b> R$ {service_cost:.2f}<br/>
-    <b>Comissão Massagista:</b> {commission_percentage:.1f}%<br/>
-    <b>Lucro Adicional Desejado:</b> {desired_profit_increase:.1f}%
-    """
-    elements.append(Paragraph(pricing_text, normal_style))
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Seção de Cenário Sem Promoção
-    section_number += 1
-    elements.append(Paragraph(f"{section_number}. CENÁRIO SEM PROMOÇÃO (BASELINE)", heading_style))
-    
-    without_text = f"""
-    <b>Receita Total:</b> R$ {revenue_without_promo:,.2f}<br/>
-    <b>Comissão Massagista:</b> R$ {commission_without_promo:,.2f}<br/>
-    <b>Custo Total:</b> R$ {total_service_cost_without_promo:,.2f}<br/>
-    <b>Lucro Real sem Estratégia:</b> R$ {spa_revenue_without_promo:,.2f}
-    """
-    elements.append(Paragraph(without_text, normal_style))
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Seção de Cenário Com Promoção
-    section_number += 1
-    elements.append(Paragraph(f"{section_number}. CENÁRIO COM PROMOÇÃO (META)", heading_style))
-    
-    if is_custom:
-        service_text = "do serviço"
-    else:
-        service_text = "drenagens" if "Drenagem" in service else "massagens"
-    
-    with_text = f"""
-    <b>Quantidade Necessária:</b> {required_quantity} {service_text}<br/>
-    <b>Receita Total:</b> R$ {total_promo_revenue:,.2f}<br/>
-    <b>Comissão Massagista:</b> R$ {final_commission:,.2f}<br/>
-    <b>Custo Total:</b> R$ {total_service_cost_with_promo:,.2f}<br/>
-    <b>Lucro Real da Estratégia:</b> R$ {spa_revenue_with_promo:,.2f}
-    """
-    elements.append(Paragraph(with_text, normal_style))
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Seção de Resumo Executivo
-    section_number += 1
-    elements.append(Paragraph(f"{section_number}. RESUMO EXECUTIVO", heading_style))
-    
-    lucro_diff = spa_revenue_with_promo - spa_revenue_without_promo
-    lucro_diff_pct = ((spa_revenue_with_promo / spa_revenue_without_promo - 1) * 100) if spa_revenue_without_promo > 0 else 0
-    
-    summary_text = f"""
-    <b>Estratégia:</b> Reduzir o preço de R$ {original_price:.2f} para R$ {promotional_price:.2f} (desconto de {((1 - promotional_price/original_price) * 100):.1f}%)<br/><br/>
-    
-    <b>Objetivo:</b> Aumentar o lucro em {desired_profit_increase:.1f}% em relação ao cenário atual<br/><br/>
-    
-    <b>Meta de Vendas:</b> {required_quantity} {service_text} ao preço promocional<br/><br/>
-    
-    <b>Impacto no Lucro:</b> Aumento de R$ {lucro_diff:,.2f} ({lucro_diff_pct:+.1f}%)<br/><br/>
-    
-    <b>Lucro Esperado:</b> R$ {spa_revenue_with_promo:,.2f} (vs R$ {spa_revenue_without_promo:,.2f} sem promoção)
-    """
-    
-    elements.append(Paragraph(summary_text, normal_style))
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Seção de Gráfico Comparativo
-    section_number += 1
-    elements.append(Paragraph(f"{section_number}. GRÁFICO COMPARATIVO", heading_style))
-    
-    # Salva o gráfico como imagem com fundo branco e texto preto
-    try:
-        img_buffer = io.BytesIO()
-        pio.write_image(comparison_chart, img_buffer, format='png', width=600, height=400)
-        img_buffer.seek(0)
-        img = Image(img_buffer, width=6*inch, height=4*inch)
-        elements.append(img)
-    except:
-        elements.append(Paragraph("Gráfico não disponível nesta versão", normal_style))
-    
-    elements.append(Spacer(1, 0.2*inch))
-    
-    # Rodapé
-    elements.append(Spacer(1, 0.1*inch))
-    footer_text = f"<i>Relatório gerado automaticamente pelo Living Spa Dashboard em {datetime.now().strftime('%d/%m/%Y às %H:%M:%S')}</i>"
-    elements.append(Paragraph(footer_text, ParagraphStyle('footer', parent=styles['Normal'], 
-                                                         fontSize=8, textColor=colors.HexColor(MARROM_TERRA), 
-                                                         alignment=TA_CENTER)))
-    
-    # Constrói o PDF
-    doc.build(elements)
-    pdf_buffer.seek(0)
-    
-    return pdf_buffer
+# CSS personalizado com paleta Living Spa (montado uma vez por processo)
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
-# CSS personalizado com paleta Living Spa
-st.markdown(f"""
-    <style>
-    /* Configurações gerais */
-    :root {{
-        --verde-salvia: {VERDE_SALVIA};
-        --verde-musgo: {VERDE_MUSGO};
-        --bege-neutro: {BEGE_NEUTRO};
-        --creme-suave: {CREME_SUAVE};
-        --marrom-terra: {MARROM_TERRA};
-        --branco-puro: {BRANCO_PURO};
-        --verde-oliva-escuro: {VERDE_OLIVA_ESCURO};
-    }}
-    
-    /* Cards de Métrica */
-    .metric-card {{
-        background: linear-gradient(135deg, {VERDE_SALVIA} 0%, {VERDE_MUSGO} 100%);
-        padding: 20px;
-        border-radius: 12px;
-        margin: 10px 0;
-        border: 2px solid {MARROM_TERRA};
-        color: {BRANCO_PURO};
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }}
-    .metric-card p {{
-        color: {BRANCO_PURO} !important;
-        margin: 5px 0;
-    }}
-    .metric-card strong {{
-        color: {BRANCO_PURO} !important;
-    }}
-    .metric-card h4 {{
-        color: {CREME_SUAVE} !important;
-        margin-top: 0;
-    }}
-    
-    /* Cards de Sucesso */
-    .success-card {{
-        background: linear-gradient(135deg, {VERDE_SALVIA} 0%, {VERDE_MUSGO} 100%);
-        padding: 20px;
-        border-radius: 12px;
-        border-left: 5px solid {MARROM_TERRA};
-        margin: 10px 0;
-        color: {BRANCO_PURO};
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }}
-    .success-card h4 {{
-        color: {CREME_SUAVE} !important;
-        margin-top: 0;
-    }}
-    .success-card p {{
-        color: {BRANCO_PURO} !important;
-        margin: 5px 0;
-    }}
-    .success-card strong {{
-        color: {BRANCO_PURO} !important;
-    }}
-    
-    /* Cards de Aviso */
-    .warning-card {{
-        background: linear-gradient(135deg, {BEGE_NEUTRO} 0%, {CREME_SUAVE} 100%);
-        padding: 20px;
-        border-radius: 12px;
-        border-left: 5px solid {VERDE_SALVIA};
-        margin: 10px 0;
-        color: {VERDE_OLIVA_ESCURO};
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }}
-    .warning-card h4 {{
-        color: {VERDE_MUSGO} !important;
-        margin-top: 0;
-    }}
-    .warning-card p {{
-        color: {VERDE_OLIVA_ESCURO} !important;
-        margin: 5px 0;
-    }}
-    .warning-card strong {{
-        color: {VERDE_MUSGO} !important;
-    }}
-    
-    /* Título */
-    h1 {{
-        color: {VERDE_SALVIA} !important;
-        font-weight: 600;
-    }}
-    
-    h2 {{
-        color: {VERDE_MUSGO} !important;
-    }}
-    
-    /* Texto */
-    body {{
-        color: {VERDE_OLIVA_ESCURO} !important;
-    }}
-    </style>
-""", unsafe_allow_html=True)
+timer.lap("css")
 
-# Detecta o tema e carrega a logo apropriada
+# Detecta o tema e usa a logo apropriada, já decodificada e reduzida (2x, exibida com LOGO_WIDTH)
 theme_mode = get_theme_mode()
-if theme_mode == "dark":
-    logo_path = "Logo-Living-SPA-BRANCO.png"
-else:
-    logo_path = "Logo-Living-SPA-PRETO.png"
+logo = logo_png(theme_mode)
 
 # Título principal com logo
 col_logo, col_title = st.columns([1, 4])
 with col_logo:
-    try:
-        st.image(logo_path, width=100)
-    except:
+    if logo is not None:
+        st.image(logo, width=LOGO_WIDTH)
+    else:
         st.write("🌿")
 
 with col_title:
@@ -448,9 +101,16 @@ with col_title:
     st.markdown("*Análise Sazonal e Estratégia de Promoção Inteligente*")
 
 st.markdown("---")
+timer.lap("cabecalho")
 
 # Carrega dados
-seasonal_data = load_seasonal_data()
+seasonal_data, seasonal_forecast = load_seasonal_data()
+# Elasticidades ajustadas na carga do histórico de preços, compartilhadas entre sessões
+price_model = get_model('historico_precos.csv')
+scenario_history = get_history()
+# Relatórios PDF gerados em processos de trabalho, com fila compartilhada entre sessões
+report_queue = get_report_queue()
+timer.lap("dados")
 
 # Sidebar com navegação
 st.sidebar.title("🌿 Menu")
@@ -458,13 +118,10 @@ page = st.sidebar.radio(
     "Selecione uma página:",
     ["📊 Análise Sazonal", "💰 Precificação Inteligente"]
 )
+# Painel de depuração; preenchido no fim do script, com os tempos do rerun
+debug_panel = st.sidebar.container() if debug_mode else None
+timer.lap("sidebar")
 
-# Meses para referência
-months = {
-    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
-}
 
 # ============================================================================
 # PÁGINA 1: ANÁLISE SAZONAL
@@ -474,313 +131,296 @@ if page == "📊 Análise Sazonal":
     st.markdown("Visualize a demanda média mensal e o desvio padrão dos serviços")
     st.markdown("---")
     
-    # Separa dados por serviço
-    drainage_data = seasonal_data[seasonal_data['Servico'] == 'Drenagem Linfática corporal (50 min)'].sort_values('Mes')
-    massage_data = seasonal_data[seasonal_data['Servico'] == 'Massagem Relaxante (50 min)'].sort_values('Mes')
-    
-    # Cria abas
-    tab1, tab2 = st.tabs(["🌿 Drenagem Linfática", "🧘 Massagem Relaxante"])
-    
-    # ========== TAB 1: DRENAGEM LINFÁTICA ==========
-    with tab1:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("📈 Demanda Mensal")
-            
-            # Gráfico de linha para demanda
-            fig_demand = go.Figure()
-            fig_demand.add_trace(go.Scatter(
-                x=[months[m] for m in drainage_data['Mes']],
-                y=drainage_data['Media'],
-                mode='lines+markers',
-                name='Demanda Média',
-                line=dict(color=VERDE_SALVIA, width=3),
-                marker=dict(size=8, color=VERDE_MUSGO)
-            ))
-            
-            fig_demand.update_layout(
-                title="Demanda Média de Drenagens por Mês",
-                xaxis_title="Mês",
-                yaxis_title="Quantidade de Atendimentos",
-                hovermode='x unified',
-                template='plotly_dark',
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color=BRANCO_PURO)
-            )
-            
-            st.plotly_chart(fig_demand, use_container_width=True)
-        
-        with col2:
-            st.subheader("📊 Desvio Padrão")
-            
-            # Gráfico de barras para desvio padrão
-            fig_std = go.Figure()
-            fig_std.add_trace(go.Bar(
-                x=[months[m] for m in drainage_data['Mes']],
-                y=drainage_data['Desvio_padrao'],
-                name='Desvio Padrão',
-                marker=dict(color=VERDE_SALVIA)
-            ))
-            
-            fig_std.update_layout(
-                title="Variação da Demanda (Desvio Padrão)",
-                xaxis_title="Mês",
-                yaxis_title="Desvio Padrão",
-                hovermode='x unified',
-                template='plotly_dark',
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color=BRANCO_PURO)
-            )
-            
-            st.plotly_chart(fig_std, use_container_width=True)
-        
-        # Tabela com dados
-        st.subheader("Dados Detalhados")
-        display_data = drainage_data.copy()
-        display_data['Mes'] = display_data['Mes'].map(months)
-        display_data = display_data[['Mes', 'Media', 'Desvio_padrao']].rename(
-            columns={'Mes': 'Mês', 'Media': 'Demanda Média', 'Desvio_padrao': 'Desvio Padrão'}
-        )
-        st.dataframe(display_data, use_container_width=True, hide_index=True)
+    # Uma aba por serviço presente em dados_sazonais.csv
+    services = seasonal_data.services
+    # Com on_change="rerun" só a aba aberta é executada e enviada ao navegador
+    tabs = st.tabs([tab_label(service) for service in services], key="seasonal_tab", on_change="rerun")
     
-    # ========== TAB 2: MASSAGEM RELAXANTE ==========
-    with tab2:
-        col1, col2 = st.columns(2)
+    for service, tab in zip(services, tabs):
+        if not tab.open:
+            continue
         
-        with col1:
-            st.subheader("📈 Demanda Mensal")
-            
-            # Gráfico de linha para demanda
-            fig_demand = go.Figure()
-            fig_demand.add_trace(go.Scatter(
-                x=[months[m] for m in massage_data['Mes']],
-                y=massage_data['Media'],
-                mode='lines+markers',
-                name='Demanda Média',
-                line=dict(color=VERDE_MUSGO, width=3),
-                marker=dict(size=8, color=VERDE_SALVIA)
-            ))
-            
-            fig_demand.update_layout(
-                title="Demanda Média de Massagens por Mês",
-                xaxis_title="Mês",
-                yaxis_title="Quantidade de Atendimentos",
-                hovermode='x unified',
-                template='plotly_dark',
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color=BRANCO_PURO)
-            )
-            
-            st.plotly_chart(fig_demand, use_container_width=True)
-        
-        with col2:
-            st.subheader("📊 Desvio Padrão")
-            
-            # Gráfico de barras para desvio padrão - CORRIGIDO PARA VERDE
-            fig_std = go.Figure()
-            fig_std.add_trace(go.Bar(
-                x=[months[m] for m in massage_data['Mes']],
-                y=massage_data['Desvio_padrao'],
-                name='Desvio Padrão',
-                marker=dict(color=VERDE_SALVIA)  # Mudado para VERDE_SALVIA
-            ))
-            
-            fig_std.update_layout(
-                title="Variação da Demanda (Desvio Padrão)",
-                xaxis_title="Mês",
-                yaxis_title="Desvio Padrão",
-                hovermode='x unified',
-                template='plotly_dark',
-                height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color=BRANCO_PURO)
-            )
-            
-            st.plotly_chart(fig_std, use_container_width=True)
-        
-        # Tabela com dados
-        st.subheader("Dados Detalhados")
-        display_data = massage_data.copy()
-        display_data['Mes'] = display_data['Mes'].map(months)
-        display_data = display_data[['Mes', 'Media', 'Desvio_padrao']].rename(
-            columns={'Mes': 'Mês', 'Media': 'Demanda Média', 'Desvio_padrao': 'Desvio Padrão'}
-        )
-        st.dataframe(display_data, use_container_width=True, hide_index=True)
+        # Figuras e tabela vêm do cache compartilhado pela versão dos dados
+        timer.lap("abas")
+        view = get_view(seasonal_data, service)
+        timer.lap("figuras_sazonais")
+        with tab:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("📈 Demanda Mensal")
+                st.plotly_chart(view.demand_figure, use_container_width=True)
+            
+            with col2:
+                st.subheader("📊 Desvio Padrão")
+                st.plotly_chart(view.std_figure, use_container_width=True)
+            
+            # Tabela com dados
+            st.subheader("Dados Detalhados")
+            st.dataframe(view.table, use_container_width=True, hide_index=True)
+        timer.lap("render_sazonal")
 
 # ============================================================================
 # PÁGINA 2: PRECIFICAÇÃO INTELIGENTE
 # ============================================================================
-elif page == "💰 Precificação Inteligente":
-    st.header("💰 Precificação Inteligente")
-    st.markdown("Calcule preços promocionais para atingir suas metas de lucro")
-    st.markdown("---")
-    
+# A página roda em um fragmento: enviar o formulário ou usar os painéis de
+# resultados reexecuta só esta função, sem CSS, cabeçalho e carga de dados.
+# Por isso cada execução do fragmento tem o próprio timer (e cProfile), com
+# uma linha no log e o painel de depuração no fim da página
+@st.fragment
+def pricing_page():
+    """Formulário de precificação e resultados do último cálculo da sessão"""
+    timer = rerun_timer(debug_mode)
+    # Num rerun completo já perfilado o cProfile do app cobre a página: dois perfis ligados ao
+    # mesmo tempo não funcionam (ValueError no Python 3.12+, o segundo substitui o primeiro antes)
+    profile_page = debug_mode and st.session_state.pop("profile_next_fragment", False)
+    app_profiling = rerun_profiler is not None and rerun_profiler.enabled
+    profiler = RerunProfiler() if profile_page and not app_profiling else None
     col1, col2 = st.columns([1, 2])
     
     # ========== COLUNA 1: FORMULÁRIO ==========
     with col1:
         st.subheader("⚙️ Configuração")
         
-        # Seleção de serviço
+        # Seleção de serviço: os serviços dos dados sazonais e um personalizado
         service = st.selectbox(
             "Selecione o Serviço",
-            ["Drenagem Linfática corporal (50 min)", "Massagem Relaxante (50 min)", "Outros"]
+            [*seasonal_data.services, "Outros"]
         )
         
-        # Define o nome do serviço em singular para exibição
+        # Define o nome do serviço para exibição
         is_custom_service = service == "Outros"
         
-        if is_custom_service:
-            service_name = "do serviço"
-            service_name_plural = "do serviço"
-            
-            # Input customizado de demanda
-            demand = st.number_input(
-                "Demanda Esperada",
-                min_value=1.0,
-                value=20.0,
-                step=1.0,
-                format="%.1f",
-                help="Quantidade de atendimentos esperados para este serviço"
-            )
-            std_dev = 0.0  # Sem desvio padrão para serviços customizados
-            current_month = None
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <h4>📊 Dados Customizados</h4>
-                <p><strong>Demanda Esperada:</strong> {demand:.1f} atendimentos</p>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            service_name = "drenagem" if "Drenagem" in service else "massagem"
-            service_name_plural = "drenagens" if "Drenagem" in service else "massagens"
-            
-            # Seleção de mês
-            current_month = st.selectbox(
-                "Mês Atual",
-                list(months.values()),
-                index=datetime.now().month - 1
-            )
-            current_month_num = list(months.values()).index(current_month) + 1
-            
-            # Busca dados do mês selecionado
-            month_data = seasonal_data[
-                (seasonal_data['Servico'] == service) & 
-                (seasonal_data['Mes'] == current_month_num)
-            ]
+        # Os campos só disparam um rerun quando o formulário é enviado
+        with st.form("pricing_form", border=False):
+            if is_custom_service:
+                service_name_plural = "do serviço"
+            
+                # Input customizado de demanda
+                demand = st.number_input(
+                    "Demanda Esperada",
+                    min_value=1.0,
+                    value=20.0,
+                    step=1.0,
+                    format="%.1f",
+                    help="Quantidade de atendimentos esperados para este serviço"
+                )
+                std_dev = 0.0  # Sem desvio padrão para serviços customizados
+                current_month = None
             
-            if not month_data.empty:
-                demand = month_data['Media'].values[0]
-                std_dev = month_data['Desvio_padrao'].values[0]
-                
                 st.markdown(f"""
                 <div class="metric-card">
-                    <h4>📊 Dados do Mês</h4>
-                    <p><strong>Demanda Esperada:</strong> {int(demand)} {service_name_plural}</p>
-                    <p><strong>Desvio Padrão:</strong> ±{std_dev:.2f}</p>
+                    <h4>📊 Dados Customizados</h4>
+                    <p><strong>Demanda Esperada:</strong> {demand:.1f} atendimentos</p>
                 </div>
                 """, unsafe_allow_html=True)
             else:
-                demand = 0
-                std_dev = 0
+                service_name_plural = service_plural(service)
+            
+                # Seleção de mês
+                current_month = st.selectbox(
+                    "Mês Atual",
+                    list(MONTHS.values()),
+                    index=datetime.now().month - 1
+                )
+                current_month_num = list(MONTHS.values()).index(current_month) + 1
+                
+                # Previsão ajustada uma vez por versão dos dados; consultar não custa nada no rerun
+                use_forecast = st.checkbox(
+                    "📈 Usar previsão para o próximo ano",
+                    help="Média e desvio previstos a partir do histórico multi-ano (Holt-Winters ou sazonal ingênuo)"
+                )
+            
+                # Busca dados do mês selecionado
+                month_stats = (seasonal_forecast if use_forecast else seasonal_data).lookup(service, current_month_num)
+            
+                if month_stats is not None:
+                    demand = month_stats.media
+                    std_dev = month_stats.desvio_padrao
+                    
+                    forecast_text = ""
+                    if use_forecast:
+                        interval = seasonal_forecast.interval(service, current_month_num)
+                        fit = seasonal_forecast.fits[service]
+                        method = "Holt-Winters" if fit.method == HOLT_WINTERS else "sazonal ingênuo"
+                        forecast_text = (
+                            f"<p><strong>Intervalo de {interval.level:.0%}:</strong> {interval.lower:.1f} a "
+                            f"{interval.upper:.1f}</p><p><strong>Modelo:</strong> {method} ({fit.years} ano(s) de histórico)</p>"
+                        )
+                
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <h4>📊 {"Previsão do Mês" if use_forecast else "Dados do Mês"}</h4>
+                        <p><strong>Demanda Esperada:</strong> {demand:.0f} {service_name_plural}</p>
+                        <p><strong>Desvio Padrão:</strong> ±{std_dev:.2f}</p>{forecast_text}
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    demand = 0
+                    std_dev = 0
         
-        st.markdown("---")
+            st.markdown("---")
         
-        # Inputs do formulário
-        original_price = st.number_input(
-            "Preço Original (R$)",
-            min_value=0.0,
-            value=100.0,
-            step=0.01,
-            format="%.2f"
-        )
+            # Inputs do formulário
+            original_price = st.number_input(
+                "Preço Original (R$)",
+                min_value=0.0,
+                value=100.0,
+                step=0.01,
+                format="%.2f"
+            )
         
-        service_cost = st.number_input(
-            "Custo por Serviço (R$)",
-            min_value=0.0,
-            value=20.0,
-            step=0.01,
-            format="%.2f",
-            help="Custo do spa para realizar o serviço (materiais, energia, etc)"
-        )
+            service_cost = st.number_input(
+                "Custo por Serviço (R$)",
+                min_value=0.0,
+                value=20.0,
+                step=0.01,
+                format="%.2f",
+                help="Custo do spa para realizar o serviço (materiais, energia, etc)"
+            )
         
-        commission_percentage = st.number_input(
-            "Comissão Massagista (%)",
-            min_value=0.0,
-            max_value=130.0,
-            value=30.0,
-            step=0.5,
-            format="%.1f"
-        )
+            commission_percentage = st.number_input(
+                "Comissão Massagista (%)",
+                min_value=0.0,
+                max_value=130.0,
+                value=30.0,
+                step=0.5,
+                format="%.1f"
+            )
         
-        desired_profit_increase = st.number_input(
-            "Lucro Adicional Desejado (%)",
-            min_value=0.0,
-            value=5.0,
-            step=0.5,
-            format="%.1f"
-        )
+            desired_profit_increase = st.number_input(
+                "Lucro Adicional Desejado (%)",
+                min_value=0.0,
+                value=5.0,
+                step=0.5,
+                format="%.1f"
+            )
         
-        promotional_price = st.number_input(
-            "Preço Promocional (R$)",
-            min_value=0.0,
-            value=100.0,
-            step=0.01,
-            format="%.2f"
-        )
+            promotional_price = st.number_input(
+                "Preço Promocional (R$)",
+                min_value=0.0,
+                value=100.0,
+                step=0.01,
+                format="%.2f"
+            )
+        
+            st.markdown("---")
         
-        st.markdown("---")
+            # Botão de cálculo
+            calculate_button = st.form_submit_button("🧮 Calcular", use_container_width=True, type="primary")
         
-        # Botão de cálculo
-        calculate_button = st.button("🧮 Calcular", use_container_width=True, type="primary")
+            simulate_risk = st.checkbox(
+                "🎲 Simular risco de demanda (Monte Carlo)",
+                value=not is_custom_service,
+                help="Sorteia a demanda a partir da média e do desvio padrão do mês para estimar "
+                     "a chance de atingir a meta e a faixa de lucro provável"
+            )
+        
+            # Otimizador de preço promocional
+            with st.expander("🔎 Otimizador de Preço Promocional"):
+                solver_objective = st.radio(
+                    "Objetivo",
+                    ["Menor volume necessário", "Maior lucro esperado"],
+                    help="Menor volume: menor preço da faixa que exige a menor quantidade de atendimentos. "
+                         "Maior lucro: preço da faixa com maior lucro esperado dada a elasticidade."
+                )
+                # Sem desconto mínimo o menor volume seria sempre o preço original
+                solver_discount = st.slider(
+                    "Faixa de desconto (%)",
+                    min_value=0,
+                    max_value=90,
+                    value=(10, 40),
+                    step=5,
+                    help="A busca considera só preços com desconto dentro desta faixa"
+                )
+                # Elasticidade ajustada do histórico de preços, quando houver ajuste confiável
+                elasticity_fit = None if is_custom_service else price_model.get(service)
+                elasticity = st.number_input(
+                    "Elasticidade-preço da demanda",
+                    max_value=0.0,
+                    value=round(elasticity_fit.elasticity, 2) if elasticity_fit else 0.0,
+                    step=0.1,
+                    format="%.2f",
+                    help="Variação % da demanda para cada 1% de variação no preço (0 = a demanda não reage ao desconto)"
+                )
+                if elasticity_fit:
+                    st.caption(
+                        f"📈 Ajustada do histórico de preços: {elasticity_fit.elasticity:.2f} "
+                        f"(±{elasticity_fit.std_error:.2f}, R² {elasticity_fit.r_squared:.2f}, "
+                        f"{elasticity_fit.n_obs} observações)"
+                    )
+                elif not is_custom_service:
+                    st.caption("Sem histórico de preços suficiente para este serviço: a elasticidade fica em 0 "
+                               "(a demanda não reage ao desconto) até ser informada manualmente.")
+                solve_button = st.form_submit_button("🔎 Encontrar Preço Ideal", use_container_width=True)
+    
+    timer.lap("formulario")
     
     # ========== COLUNA 2: RESULTADOS ==========
     with col2:
+        # Entradas do cálculo, guardadas junto com o resultado na sessão
+        pricing_inputs = dict(
+            service=service, service_name_plural=service_name_plural, is_custom_service=is_custom_service,
+            current_month=current_month, demand=demand, std_dev=std_dev, original_price=original_price,
+            service_cost=service_cost, commission_percentage=commission_percentage,
+            desired_profit_increase=desired_profit_increase, promotional_price=promotional_price,
+            elasticity=elasticity, elasticity_fit=elasticity_fit, simulate_risk=simulate_risk
+        )
+        
+        # Cálculos (mesmo motor usado nas simulações em lote); entradas repetidas vêm do histórico
         if calculate_button and demand > 0:
-            # Cálculos
-            commission_decimal = commission_percentage / 100
-            profit_increase_decimal = desired_profit_increase / 100
-            
-            # ===== CENÁRIO SEM PROMOÇÃO =====
-            revenue_without_promo = original_price * demand
-            total_costs_without_promo = (commission_percentage / 100 * revenue_without_promo) + (service_cost * demand)
-            spa_revenue_without_promo = revenue_without_promo - total_costs_without_promo
-            
-            commission_without_promo = (commission_percentage / 100) * revenue_without_promo
-            total_service_cost_without_promo = service_cost * demand
-            
-            # ===== META DE LUCRO =====
-            desired_spa_revenue = spa_revenue_without_promo * (1 + profit_increase_decimal)
-            
-            # ===== CENÁRIO COM PROMOÇÃO =====
-            profit_per_promo_service = promotional_price - (promotional_price * commission_decimal) - service_cost
-            required_quantity = int(desired_spa_revenue / profit_per_promo_service) + 1
-            
-            # Comissão final
-            total_promo_revenue = promotional_price * required_quantity
-            final_commission = total_promo_revenue * commission_decimal
-            total_service_cost_with_promo = service_cost * required_quantity
-            spa_revenue_with_promo = total_promo_revenue - final_commission - total_service_cost_with_promo
-            
+            scenario, from_history = scenario_history.get_or_compute(
+                service, None if is_custom_service else current_month_num,
+                demand, original_price, promotional_price, service_cost,
+                commission_percentage, desired_profit_increase
+            )
+            st.session_state["pricing_result"] = dict(pricing_inputs, scenario=scenario, from_history=from_history)
+        elif solve_button and demand > 0:
+            solution = solve_promotional_price(
+                demand, std_dev, original_price, service_cost, commission_percentage,
+                desired_profit_increase,
+                objective='min_volume' if solver_objective == "Menor volume necessário" else 'max_profit',
+                elasticity=elasticity, min_discount=solver_discount[0] / 100, max_discount=solver_discount[1] / 100
+            )
+            st.session_state["pricing_result"] = dict(pricing_inputs, solution=solution)
+        elif calculate_button or solve_button:
+            st.session_state.pop("pricing_result", None)
+        timer.lap("calculo")
+        
+        # O último resultado da sessão é reexibido sem recalcular (ex.: ao voltar de outra página)
+        result = st.session_state.get("pricing_result")
+        scenario = solution = None
+        if result is not None:
+            scenario, solution = result.get("scenario"), result.get("solution")
+            service, service_name_plural = result["service"], result["service_name_plural"]
+            is_custom_service, current_month = result["is_custom_service"], result["current_month"]
+            demand, std_dev = result["demand"], result["std_dev"]
+            original_price, service_cost = result["original_price"], result["service_cost"]
+            commission_percentage = result["commission_percentage"]
+            desired_profit_increase = result["desired_profit_increase"]
+            promotional_price, elasticity = result["promotional_price"], result["elasticity"]
+            elasticity_fit, simulate_risk = result["elasticity_fit"], result["simulate_risk"]
+            st.caption(f"Resultado do último cálculo: {service}" + ("" if is_custom_service else f" em {current_month}"))
+            if result.get("from_history"):
+                st.caption("♻️ Cenário já calculado antes, recuperado do histórico")
+        
+        if scenario is not None and not scenario.feasible:
+            st.error(
+                f"❌ O preço promocional de R$ {promotional_price:.2f} não cobre comissão e custo "
+                f"(lucro por atendimento de R$ {scenario.profit_per_promo_service:,.2f}). "
+                "Aumente o preço promocional ou reduza a comissão/custo."
+            )
+        elif scenario is not None:
           # Exibe resultados
             st.subheader("📈 Análise Sem Promoção")
             st.markdown(f"""
             <div class="success-card">
                 <h4>Cenário Atual (Preço Normal)</h4>
                 <p><strong>Demanda Esperada:</strong> {demand:{'.1f' if is_custom_service else '.0f'}} {service_name_plural}</p>
-                <p><strong>Receita Total:</strong> R$ {revenue_without_promo:,.2f}</p>
-                <p><strong>Comissão Massagista:</strong> R$ {commission_without_promo:,.2f}</p>
-                <p><strong>Custo por Serviço:</strong> R$ {total_service_cost_without_promo:,.2f}</p>
-                <p style="font-weight: bold; font-size: 16px; color: {CREME_SUAVE};"><strong>Lucro Real sem Estratégia:</strong> R$ {spa_revenue_without_promo:,.2f}</p>
+                <p><strong>Receita Total:</strong> R$ {scenario.revenue_without_promo:,.2f}</p>
+                <p><strong>Comissão Massagista:</strong> R$ {scenario.commission_without_promo:,.2f}</p>
+                <p><strong>Custo por Serviço:</strong> R$ {scenario.total_service_cost_without_promo:,.2f}</p>
+                <p style="font-weight: bold; font-size: 16px; color: {CREME_SUAVE};"><strong>Lucro Real sem Estratégia:</strong> R$ {scenario.spa_revenue_without_promo:,.2f}</p>
             </div>
             """, unsafe_allow_html=True)
             
@@ -788,14 +428,14 @@ elif page == "💰 Precificação Inteligente":
             
             # Texto dinâmico baseado no serviço
             if is_custom_service:
-                meta_text = f"Você precisa vender {required_quantity} do serviço"
+                meta_text = f"Você precisa vender {scenario.required_quantity} do serviço"
             else:
-                meta_text = f"Você precisa vender {required_quantity} {service_name_plural}"
+                meta_text = f"Você precisa vender {scenario.required_quantity} {service_name_plural}"
             
             st.markdown(f"""
             <div class="warning-card">
                 <h4>Cenário Promocional</h4>
-                <p><strong>Lucro Necessário:</strong> R$ {desired_spa_revenue:,.2f}</p>
+                <p><strong>Lucro Necessário:</strong> R$ {scenario.desired_spa_revenue:,.2f}</p>
                 <p style="font-size: 24px; font-weight: bold; color: {VERDE_MUSGO}; margin: 15px 0;">
                     {meta_text}
                 </p>
@@ -803,44 +443,134 @@ elif page == "💰 Precificação Inteligente":
             </div>
             """, unsafe_allow_html=True)
             
+            # Demanda prevista pelo modelo de elasticidade ajustado do histórico
+            predicted_demand = None
+            if elasticity_fit:
+                predicted_demand = float(price_model.predict(service, demand, original_price, promotional_price))
+            if predicted_demand is not None:
+                shortfall = scenario.required_quantity - predicted_demand
+                if shortfall > 0:
+                    st.warning(
+                        f"📉 Pela elasticidade do histórico ({elasticity_fit.elasticity:.2f}), a demanda prevista a "
+                        f"R$ {promotional_price:.2f} é de {predicted_demand:.1f} {service_name_plural}: "
+                        f"faltam {shortfall:.1f} para a meta de {scenario.required_quantity}."
+                    )
+                else:
+                    st.success(
+                        f"📈 Pela elasticidade do histórico ({elasticity_fit.elasticity:.2f}), a demanda prevista a "
+                        f"R$ {promotional_price:.2f} é de {predicted_demand:.1f} {service_name_plural}, "
+                        f"acima da meta de {scenario.required_quantity}."
+                    )
+            
             col_a, col_b, col_c = st.columns(3)
             with col_a:
-                st.metric("Receita Total", f"R$ {total_promo_revenue:,.2f}")
+                st.metric("Receita Total", f"R$ {scenario.total_promo_revenue:,.2f}")
             with col_b:
-                st.metric("Comissão", f"R$ {final_commission:,.2f}")
+                st.metric("Comissão", f"R$ {scenario.final_commission:,.2f}")
             with col_c:
-                st.metric("Custo Serviço", f"R$ {total_service_cost_with_promo:,.2f}")
+                st.metric("Custo Serviço", f"R$ {scenario.total_service_cost_with_promo:,.2f}")
             
-            st.metric("💰 Lucro Real da Estratégia", f"R$ {spa_revenue_with_promo:,.2f}", delta=f"{((spa_revenue_with_promo / spa_revenue_without_promo - 1) * 100):.1f}%" if spa_revenue_without_promo > 0 else "0%")
+            st.metric("💰 Lucro Real da Estratégia", f"R$ {scenario.spa_revenue_with_promo:,.2f}", delta=f"{scenario.profit_change_percentage:.1f}%" if scenario.spa_revenue_without_promo > 0 else "0%")
             
-            # Gera gráfico comparativo
-            comparison_chart = create_comparison_chart(demand, original_price, promotional_price, 
-                                                      commission_percentage, service_cost, required_quantity)
-            st.plotly_chart(comparison_chart, use_container_width=True)
+            timer.lap("cards")
             
-            # Botão para baixar PDF
-            st.markdown("---")
+            # Gera gráfico comparativo (uma vez por resultado)
+            if "chart" not in result:
+                result["chart"] = create_comparison_chart(scenario, theme='dark')
+            timer.lap("grafico")
+            st.plotly_chart(result["chart"], use_container_width=True)
+            timer.lap("render_grafico")
             
-            # Cria gráfico para PDF com cores e texto preto
-            comparison_chart_pdf = create_comparison_chart_for_pdf(demand, original_price, promotional_price, 
-                                                                   commission_percentage, service_cost, required_quantity)
+            # Simulação de risco de demanda
+            if simulate_risk:
+                st.subheader("🎲 Risco de Demanda (Monte Carlo)")
+                
+                # Preço escolhido e alguns níveis de desconto para comparação
+                risk_prices = sorted(
+                    {round(promotional_price, 2)} | {round(original_price * (1 - d), 2) for d in (0.0, 0.1, 0.2, 0.3)},
+                    reverse=True
+                )
+                if "risk" not in result:
+                    result["risk"] = simulate_promotions(demand, std_dev, original_price, risk_prices, service_cost,
+                                                         commission_percentage, desired_profit_increase,
+                                                         elasticity=elasticity)
+                risk = result["risk"]
+                current = risk_prices.index(round(promotional_price, 2))
+                
+                col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+                with col_r1:
+                    st.metric("Chance de Atingir a Meta", f"{risk['reach_probability'][current] * 100:.1f}%")
+                with col_r2:
+                    st.metric("Lucro P5", f"R$ {risk['profit_p5'][current]:,.2f}")
+                with col_r3:
+                    st.metric("Lucro P50", f"R$ {risk['profit_p50'][current]:,.2f}")
+                with col_r4:
+                    st.metric("Lucro P95", f"R$ {risk['profit_p95'][current]:,.2f}")
+                
+                risk_rows = []
+                for i, price in enumerate(risk['promotional_price']):
+                    quantity = risk['required_quantity'][i]
+                    risk_rows.append({
+                        'Preço Promocional': f"R$ {price:,.2f}" + (" (atual)" if i == current else ""),
+                        'Quantidade Necessária': "inviável" if math.isnan(quantity) else f"{quantity:.0f}",
+                        'Demanda Esperada': f"{risk['expected_demand'][i]:.1f}",
+                        'Chance de Atingir': f"{risk['reach_probability'][i] * 100:.1f}%",
+                        'Lucro P5': f"R$ {risk['profit_p5'][i]:,.2f}",
+                        'Lucro P50': f"R$ {risk['profit_p50'][i]:,.2f}",
+                        'Lucro P95': f"R$ {risk['profit_p95'][i]:,.2f}",
+                    })
+                st.dataframe(risk_rows, use_container_width=True, hide_index=True)
+                st.caption(f"{DEFAULT_DRAWS:,} sorteios de demanda por cenário, com a elasticidade do otimizador ({elasticity:.2f}).")
+                timer.lap("monte_carlo")
             
-            pdf_buffer = generate_pdf_report(
-                service, current_month if not is_custom_service else None, demand, std_dev, original_price, service_cost,
-                commission_percentage, desired_profit_increase, promotional_price,
-                revenue_without_promo, commission_without_promo, total_service_cost_without_promo,
-                spa_revenue_without_promo, desired_spa_revenue, required_quantity,
-                total_promo_revenue, final_commission, total_service_cost_with_promo,
-                spa_revenue_with_promo, comparison_chart_pdf, is_custom=is_custom_service
-            )
+            # Botão para baixar PDF
+            st.markdown("---")
             
-            st.download_button(
-                label="📥 Baixar Relatório em PDF",
-                data=pdf_buffer,
-                file_name=f"Relatorio_Promocao_{current_month if current_month else 'Outros'}_{datetime.now().strftime('%d_%m_%Y')}.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+            # O PDF é gerado na fila de relatórios, em outro processo; pedidos iguais
+            # (inclusive de outras sessões) compartilham a mesma geração
+            report_job = result.get("report_job")
+            if report_job is None and st.button("📄 Gerar Relatório em PDF", use_container_width=True):
+                report_job = result["report_job"] = report_queue.submit(
+                    scenario, service, current_month if not is_custom_service else None,
+                    std_dev, is_custom=is_custom_service, timing=timer.enabled
+                )
+            
+            if report_job is not None and not report_job.done:
+                report_job_status(report_job)
+            elif report_job is not None and report_job.state == FAILED:
+                st.error(f"❌ Não foi possível gerar o relatório: {report_job.error}")
+                if st.button("🔁 Tentar novamente", use_container_width=True):
+                    del result["report_job"]
+                    st.rerun(scope="fragment")
+            elif report_job is not None:
+                st.download_button(
+                    label="📥 Baixar Relatório em PDF",
+                    data=report_job.data,
+                    file_name=f"Relatorio_Promocao_{current_month if current_month else 'Outros'}_{datetime.now().strftime('%d_%m_%Y')}.pdf",
+                    mime="application/pdf",
+                    use_container_width=True
+                )
+            timer.lap("download")
+        
+        elif solution is not None:
+            st.subheader("🔎 Preço Promocional Sugerido")
+            if not solution.feasible:
+                st.error(f"❌ {solution.message}")
+            else:
+                st.markdown(f"""
+                <div class="success-card">
+                    <h4>Preço Ideal: R$ {solution.price:.2f}</h4>
+                    <p><strong>Desconto:</strong> {((1 - solution.price / original_price) * 100):.1f}%</p>
+                    <p><strong>Quantidade Necessária:</strong> {solution.required_quantity} {service_name_plural}</p>
+                    <p><strong>Demanda Esperada no Preço:</strong> {solution.expected_demand:.1f} atendimentos</p>
+                    <p><strong>Lucro Esperado:</strong> R$ {solution.expected_profit:,.2f}</p>
+                    <p><strong>Chance de Atingir a Meta:</strong> {solution.reach_probability * 100:.1f}%</p>
+                </div>
+                """, unsafe_allow_html=True)
+                st.caption(
+                    f"Faixa buscada: R$ {solution.min_price:.2f} a R$ {solution.max_price:.2f}. "
+                    "Informe o preço sugerido no campo 'Preço Promocional' e clique em 'Calcular' para o relatório completo."
+                )
         
         elif not is_custom_service and demand == 0:
             st.error("❌ Dados não encontrados para este mês e serviço")
@@ -849,6 +579,181 @@ elif page == "💰 Precificação Inteligente":
         elif not is_custom_service:
             st.info("👈 Preencha os dados e clique em 'Calcular' para ver os resultados")
 
+    timer.lap("resultados")
+    
+    # ========== ANÁLISE DE SENSIBILIDADE ==========
+    # Só é calculada com o painel aberto; as figuras ficam em cache por tupla de entradas
+    with st.expander("📐 Análise de Sensibilidade", key="sensitivity_panel", on_change="rerun") as sensitivity_panel:
+        if sensitivity_panel.open and demand > 0 and original_price > 0:
+            figures = sensitivity_figures(
+                float(demand), float(std_dev), original_price, promotional_price, service_cost,
+                commission_percentage, desired_profit_increase, elasticity
+            )
+            st.caption(
+                "Usa as entradas atuais e a elasticidade do otimizador. O ✕ marca o cenário atual; "
+                "áreas em branco são combinações em que o preço não cobre comissão e custo."
+            )
+            tab_quantity, tab_profit, tab_tornado = st.tabs(
+                ["📦 Quantidade Necessária", "💰 Lucro Esperado", "🌪️ Tornado"],
+                key="sensitivity_tab", on_change="rerun"
+            )
+            for tab, figure in ((tab_quantity, figures.quantity_heatmap),
+                                (tab_profit, figures.profit_heatmap),
+                                (tab_tornado, figures.tornado)):
+                if tab.open:
+                    with tab:
+                        st.plotly_chart(figure, use_container_width=True)
+        elif sensitivity_panel.open:
+            st.info("👈 Informe demanda e preço original para ver a sensibilidade")
+    
+    timer.lap("sensibilidade")
+
+    # ========== PLANEJADOR ANUAL ==========
+    # Preços de todos os serviços × 12 meses juntos, disputando as mesmas horas de massagistas
+    with st.expander("🗓️ Planejador Anual de Promoções", key="portfolio_panel", on_change="rerun") as portfolio_panel:
+        if portfolio_panel.open and original_price > 0:
+            col_capacity, col_discount = st.columns(2)
+            with col_capacity:
+                capacity_hours = st.number_input(
+                    "Horas de massagistas por mês",
+                    min_value=0.0,
+                    value=120.0,
+                    step=10.0,
+                    format="%.0f",
+                    help=f"Horas de atendimento disponíveis no mês, em sessões de {SLOT_MINUTES} minutos"
+                )
+            with col_discount:
+                max_discount = st.slider("Desconto máximo (%)", 0, 90, 50, step=5)
+
+            planner_services = list(seasonal_data.services)
+            # Valores de cada serviço, editáveis; começam com os do formulário e, na elasticidade,
+            # com a do histórico de preços quando há ajuste confiável
+            planner_inputs = st.data_editor(
+                {
+                    "Serviço": planner_services,
+                    "Preço Original (R$)": [original_price] * len(planner_services),
+                    "Custo (R$)": [service_cost] * len(planner_services),
+                    "Comissão (%)": [commission_percentage] * len(planner_services),
+                    "Elasticidade": [fit.elasticity if fit else elasticity
+                                     for fit in map(price_model.get, planner_services)],
+                },
+                key="planner_inputs",
+                disabled=["Serviço"],
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "Preço Original (R$)": st.column_config.NumberColumn(min_value=0.01, format="R$ %.2f", required=True),
+                    "Custo (R$)": st.column_config.NumberColumn(min_value=0.0, format="R$ %.2f", required=True),
+                    "Comissão (%)": st.column_config.NumberColumn(min_value=0.0, max_value=130.0, format="%.1f",
+                                                                  required=True),
+                    "Elasticidade": st.column_config.NumberColumn(max_value=0.0, format="%.2f", required=True),
+                }
+            )
+            plan = plan_portfolio(
+                planner_services, demand_matrix(seasonal_data, planner_services),
+                planner_inputs["Preço Original (R$)"], planner_inputs["Custo (R$)"],
+                planner_inputs["Comissão (%)"], planner_inputs["Elasticidade"],
+                capacity_hours, max_discount=max_discount / 100
+            )
+
+            col_plan, col_baseline, col_hours = st.columns(3)
+            with col_plan:
+                st.metric("Lucro Anual Planejado", f"R$ {plan.profit.sum():,.2f}",
+                          delta=f"R$ {plan.profit.sum() - plan.baseline_profit.sum():,.2f}")
+            with col_baseline:
+                st.metric("Lucro Anual sem Promoção", f"R$ {plan.baseline_profit.sum():,.2f}")
+            with col_hours:
+                st.metric("Maior Ocupação Mensal", f"{plan.used_hours.max():,.1f} h de {capacity_hours:,.0f} h")
+
+            plan_table = plan_frame(plan)
+            st.dataframe(
+                plan_table.pivot(index="Servico", columns="Mes", values="Preco")[list(MONTHS.values())],
+                use_container_width=True,
+                column_config={month: st.column_config.NumberColumn(format="R$ %.2f") for month in MONTHS.values()}
+            )
+            st.dataframe(
+                plan_table.pivot(index="Servico", columns="Mes", values="Atendimentos")[list(MONTHS.values())],
+                use_container_width=True,
+                column_config={month: st.column_config.NumberColumn(format="%.1f") for month in MONTHS.values()}
+            )
+            st.caption(
+                "Preços (acima) e atendimentos planejados (abaixo) por mês, com o preço original, o custo, a "
+                "comissão e a elasticidade de cada serviço na tabela de entrada. Meses com a capacidade esgotada "
+                "ficam sem promoção e racionam os atendimentos pelo lucro por hora."
+            )
+        elif portfolio_panel.open:
+            st.info("👈 Informe o preço original para planejar as promoções")
+
+    timer.lap("planejador")
+
+    # ========== HISTÓRICO DE CENÁRIOS ==========
+    # Com on_change="rerun" o histórico só é consultado (e o lote pendente gravado) com o painel aberto
+    with st.expander("🗂️ Histórico de Cenários", key="history_panel", on_change="rerun") as history_panel:
+        if history_panel.open:
+            history_service = st.selectbox(
+                "Filtrar por serviço",
+                ["Todos", *seasonal_data.services, "Outros"],
+                key="history_service"
+            )
+            history_filter = None if history_service == "Todos" else history_service
+        
+            # Cursores das páginas já visitadas; trocar o filtro volta para a primeira página
+            if st.session_state.get("history_filter") != history_filter:
+                st.session_state["history_filter"] = history_filter
+                st.session_state["history_cursors"] = [None]
+            cursors = st.session_state.setdefault("history_cursors", [None])
+        
+            history_page = scenario_history.page(HISTORY_PAGE_SIZE, cursor=cursors[-1], service=history_filter)
+            if history_page.entries:
+                st.dataframe(
+                    [
+                        {
+                            "Data": datetime.fromtimestamp(entry.created_at).strftime('%d/%m/%Y %H:%M'),
+                            "Serviço": entry.service,
+                            "Mês": MONTHS.get(entry.month, "-"),
+                            "Demanda": entry.scenario.demand,
+                            "Preço Original": entry.scenario.original_price,
+                            "Preço Promocional": entry.scenario.promotional_price,
+                            "Comissão (%)": entry.scenario.commission_percentage,
+                            "Quantidade Necessária": entry.scenario.required_quantity,
+                            "Lucro com Promoção": entry.scenario.spa_revenue_with_promo,
+                        }
+                        for entry in history_page.entries
+                    ],
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.caption("Nenhum cenário calculado ainda.")
+        
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("⬅️ Mais recentes", disabled=len(cursors) == 1, use_container_width=True):
+                    cursors.pop()
+                    st.rerun(scope="fragment")
+            with col_page:
+                st.caption(f"Página {len(cursors)} de {max(1, math.ceil(scenario_history.count(history_filter) / HISTORY_PAGE_SIZE))}")
+            with col_next:
+                if st.button("Anteriores ➡️", disabled=history_page.cursor is None, use_container_width=True):
+                    cursors.append(history_page.cursor)
+                    st.rerun(scope="fragment")
+    timer.lap("historico")
+
+    if debug_mode:
+        if profiler is not None:
+            profiler.stop()
+        timing = timer.finish(page=page, fragment="pricing_page")
+        show_timing("🛠️ Depuração: tempo da página de precificação", timing, profiler,
+                    "profile_next_fragment", scope="fragment")
+
+
+if page == "💰 Precificação Inteligente":
+    st.header("💰 Precificação Inteligente")
+    st.markdown("Calcule preços promocionais para atingir suas metas de lucro")
+    st.markdown("---")
+    pricing_page()
+    timer.lap("precificacao")
+
 # Footer
 st.markdown("---")
 st.markdown(
@@ -857,3 +762,14 @@ st.markdown(
     "</p>",
     unsafe_allow_html=True
 )
+
+# ============================================================================
+# PAINEL DE DEPURAÇÃO (?debug=1)
+# ============================================================================
+if debug_mode:
+    if rerun_profiler is not None:
+        rerun_profiler.stop()
+    timing = timer.finish(page=page)
+    
+    with debug_panel:
+        show_timing("🛠️ Depuração: tempo do rerun", timing, rerun_profiler, "profile_next_rerun")
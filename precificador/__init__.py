@@ -0,0 +1,20 @@
+"""Núcleo de cálculo do precificador Living Spa.
+
+Pacote importável sem o Streamlit: dados sazonais, motor de precificação,
+otimizador, simulação de risco e relatórios. Os módulos de relatório
+(``pdf_report``, ``pdf_charts``) importam o ReportLab e não são carregados
+aqui, para manter a importação do núcleo leve.
+"""
+from .seasonal_store import MONTHS, MonthStats, SeasonalStore, get_store
+from .pricing import (Scenario, compute_scenario, compute_scenarios, compute_scenarios_cents, revenue_breakdown,
+                      scenario_grid)
+from .promo_solver import SolverResult, solve_promotional_price
+from .demand_risk import simulate_promotions
+
+__all__ = [
+    'MONTHS', 'MonthStats', 'SeasonalStore', 'get_store',
+    'Scenario', 'compute_scenario', 'compute_scenarios', 'compute_scenarios_cents', 'revenue_breakdown',
+    'scenario_grid',
+    'SolverResult', 'solve_promotional_price',
+    'simulate_promotions',
+]
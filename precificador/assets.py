@@ -0,0 +1,142 @@
+"""Recursos visuais do dashboard compartilhados por todas as sessões.
+
+O CSS da paleta e as logos são imutáveis: são montados uma única vez por
+processo e reaproveitados em todo rerun de todas as sessões. As logos são
+decodificadas e reduzidas para a largura exibida na primeira vez em que são
+pedidas, então o Streamlit recebe um PNG pequeno que já não precisa
+redimensionar; como a mídia do Streamlit é indexada pelo conteúdo, os bytes
+ficam guardados uma vez só, por mais sessões que estejam abertas.
+"""
+import io
+import os
+from functools import lru_cache
+
+from .palette import (VERDE_SALVIA, VERDE_MUSGO, BEGE_NEUTRO, CREME_SUAVE, MARROM_TERRA,
+                      BRANCO_PURO, VERDE_OLIVA_ESCURO)
+
+# As logos ficam na raiz do projeto, ao lado do app
+ASSETS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Logo por tema do Streamlit: branca no tema escuro e preta no claro
+LOGO_FILES = {
+    'dark': 'Logo-Living-SPA-BRANCO.png',
+    'light': 'Logo-Living-SPA-PRETO.png',
+}
+# Largura exibida; o PNG tem o dobro de pixels para ficar nítido em telas HiDPI
+LOGO_WIDTH = 100
+LOGO_SCALE = 2
+
+# CSS personalizado com paleta Living Spa
+APP_CSS = f"""
+    <style>
+    /* Configurações gerais */
+    :root {{
+        --verde-salvia: {VERDE_SALVIA};
+        --verde-musgo: {VERDE_MUSGO};
+        --bege-neutro: {BEGE_NEUTRO};
+        --creme-suave: {CREME_SUAVE};
+        --marrom-terra: {MARROM_TERRA};
+        --branco-puro: {BRANCO_PURO};
+        --verde-oliva-escuro: {VERDE_OLIVA_ESCURO};
+    }}
+    
+    /* Cards de Métrica */
+    .metric-card {{
+        background: linear-gradient(135deg, {VERDE_SALVIA} 0%, {VERDE_MUSGO} 100%);
+        padding: 20px;
+        border-radius: 12px;
+        margin: 10px 0;
+        border: 2px solid {MARROM_TERRA};
+        color: {BRANCO_PURO};
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }}
+    .metric-card p {{
+        color: {BRANCO_PURO} !important;
+        margin: 5px 0;
+    }}
+    .metric-card strong {{
+        color: {BRANCO_PURO} !important;
+    }}
+    .metric-card h4 {{
+        color: {CREME_SUAVE} !important;
+        margin-top: 0;
+    }}
+    
+    /* Cards de Sucesso */
+    .success-card {{
+        background: linear-gradient(135deg, {VERDE_SALVIA} 0%, {VERDE_MUSGO} 100%);
+        padding: 20px;
+        border-radius: 12px;
+        border-left: 5px solid {MARROM_TERRA};
+        margin: 10px 0;
+        color: {BRANCO_PURO};
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }}
+    .success-card h4 {{
+        color: {CREME_SUAVE} !important;
+        margin-top: 0;
+    }}
+    .success-card p {{
+        color: {BRANCO_PURO} !important;
+        margin: 5px 0;
+    }}
+    .success-card strong {{
+        color: {BRANCO_PURO} !important;
+    }}
+    
+    /* Cards de Aviso */
+    .warning-card {{
+        background: linear-gradient(135deg, {BEGE_NEUTRO} 0%, {CREME_SUAVE} 100%);
+        padding: 20px;
+        border-radius: 12px;
+        border-left: 5px solid {VERDE_SALVIA};
+        margin: 10px 0;
+        color: {VERDE_OLIVA_ESCURO};
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }}
+    .warning-card h4 {{
+        color: {VERDE_MUSGO} !important;
+        margin-top: 0;
+    }}
+    .warning-card p {{
+        color: {VERDE_OLIVA_ESCURO} !important;
+        margin: 5px 0;
+    }}
+    .warning-card strong {{
+        color: {VERDE_MUSGO} !important;
+    }}
+    
+    /* Título */
+    h1 {{
+        color: {VERDE_SALVIA} !important;
+        font-weight: 600;
+    }}
+    
+    h2 {{
+        color: {VERDE_MUSGO} !important;
+    }}
+    
+    /* Texto */
+    body {{
+        color: {VERDE_OLIVA_ESCURO} !important;
+    }}
+    </style>
+"""
+
+
+@lru_cache(maxsize=None)
+def logo_png(theme, width=LOGO_WIDTH * LOGO_SCALE):
+    """PNG da logo do tema já reduzido para ``width`` pixels (sem ampliar), ou None sem o arquivo"""
+    from PIL import Image
+
+    try:
+        with Image.open(os.path.join(ASSETS_DIR, LOGO_FILES[theme])) as image:
+            width = min(width, image.width)
+            height = round(image.height * width / image.width)
+            logo = image.resize((width, height), Image.LANCZOS)
+    except (FileNotFoundError, KeyError):
+        return None
+
+    buffer = io.BytesIO()
+    logo.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
@@ -0,0 +1,165 @@
+"""Geração em lote dos relatórios de promoção, sem o Streamlit.
+
+Gera um PDF para cada serviço × mês × preço promocional de dados_sazonais.csv,
+distribuindo o trabalho em um pool de processos e gravando cada PDF no arquivo
+zip assim que fica pronto (no máximo alguns relatórios ficam em memória).
+
+Exemplos:
+    python -m precificador.batch_reports --output relatorios.zip --discounts 10 20 30
+    python -m precificador.batch_reports --annual relatorio_anual.pdf --discounts 10
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .pdf_report import (DEFAULT_PDF_CHART_RENDERER, PDF_CHART_RENDERERS, generate_annual_pdf_report,
+                        render_scenario_report)
+from .seasonal_store import DEFAULT_PATH, MONTHS, get_store
+
+
+def _slug(text):
+    """Converte um texto em nome de arquivo seguro e sem acentos"""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_')
+
+
+def build_jobs(store, original_price, service_cost, commission_percentage,
+               desired_profit_increase, discounts, services=None, months=None):
+    """Lista os relatórios a gerar como tuplas (nome no zip, argumentos)"""
+    jobs = []
+    for service in store.services:
+        if services and service not in services:
+            continue
+        for month_num, month_name in MONTHS.items():
+            if months and month_num not in months:
+                continue
+            stats = store.lookup(service, month_num)
+            if stats is None:
+                continue
+            for discount in discounts:
+                promotional_price = round(original_price * (1 - discount / 100), 2)
+                arcname = (f"{_slug(service)}/{month_num:02d}_{_slug(month_name)}/"
+                           f"Relatorio_Promocao_{_slug(month_name)}_{promotional_price:.2f}.pdf")
+                args = (service, month_name, stats.media, stats.desvio_padrao, original_price,
+                        service_cost, commission_percentage, desired_profit_increase,
+                        promotional_price)
+                jobs.append((arcname, args))
+    return jobs
+
+
+def _render_job(job, chart_renderer):
+    """Executa um relatório no processo de trabalho"""
+    arcname, args = job
+    start = time.perf_counter()
+    try:
+        data = render_scenario_report(*args, chart_renderer=chart_renderer)
+    except ValueError as exc:
+        return arcname, None, str(exc), time.perf_counter() - start
+    return arcname, data, None, time.perf_counter() - start
+
+
+def run_batch(jobs, output, workers=None, chart_renderer=DEFAULT_PDF_CHART_RENDERER):
+    """Gera os relatórios em paralelo gravando-os em streaming no zip
+
+    Retorna um dict com as estatísticas de execução.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    stats = {'written': 0, 'skipped': 0, 'pdf_bytes': 0, 'worker_seconds': 0.0}
+    start = time.perf_counter()
+
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def collect(done):
+            """Grava no zip os relatórios concluídos e libera a memória"""
+            for future in done:
+                arcname, data, error, seconds = future.result()
+                stats['worker_seconds'] += seconds
+                if data is None:
+                    stats['skipped'] += 1
+                    print(f"  ignorado {arcname}: {error}", file=sys.stderr)
+                    continue
+                archive.writestr(arcname, data)
+                stats['written'] += 1
+                stats['pdf_bytes'] += len(data)
+
+        # Mantém uma janela limitada de tarefas em andamento
+        pending = set()
+        for job in jobs:
+            pending.add(executor.submit(_render_job, job, chart_renderer))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending).done)
+
+    elapsed = time.perf_counter() - start
+    processed = stats['written'] + stats['skipped']
+    return {
+        'written': stats['written'],
+        'skipped': stats['skipped'],
+        'elapsed': elapsed,
+        'reports_per_second': stats['written'] / elapsed if elapsed > 0 else 0.0,
+        'avg_report_ms': stats['worker_seconds'] / max(processed, 1) * 1000,
+        'pdf_bytes': stats['pdf_bytes'],
+        'zip_bytes': os.path.getsize(output),
+        'workers': workers,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera em lote os relatórios de promoção em um arquivo zip")
+    parser.add_argument('--data', default=DEFAULT_PATH, help="Arquivo de dados sazonais")
+    parser.add_argument('--output', default='relatorios_promocao.zip', help="Arquivo zip de saída")
+    parser.add_argument('--original-price', type=float, default=100.0, help="Preço original (R$)")
+    parser.add_argument('--cost', type=float, default=20.0, help="Custo por serviço (R$)")
+    parser.add_argument('--commission', type=float, default=30.0, help="Comissão da massagista (%%)")
+    parser.add_argument('--profit-increase', type=float, default=5.0, help="Lucro adicional desejado (%%)")
+    parser.add_argument('--discounts', type=float, nargs='+', default=[10.0, 20.0, 30.0],
+                        help="Descontos sobre o preço original (%%), um relatório por desconto")
+    parser.add_argument('--services', nargs='+', help="Restringe a estes serviços")
+    parser.add_argument('--months', type=int, nargs='+', help="Restringe a estes meses (1-12)")
+    parser.add_argument('--workers', type=int, help="Processos de trabalho (padrão: nº de CPUs)")
+    parser.add_argument('--renderer', choices=PDF_CHART_RENDERERS, default=DEFAULT_PDF_CHART_RENDERER,
+                        help="Renderizador do gráfico do PDF")
+    parser.add_argument('--annual', metavar='PDF',
+                        help="Gera um único relatório anual consolidado (usa o primeiro desconto)")
+    args = parser.parse_args(argv)
+
+    store = get_store(args.data)
+
+    if args.annual:
+        promotional_price = round(args.original_price * (1 - args.discounts[0] / 100), 2)
+        start = time.perf_counter()
+        pdf_buffer = generate_annual_pdf_report(store, args.original_price, args.cost, args.commission,
+                                                args.profit_increase, promotional_price,
+                                                services=args.services, chart_renderer=args.renderer)
+        with open(args.annual, 'wb') as f:
+            f.write(pdf_buffer.getvalue())
+        print(f"Relatório anual gravado em {args.annual} em {time.perf_counter() - start:.2f} s")
+        return 0
+
+    jobs = build_jobs(store, args.original_price, args.cost, args.commission, args.profit_increase,
+                      args.discounts, services=args.services, months=args.months)
+    if not jobs:
+        parser.error("nenhum relatório a gerar com os filtros informados")
+
+    print(f"Gerando {len(jobs)} relatórios em {args.output}...")
+    stats = run_batch(jobs, args.output, workers=args.workers, chart_renderer=args.renderer)
+
+    print(f"Relatórios gerados: {stats['written']} (ignorados: {stats['skipped']})")
+    print(f"Tempo total: {stats['elapsed']:.2f} s com {stats['workers']} processos")
+    print(f"Vazão: {stats['reports_per_second']:.1f} relatórios/s "
+          f"(média de {stats['avg_report_ms']:.1f} ms por relatório)")
+    print(f"Tamanho: {stats['pdf_bytes'] / 1024:.0f} KiB em PDFs, "
+          f"{stats['zip_bytes'] / 1024:.0f} KiB no zip")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
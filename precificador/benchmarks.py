@@ -0,0 +1,291 @@
+"""Suíte de benchmarks do precificador, com baseline em JSON.
+
+Mede o motor de precificação (escalar e em lote), o otimizador, os gráficos
+comparativos, a geração do PDF (gráfico vetorial e via kaleido), a previsão
+sazonal do próximo ano, a carga dos dados sazonais em vários tamanhos (CSV e
+Parquet) e a importação a frio do app. Roda offline: os dados maiores são
+sintéticos e gerados em um diretório temporário.
+
+Com ``--save`` o resultado vira o baseline; nas execuções seguintes cada
+benchmark é comparado com ele e a mediana que piorar mais que ``--threshold``
+é marcada como regressão (código de saída 1). Baselines só são comparáveis na
+mesma máquina.
+
+Uso:
+    python -m precificador.benchmarks --save
+    python -m precificador.benchmarks [--threshold 0.2] [--only pdf]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+import numpy as np
+
+from . import seasonal_store
+from .columnar import convert_csv, pyarrow_available, synthetic_history
+from .forecast import forecast_next_year
+from .importtime import measure
+from .money import to_basis_points, to_cents
+from .portfolio import plan_portfolio
+from .pricing import compute_scenario, compute_scenarios, compute_scenarios_cents
+from .promo_solver import solve_promotional_price
+
+DEFAULT_BASELINE_PATH = 'benchmark_baseline.json'
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_REPEAT = 5
+
+# Unidades do histórico sintético usado na carga dos dados sazonais
+# (10 anos × 15 serviços × 12 meses = 1.800 linhas por unidade)
+LOAD_UNITS = (1, 10, 100)
+_ROWS_PER_UNIT = 10 * 15 * 12
+
+# Cenário de referência dos benchmarks
+_SCENARIO = dict(demand=23.0, original_price=100.0, promotional_price=80.0, service_cost=20.0,
+                 commission_percentage=30.0, desired_profit_increase=5.0)
+
+# nome -> função que prepara e retorna (callable medido, observação) ou (None, motivo do pulo)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registra a função de preparação de um benchmark"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark('pricing.scalar')
+def _pricing_scalar(workdir):
+    return (lambda: compute_scenario(**_SCENARIO)), None
+
+
+@benchmark('pricing.batch_100k')
+def _pricing_batch(workdir):
+    prices = np.linspace(30, 100, 100_000)
+    inputs = dict(_SCENARIO, promotional_price=prices)
+    return (lambda: compute_scenarios(**inputs)), "100 mil preços por chamada"
+
+
+@benchmark('pricing.batch_cents_100k')
+def _pricing_batch_cents(workdir):
+    prices = to_cents(np.linspace(30, 100, 100_000))
+    args = (_SCENARIO['demand'], to_cents(_SCENARIO['original_price']), prices, to_cents(_SCENARIO['service_cost']),
+            to_basis_points(_SCENARIO['commission_percentage']), to_basis_points(_SCENARIO['desired_profit_increase']))
+    return (lambda: compute_scenarios_cents(*args)), "núcleo em centavos, sem conversão de/para reais"
+
+
+@benchmark('solver.min_volume')
+def _solver(workdir):
+    args = (_SCENARIO['demand'], 8.0, _SCENARIO['original_price'], _SCENARIO['service_cost'],
+            _SCENARIO['commission_percentage'], _SCENARIO['desired_profit_increase'])
+    return (lambda: solve_promotional_price(*args, elasticity=-1.5)), None
+
+
+def _comparison_chart(theme):
+    from .charts import create_comparison_chart
+
+    scenario = compute_scenario(**_SCENARIO)
+    return (lambda: create_comparison_chart(scenario, theme=theme)), None
+
+
+@benchmark('chart.comparison_dark')
+def _chart_dark(workdir):
+    return _comparison_chart('dark')
+
+
+@benchmark('chart.comparison_light')
+def _chart_light(workdir):
+    return _comparison_chart('light')
+
+
+def _pdf(renderer):
+    from .pdf_report import generate_pdf_report
+
+    scenario = compute_scenario(**_SCENARIO)
+    return (lambda: generate_pdf_report(scenario, 'Massagem Relaxante (50 min)', 'Janeiro', 8.0,
+                                        chart_renderer=renderer)), None
+
+
+@benchmark('pdf.reportlab_chart')
+def _pdf_reportlab(workdir):
+    return _pdf('reportlab')
+
+
+@benchmark('pdf.kaleido_chart')
+def _pdf_kaleido(workdir):
+    if importlib.util.find_spec('kaleido') is None:
+        return None, "kaleido não instalado"
+    return _pdf('plotly')
+
+
+@benchmark('forecast.next_year')
+def _forecast(workdir):
+    df = synthetic_history(years=10, units=10, services=15)
+    return (lambda: forecast_next_year(df)), f"{len(df):,} linhas, 15 serviços"
+
+
+@benchmark('planner.portfolio_25x12')
+def _portfolio(workdir):
+    rng = np.random.default_rng(0)
+    demand = rng.uniform(5, 60, (25, 12))
+    original_price = rng.uniform(80, 250, 25)
+    args = ([f"Serviço {i}" for i in range(25)], demand, original_price, original_price * 0.25,
+            _SCENARIO['commission_percentage'], rng.uniform(-3, -0.5, 25), 300.0)
+    return (lambda: plan_portfolio(*args)), "25 serviços × 12 meses, capacidade esgotada"
+
+
+def _load(path):
+    """Carga sem cache: descarta o store do processo antes de cada leitura"""
+    key = os.path.abspath(path)
+
+    def load():
+        seasonal_store._stores.discard(key)
+        return seasonal_store.get_store(key)
+    return load
+
+
+def _load_benchmark(units, suffix):
+    def setup(workdir):
+        if suffix == '.parquet' and not pyarrow_available():
+            return None, "pyarrow não instalado"
+        csv_path = os.path.join(workdir, f'historico_{units}.csv')
+        if not os.path.exists(csv_path):
+            synthetic_history(years=10, units=units, services=15).to_csv(csv_path, index=False)
+        path = csv_path if suffix == '.csv' else convert_csv(csv_path)
+        return _load(path), f"{units * _ROWS_PER_UNIT:,} linhas"
+    return setup
+
+
+for _units in LOAD_UNITS:
+    for _suffix in ('.csv', '.parquet'):
+        benchmark(f"load.{_suffix[1:]}_{_units * _ROWS_PER_UNIT / 1000:g}k")(_load_benchmark(_units, _suffix))
+
+
+@benchmark('load.dados_sazonais_csv')
+def _load_repo_data(workdir):
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados_sazonais.csv')
+    return _load(path), None
+
+
+def _time(func, repeat):
+    """Tempos por chamada (s) de ``repeat`` rodadas, com número de laços calibrado"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+
+
+def run(names=None, repeat=DEFAULT_REPEAT):
+    """Executa os benchmarks e retorna {nome: resultado}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, setup in BENCHMARKS.items():
+            if names and not any(part in name for part in names):
+                continue
+            func, note = setup(workdir)
+            if func is None:
+                results[name] = {'skipped': note}
+                continue
+            timings = _time(func, repeat)
+            results[name] = {'median_s': statistics.median(timings), 'min_s': min(timings), 'note': note}
+
+    # Importação a frio em processos novos (já mede a mediana)
+    for name, module in (('import.precificador', 'precificador'), ('import.app', 'app')):
+        if names and not any(part in name for part in names):
+            continue
+        timings, loaded = measure(module, repeat=repeat)
+        results[name] = {'median_s': statistics.median(timings), 'min_s': min(timings),
+                         'note': f"carrega {', '.join(loaded) or 'nada pesado'}"}
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Razão mediana atual / baseline por benchmark e lista das regressões"""
+    ratios, regressions = {}, []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name, {})
+        if 'median_s' not in result or 'median_s' not in reference:
+            continue
+        ratio = result['median_s'] / reference['median_s']
+        ratios[name] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return ratios, regressions
+
+
+def _environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+
+
+def _format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:,.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:,.1f}ms"
+    return f"{seconds:,.2f}s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do precificador com baseline em JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="Arquivo JSON do baseline")
+    parser.add_argument('--save', action='store_true', help="Grava o resultado como novo baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Piora relativa da mediana considerada regressão (0.2 = 20%%)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Rodadas por benchmark")
+    parser.add_argument('--only', nargs='+', help="Roda só benchmarks cujo nome contém um destes trechos")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.repeat)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    ratios, regressions = compare(results, baseline, args.threshold) if baseline else ({}, [])
+
+    if args.json:
+        print(json.dumps({'results': results, 'ratios': ratios, 'regressions': regressions},
+                         indent=2, ensure_ascii=False))
+    else:
+        print(f"{'Benchmark':<28} {'mediana':>11} {'mínimo':>11} {'vs base':>9}  observação")
+        for name, result in results.items():
+            if 'skipped' in result:
+                print(f"{name:<28} {'-':>11} {'-':>11} {'-':>9}  pulado: {result['skipped']}")
+                continue
+            ratio = f"{ratios[name]:.2f}x" if name in ratios else '-'
+            flag = '  REGRESSÃO' if name in regressions else ''
+            print(f"{name:<28} {_format_seconds(result['median_s']):>11} {_format_seconds(result['min_s']):>11} "
+                  f"{ratio:>9}  {result['note'] or ''}{flag}")
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'created_at': datetime.now().isoformat(timespec='seconds'),
+                       'environment': _environment(), 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f"Baseline gravado em {args.baseline}")
+    elif baseline is None:
+        print(f"Sem baseline em {args.baseline}; rode com --save para criar um.")
+    elif baseline.get('environment') != _environment():
+        print("Aviso: baseline gravado em outro ambiente; as razões podem não ser comparáveis.")
+
+    if regressions:
+        print(f"{len(regressions)} regressão(ões) acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
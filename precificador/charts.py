@@ -0,0 +1,173 @@
+"""Gráficos Plotly do dashboard (comparativo e sensibilidade) e da versão do relatório exportada via kaleido."""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+import plotly.graph_objects as go
+
+from .palette import BRANCO_PURO, COR_SEM_PROMO, COR_COM_PROMO
+from . import sensitivity
+
+CATEGORIES = ['Receita', 'Comissão', 'Custo', 'Lucro']
+
+# Temas do gráfico comparativo: dashboard escuro e PDF com fundo branco e texto preto
+CHART_THEMES = {
+    'dark': dict(
+        template='plotly_dark',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color=BRANCO_PURO)
+    ),
+    'light': dict(
+        template='plotly_white',
+        plot_bgcolor='rgba(255,255,255,1)',
+        paper_bgcolor='rgba(255,255,255,1)',
+        font=dict(color='#000000')
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def _base_comparison_figure(theme):
+    """Figura base do comparativo (traces e layout), criada uma vez por tema"""
+    fig = go.Figure(data=[
+        go.Bar(name='Sem Promoção', x=CATEGORIES, marker_color=COR_SEM_PROMO),
+        go.Bar(name='Com Promoção', x=CATEGORIES, marker_color=COR_COM_PROMO)
+    ])
+
+    fig.update_layout(
+        title="Comparação: Sem Promoção vs Com Promoção",
+        barmode='group',
+        height=400,
+        showlegend=True,
+        yaxis_title="Valor (R$)",
+        hovermode='x unified',
+        **CHART_THEMES[theme]
+    )
+
+    return fig
+
+
+# Função para gerar gráfico de comparação
+def create_comparison_chart(scenario, theme='dark'):
+    """Cria o gráfico comparativo de receita e lucro de um Scenario
+
+    ``theme='dark'`` é usado no dashboard e ``'light'`` no PDF exportado via
+    kaleido. A figura retornada é uma cópia e pode ser alterada livremente.
+    """
+    if theme not in CHART_THEMES:
+        raise ValueError(f"Tema de gráfico inválido: {theme!r}")
+
+    fig = go.Figure(_base_comparison_figure(theme))
+    fig.data[0].y = scenario.without_promo
+    fig.data[1].y = scenario.with_promo
+    return fig
+
+
+# Métricas disponíveis no mapa de calor de sensibilidade: campo da grade -> (título, escala de cor)
+SENSITIVITY_METRICS = {
+    'required_quantity': ("Quantidade Necessária para a Meta", 'Viridis'),
+    'expected_profit': ("Lucro Esperado com a Promoção (R$)", 'RdYlGn'),
+}
+
+
+def sensitivity_heatmap(grid, metric, promotional_price=None, commission_percentage=None, theme='dark'):
+    """Mapa de calor de uma métrica da SensitivityGrid sobre preço × comissão
+
+    O ponto atual (preço promocional e comissão) é marcado quando informado.
+    Na quantidade necessária a escala é limitada ao percentil 95 para que os
+    valores explosivos perto do ponto de equilíbrio não achatem o resto.
+    """
+    title, colorscale = SENSITIVITY_METRICS[metric]
+    values = getattr(grid, metric)
+
+    zmax = None
+    if metric == 'required_quantity' and np.isfinite(values).any():
+        zmax = float(np.nanpercentile(values, 95))
+
+    fig = go.Figure(go.Heatmap(
+        x=grid.commissions,
+        y=grid.prices,
+        z=values,
+        zmax=zmax,
+        colorscale=colorscale,
+        hovertemplate="Comissão: %{x:.1f}%<br>Preço: R$ %{y:.2f}<br>Valor: %{z:,.0f}<extra></extra>",
+    ))
+    if promotional_price is not None and commission_percentage is not None:
+        fig.add_trace(go.Scatter(
+            x=[commission_percentage], y=[promotional_price], mode='markers', name='Cenário atual',
+            marker=dict(symbol='x', size=12, color=BRANCO_PURO if theme == 'dark' else '#000000'),
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Comissão (%)",
+        yaxis_title="Preço Promocional (R$)",
+        height=450,
+        showlegend=False,
+        **CHART_THEMES[theme]
+    )
+    return fig
+
+
+def tornado_chart(tornado, theme='dark'):
+    """Gráfico tornado da quantidade necessária ao variar cada fator"""
+    factors = [bar.factor for bar in reversed(tornado.bars)]
+    base = tornado.base_quantity
+
+    fig = go.Figure([
+        go.Bar(
+            name='Fator reduzido',
+            y=factors,
+            x=[bar.low_quantity - base for bar in reversed(tornado.bars)],
+            base=base,
+            orientation='h',
+            marker_color=COR_SEM_PROMO,
+            customdata=[[bar.low_value, bar.low_quantity] for bar in reversed(tornado.bars)],
+            hovertemplate="Valor: %{customdata[0]:,.2f}<br>Quantidade: %{customdata[1]:,.0f}<extra></extra>",
+        ),
+        go.Bar(
+            name='Fator aumentado',
+            y=factors,
+            x=[bar.high_quantity - base for bar in reversed(tornado.bars)],
+            base=base,
+            orientation='h',
+            marker_color=COR_COM_PROMO,
+            customdata=[[bar.high_value, bar.high_quantity] for bar in reversed(tornado.bars)],
+            hovertemplate="Valor: %{customdata[0]:,.2f}<br>Quantidade: %{customdata[1]:,.0f}<extra></extra>",
+        ),
+    ])
+    fig.add_vline(x=base, line_dash='dash', line_color=BRANCO_PURO if theme == 'dark' else '#000000')
+
+    fig.update_layout(
+        title=f"Sensibilidade da Quantidade Necessária (±{tornado.swing:.0%})",
+        barmode='overlay',
+        xaxis_title="Quantidade Necessária",
+        height=350,
+        **CHART_THEMES[theme]
+    )
+    return fig
+
+
+# Figuras da análise de sensibilidade de um conjunto de entradas
+SensitivityFigures = namedtuple('SensitivityFigures', ['quantity_heatmap', 'profit_heatmap', 'tornado'])
+
+
+@lru_cache(maxsize=32)
+def sensitivity_figures(demand, std_dev, original_price, promotional_price, service_cost,
+                        commission_percentage, desired_profit_increase, elasticity=0.0, theme='dark'):
+    """Mapas de calor e tornado das entradas, memorizados por tupla de entradas
+
+    As figuras são compartilhadas entre sessões e não devem ser modificadas.
+    """
+    grid = sensitivity.price_commission_grid(demand, std_dev, original_price, service_cost,
+                                             desired_profit_increase, elasticity)
+    return SensitivityFigures(
+        quantity_heatmap=sensitivity_heatmap(grid, 'required_quantity', promotional_price,
+                                             commission_percentage, theme),
+        profit_heatmap=sensitivity_heatmap(grid, 'expected_profit', promotional_price,
+                                           commission_percentage, theme),
+        tornado=tornado_chart(sensitivity.tornado(demand, std_dev, original_price, promotional_price,
+                                                  service_cost, commission_percentage,
+                                                  desired_profit_increase, elasticity), theme),
+    )
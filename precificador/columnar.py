@@ -0,0 +1,301 @@
+"""Armazenamento colunar (Parquet) do histórico sazonal.
+
+O CSV continua sendo a fonte de importação: ``ensure_parquet`` converte o
+arquivo uma única vez (e de novo só quando o conteúdo do CSV mudar) para um
+Parquet ordenado por serviço/ano/mês, com estatísticas por row group. A
+leitura usa memory map, projeção de colunas e filtros empurrados para o
+leitor, que pula row groups inteiros fora de ``Servico``/``Mes``/``Ano``.
+
+O pyarrow é opcional: sem ele ``ensure_parquet`` devolve o caminho do CSV.
+
+Uso:
+    python -m precificador.columnar convert [dados_sazonais.csv]
+    python -m precificador.columnar bench [--years 10] [--units 20] [--services 15]
+"""
+import argparse
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .seasonal_store import file_signature
+
+PARQUET_SUFFIX = '.parquet'
+
+# Colunas do histórico; Ano e Unidade são opcionais
+REQUIRED_COLUMNS = ('Mes', 'Servico', 'Media', 'Desvio_padrao')
+HISTORY_COLUMNS = ('Ano', 'Unidade') + REQUIRED_COLUMNS
+
+# Ordem física das linhas: agrupa os serviços para a pushdown pular row groups
+SORT_COLUMNS = ('Servico', 'Unidade', 'Ano', 'Mes')
+ROW_GROUP_SIZE = 16 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Metadado do Parquet com o hash do CSV de origem
+SOURCE_HASH_KEY = b'precificador.source_sha1'
+
+_convert_lock = threading.Lock()
+_checked = {}  # caminho do CSV -> (assinatura do CSV, assinatura do Parquet) da última verificação
+
+
+def pyarrow_available():
+    """Indica se o pyarrow está instalado"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def parquet_path_for(csv_path):
+    """Caminho do Parquet correspondente a um CSV"""
+    return os.path.splitext(csv_path)[0] + PARQUET_SUFFIX
+
+
+def file_version(path):
+    """Hash de todo o conteúdo do Parquet
+
+    O rodapé sozinho não basta: trocar um valor por outro do mesmo tamanho
+    mantém o rodapé idêntico quando min/max do row group não mudam. O arquivo
+    é lido em blocos; só é re-hasheado quando mtime/tamanho mudam.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        f.seek(-4, os.SEEK_END)
+        if f.read(4) != b'PAR1':
+            raise ValueError(f"{path} não é um arquivo Parquet")
+        f.seek(0)
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hash(path):
+    """Hash do CSV de origem gravado no Parquet, ou None"""
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_schema(path, memory_map=True).metadata or {}
+    digest = metadata.get(SOURCE_HASH_KEY)
+    return None if digest is None else digest.decode()
+
+
+def write_parquet(df, path, source=None):
+    """Grava o histórico ordenado, com dicionário nas colunas de texto
+
+    ``source`` é o hash do CSV de origem, guardado nos metadados do arquivo.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Colunas ausentes nos dados sazonais: {', '.join(missing)}")
+
+    columns = [column for column in HISTORY_COLUMNS if column in df.columns]
+    sort_by = [column for column in SORT_COLUMNS if column in df.columns]
+    df = df[columns].sort_values(sort_by, kind='stable').reset_index(drop=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if source is not None:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), SOURCE_HASH_KEY: source.encode()})
+    # Grava em arquivo temporário e troca atomicamente: leitores nunca veem meio arquivo
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(suffix=PARQUET_SUFFIX, dir=directory)
+    os.close(fd)
+    try:
+        pq.write_table(
+            table, tmp_path,
+            row_group_size=ROW_GROUP_SIZE,
+            use_dictionary=[column for column in ('Servico', 'Unidade') if column in columns],
+            write_statistics=True,
+            compression='zstd',
+        )
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def convert_csv(csv_path, parquet_path=None):
+    """Converte o CSV de dados sazonais para Parquet e retorna o caminho gravado"""
+    parquet_path = parquet_path or parquet_path_for(csv_path)
+    with open(csv_path, 'rb') as f:
+        raw = f.read()
+    write_parquet(pd.read_csv(io.BytesIO(raw)), parquet_path, source=hashlib.sha1(raw).hexdigest())
+    return parquet_path
+
+
+def _csv_hash(csv_path):
+    """Hash do conteúdo do CSV"""
+    with open(csv_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _signatures(csv_path, parquet_path):
+    """(assinatura do CSV, assinatura do Parquet), ou None sem o Parquet"""
+    if not os.path.exists(parquet_path):
+        return None
+    return file_signature(csv_path), file_signature(parquet_path)
+
+
+def ensure_parquet(csv_path):
+    """Retorna o Parquet do CSV, convertendo só se ele não existir ou estiver desatualizado
+
+    O Parquet guarda o hash do CSV de origem. A cada chamada só é feito um
+    ``os.stat`` dos dois arquivos; quando algum deles muda, o CSV é
+    re-hasheado e convertido de novo se o hash não bate (um CSV restaurado
+    com mtime antigo ou editado sem mudar de tamanho também é detectado).
+    Sem pyarrow, retorna o próprio CSV.
+    """
+    if not pyarrow_available():
+        return csv_path
+
+    parquet_path = parquet_path_for(csv_path)
+    if not os.path.exists(csv_path):
+        return parquet_path
+
+    key = os.path.abspath(csv_path)
+    with _convert_lock:
+        signatures = _signatures(csv_path, parquet_path)
+        if signatures is not None and _checked.get(key) == signatures:
+            return parquet_path
+        if signatures is None or source_hash(parquet_path) != _csv_hash(csv_path):
+            convert_csv(csv_path, parquet_path)
+            signatures = _signatures(csv_path, parquet_path)
+        _checked[key] = signatures
+    return parquet_path
+
+
+def _filters(services=None, months=None, years=None, units=None):
+    """Filtros no formato do pyarrow (conjunção de predicados)"""
+    filters = []
+    for column, values in (('Servico', services), ('Mes', months), ('Ano', years), ('Unidade', units)):
+        if values is not None:
+            filters.append((column, 'in', list(values)))
+    return filters or None
+
+
+def read_parquet(path, services=None, months=None, years=None, units=None, columns=None):
+    """Lê o Parquet com memory map, projeção de colunas e filtros na leitura
+
+    Filtros em colunas que o arquivo não possui são ignorados.
+    """
+    import pyarrow.parquet as pq
+
+    schema_names = set(pq.read_schema(path, memory_map=True).names)
+    if years is not None and 'Ano' not in schema_names:
+        years = None
+    if units is not None and 'Unidade' not in schema_names:
+        units = None
+    if columns is not None:
+        columns = [column for column in columns if column in schema_names]
+
+    table = pq.read_table(
+        path,
+        columns=columns,
+        filters=_filters(services, months, years, units),
+        memory_map=True,
+    )
+    return table.to_pandas()
+
+
+def read_csv(path, services=None, months=None, years=None, units=None, columns=None):
+    """Mesmo contrato de ``read_parquet`` sobre o CSV (filtros aplicados após o parse)"""
+    df = pd.read_csv(path)
+    for column, values in (('Servico', services), ('Mes', months), ('Ano', years), ('Unidade', units)):
+        if values is not None and column in df.columns:
+            df = df[df[column].isin(list(values))]
+    if columns is not None:
+        df = df[[column for column in columns if column in df.columns]]
+    return df.reset_index(drop=True)
+
+
+def synthetic_history(years=10, units=20, services=15, seed=42):
+    """Histórico sintético por ano, unidade, serviço e mês para benchmarks"""
+    rng = np.random.default_rng(seed)
+    grid = pd.MultiIndex.from_product(
+        [range(2026 - years, 2026), [f"Unidade {u:02d}" for u in range(1, units + 1)],
+         [f"Serviço {s:02d} (50 min)" for s in range(1, services + 1)], range(1, 13)],
+        names=['Ano', 'Unidade', 'Servico', 'Mes']
+    ).to_frame(index=False)
+    grid['Media'] = rng.integers(5, 60, len(grid))
+    grid['Desvio_padrao'] = rng.uniform(1, 20, len(grid)).round(2)
+    return grid
+
+
+def _best_of(func, repeat):
+    """Menor tempo (s) entre as repetições"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark(years=10, units=20, services=15, repeat=5, directory=None):
+    """Compara leitura completa e filtrada entre CSV e Parquet
+
+    Retorna ({caso: (segundos no CSV, segundos no Parquet)}, linhas, (bytes do CSV, bytes do Parquet)).
+    """
+    df = synthetic_history(years, units, services)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        csv_path = os.path.join(tmp, 'historico.csv')
+        df.to_csv(csv_path, index=False)
+        parquet_path = convert_csv(csv_path)
+
+        service = df['Servico'].iloc[0]
+        last_year = int(df['Ano'].max())
+        cases = {
+            'leitura completa': {},
+            'um serviço': dict(services=[service]),
+            'um serviço, último ano': dict(services=[service], years=[last_year]),
+            'um mês, só Media': dict(months=[1], columns=['Servico', 'Mes', 'Media']),
+        }
+        results = {}
+        for label, kwargs in cases.items():
+            results[label] = (
+                _best_of(lambda: read_csv(csv_path, **kwargs), repeat),
+                _best_of(lambda: read_parquet(parquet_path, **kwargs), repeat),
+            )
+        sizes = os.path.getsize(csv_path), os.path.getsize(parquet_path)
+    return results, len(df), sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Conversão e benchmark do histórico sazonal em Parquet")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert = subparsers.add_parser('convert', help="Converte um CSV de dados sazonais para Parquet")
+    convert.add_argument('csv', nargs='?', default='dados_sazonais.csv')
+    convert.add_argument('--output', help="Caminho do Parquet (padrão: mesmo nome com .parquet)")
+
+    bench = subparsers.add_parser('bench', help="Compara leitura de CSV e Parquet em dados sintéticos")
+    bench.add_argument('--years', type=int, default=10)
+    bench.add_argument('--units', type=int, default=20)
+    bench.add_argument('--services', type=int, default=15)
+    bench.add_argument('--repeat', type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if not pyarrow_available():
+        parser.error("pyarrow não está instalado")
+
+    if args.command == 'convert':
+        path = convert_csv(args.csv, args.output)
+        print(f"Parquet gravado em {path}")
+        return 0
+
+    results, rows, (csv_size, parquet_size) = benchmark(args.years, args.units, args.services, args.repeat)
+    print(f"{rows:,} linhas; CSV {csv_size / 1024:,.0f} KiB, Parquet {parquet_size / 1024:,.0f} KiB")
+    print(f"{'Caso':<26} {'CSV':>10} {'Parquet':>10} {'ganho':>8}")
+    for label, (csv_seconds, parquet_seconds) in results.items():
+        print(f"{label:<26} {csv_seconds * 1000:>8.1f}ms {parquet_seconds * 1000:>8.1f}ms "
+              f"{csv_seconds / parquet_seconds:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Simulação Monte Carlo do risco de demanda.
+
+A demanda de cada serviço/mês é sorteada de uma normal com a Media e o
+Desvio_padrao de dados_sazonais.csv (truncada em zero e arredondada para
+atendimentos inteiros). Todos os cenários promocionais usam os mesmos sorteios
+(números aleatórios comuns), o que torna a comparação entre eles estável e
+permite avaliar tudo em uma única operação matricial.
+"""
+import numpy as np
+
+from .pricing import compute_scenarios
+
+DEFAULT_DRAWS = 100_000
+DEFAULT_SEED = 42
+
+# Colunas retornadas por simulate_promotions
+RISK_COLUMNS = (
+    'promotional_price', 'required_quantity', 'expected_demand',
+    'reach_probability', 'target_probability', 'expected_profit',
+    'profit_p5', 'profit_p50', 'profit_p95',
+)
+
+# Colunas do motor usadas na simulação; os totais com promoção não são calculados
+SCENARIO_COLUMNS = ('required_quantity', 'profit_per_promo_service', 'desired_spa_revenue', 'feasible')
+
+
+def simulate_promotions(demand, std_dev, original_price, promotional_prices, service_cost,
+                        commission_percentage, desired_profit_increase, elasticity=0.0,
+                        n_draws=DEFAULT_DRAWS, seed=DEFAULT_SEED):
+    """Simula a demanda realizada para cada preço promocional
+
+    Para cada preço a demanda segue o modelo de elasticidade constante do
+    otimizador (média e desvio escalados por ``(p / preço original) **
+    elasticidade``). O lucro realizado é o lucro por atendimento vezes a
+    demanda sorteada. Retorna um dict {coluna: ndarray} com uma posição por
+    preço (ver RISK_COLUMNS).
+    """
+    prices = np.atleast_1d(np.asarray(promotional_prices, dtype=float))
+    results = compute_scenarios(demand, original_price, prices, service_cost,
+                                commission_percentage, desired_profit_increase, columns=SCENARIO_COLUMNS)
+
+    # Sorteios padronizados compartilhados: matriz (preços × sorteios)
+    z = np.random.default_rng(seed).standard_normal(n_draws)
+    scale = (prices / original_price) ** elasticity
+    realized = np.maximum(np.rint(demand * scale[:, None] + std_dev * scale[:, None] * z), 0)
+
+    required = results['required_quantity']
+    profit = results['profit_per_promo_service'][:, None] * realized
+
+    with np.errstate(invalid='ignore'):
+        reach_probability = np.where(results['feasible'], (realized >= required[:, None]).mean(axis=1), 0.0)
+    target_probability = (profit >= results['desired_spa_revenue'][:, None]).mean(axis=1)
+    p5, p50, p95 = np.percentile(profit, [5, 50, 95], axis=1)
+
+    return {
+        'promotional_price': prices,
+        'required_quantity': required,
+        'expected_demand': demand * scale,
+        'reach_probability': reach_probability,
+        'target_probability': target_probability,
+        'expected_profit': profit.mean(axis=1),
+        'profit_p5': p5,
+        'profit_p50': p50,
+        'profit_p95': p95,
+    }
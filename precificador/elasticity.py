@@ -0,0 +1,131 @@
+"""Elasticidade-preço da demanda ajustada a partir do histórico de preços.
+
+O histórico (``historico_precos.csv`` ou ``.parquet``) tem uma linha por
+serviço e período com o preço médio praticado e a quantidade vendida:
+``Servico, Mes, Preco, Quantidade`` (``Ano`` é opcional). Para cada serviço é
+ajustado ``ln(Quantidade) = a_mes + elasticidade * ln(Preco)``, com um
+intercepto por mês para que a sazonalidade não seja confundida com reação ao
+preço. Todos os serviços são ajustados de uma vez com somas agrupadas
+(``np.bincount``), sem laço por serviço.
+
+Os ajustes são feitos uma única vez por versão do arquivo e compartilhados
+por todas as sessões, como os dados sazonais. A previsão segue o mesmo modelo
+do otimizador: ``demanda(p) = Media * (p / preço original) ** elasticidade``.
+"""
+import os
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+from .seasonal_store import FileCache, read_source
+
+DEFAULT_PATH = 'historico_precos.csv'
+REQUIRED_COLUMNS = ('Servico', 'Mes', 'Preco', 'Quantidade')
+
+# Mínimo de observações por serviço para o ajuste ser considerado confiável
+MIN_OBSERVATIONS = 6
+
+# Resultado do ajuste de um serviço
+ElasticityFit = namedtuple('ElasticityFit', [
+    'elasticity', 'std_error', 'r_squared', 'n_obs', 'reliable',
+])
+
+
+def fit_elasticities(df):
+    """Ajusta a elasticidade de todos os serviços do histórico; retorna {serviço: ElasticityFit}
+
+    Um ajuste só é confiável com ``MIN_OBSERVATIONS`` observações, variação de
+    preço dentro dos meses e elasticidade negativa.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Colunas ausentes no histórico de preços: {', '.join(missing)}")
+
+    df = df[(df['Preco'] > 0) & (df['Quantidade'] > 0)]
+    if df.empty:
+        return {}
+
+    services, service_codes = np.unique(df['Servico'].to_numpy(), return_inverse=True)
+    group_codes = service_codes * 12 + (df['Mes'].to_numpy(dtype=int) - 1)
+    x = np.log(df['Preco'].to_numpy(dtype=float))
+    y = np.log(df['Quantidade'].to_numpy(dtype=float))
+
+    # Desvios em relação à média de cada (serviço, mês): remove o intercepto mensal
+    group_size = np.bincount(group_codes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dx = x - (np.bincount(group_codes, x) / group_size)[group_codes]
+        dy = y - (np.bincount(group_codes, y) / group_size)[group_codes]
+
+    n_services = len(services)
+    n_obs = np.bincount(service_codes, minlength=n_services)
+    n_months = np.bincount(np.unique(group_codes) // 12, minlength=n_services)
+    sxx = np.bincount(service_codes, dx * dx, minlength=n_services)
+    sxy = np.bincount(service_codes, dx * dy, minlength=n_services)
+    syy = np.bincount(service_codes, dy * dy, minlength=n_services)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = sxy / sxx
+        residual = dy - slope[service_codes] * dx
+        sse = np.bincount(service_codes, residual * residual, minlength=n_services)
+        dof = n_obs - n_months - 1
+        std_error = np.sqrt(sse / dof / sxx)
+        r_squared = 1 - sse / syy
+
+    reliable = (n_obs >= MIN_OBSERVATIONS) & (dof > 0) & (sxx > 1e-12) & (slope < 0)
+
+    return {
+        service: ElasticityFit(
+            elasticity=float(slope[i]),
+            std_error=float(std_error[i]),
+            r_squared=float(r_squared[i]),
+            n_obs=int(n_obs[i]),
+            reliable=bool(reliable[i]),
+        )
+        for i, service in enumerate(services)
+    }
+
+
+class ElasticityModel:
+    """Ajustes de elasticidade por serviço, calculados na carga do histórico"""
+
+    def __init__(self, fits, version):
+        self.fits = fits
+        self.version = version
+
+    def get(self, service):
+        """Retorna o ElasticityFit confiável do serviço, ou None"""
+        fit = self.fits.get(service)
+        return fit if fit is not None and fit.reliable else None
+
+    def predict(self, service, base_demand, original_price, price):
+        """Demanda esperada ao preço informado, ou None sem ajuste confiável
+
+        ``price`` pode ser um escalar ou um array de preços.
+        """
+        fit = self.get(service)
+        if fit is None:
+            return None
+        return base_demand * (np.asarray(price, dtype=float) / original_price) ** fit.elasticity
+
+
+_EMPTY = ElasticityModel({}, None)
+
+_models = FileCache()  # chave: caminho absoluto
+
+
+def get_model(path=DEFAULT_PATH):
+    """Retorna o ElasticityModel do histórico, reajustando só quando o arquivo muda
+
+    Aceita CSV ou Parquet. Sem arquivo de histórico, retorna um modelo vazio
+    (nenhum serviço ajustado).
+    """
+    path = os.path.abspath(path)
+    try:
+        return _models.get(
+            path, path,
+            lambda version, load: ElasticityModel(fit_elasticities(load()), version),
+            source=partial(read_source, columns=REQUIRED_COLUMNS),
+        )
+    except FileNotFoundError:
+        return _EMPTY
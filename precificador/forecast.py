@@ -0,0 +1,288 @@
+"""Previsão da demanda sazonal do próximo ano a partir do histórico multi-ano.
+
+O histórico de dados_sazonais (colunas ``Ano``, ``Mes``, ``Servico``,
+``Media``, ``Desvio_padrao`` e, opcionalmente, ``Unidade``) vira uma série
+mensal por serviço. Serviços com pelo menos ``MIN_HW_YEARS`` anos de dados
+recebem um Holt-Winters aditivo (nível, tendência e sazonalidade de 12
+meses), com os parâmetros escolhidos em uma grade pelo menor erro de um
+passo; os demais usam o sazonal ingênuo com tendência (valor do mesmo mês no
+último ano mais a variação anual média). A recursão roda uma vez para todos
+os serviços e todas as combinações da grade, em arrays (serviço × grade).
+
+O resultado tem o mesmo formato dos dados sazonais (``Mes``, ``Servico``,
+``Media``, ``Desvio_padrao``), com o intervalo de previsão em
+``Limite_inferior``/``Limite_superior``. O ``Desvio_padrao`` previsto soma a
+incerteza do modelo à variação do próprio mês (o desvio do último ano). Com
+um único ano de histórico a previsão repete os dados atuais.
+
+Como os dados sazonais, a previsão é calculada uma vez por versão do arquivo
+e compartilhada por todas as sessões; só é refeita quando chegam dados novos.
+"""
+import os
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .seasonal_store import DEFAULT_PATH, FileCache, SeasonalStore
+
+SEASON = 12
+
+# Anos de histórico necessários para o Holt-Winters
+MIN_HW_YEARS = 2
+
+# Grade de parâmetros do Holt-Winters: nível, tendência (fração do nível) e sazonalidade
+ALPHAS = (0.1, 0.2, 0.3, 0.5, 0.7, 0.9)
+BETAS = (0.0, 0.05, 0.1, 0.2)
+GAMMAS = (0.05, 0.1, 0.2, 0.4)
+
+# Cobertura do intervalo de previsão
+INTERVAL_LEVEL = 0.8
+
+HOLT_WINTERS = 'holt_winters'
+SEASONAL_NAIVE = 'sazonal_ingenuo'
+
+# Ajuste de um serviço; alpha/beta/gamma são None no sazonal ingênuo
+ForecastFit = namedtuple('ForecastFit', ['method', 'alpha', 'beta', 'gamma', 'sigma', 'years'])
+
+
+def monthly_series(df):
+    """Séries mensais por serviço a partir do histórico
+
+    Retorna (serviços, anos, médias, variâncias), com médias e variâncias em
+    arrays (serviço, ano * 12 + mês - 1) e nan nos meses sem dado. Várias
+    unidades são somadas, com variâncias somadas supondo independência.
+    """
+    if 'Ano' not in df.columns:
+        df = df.assign(Ano=0)
+    df = df.assign(Variancia=df['Desvio_padrao'] ** 2)
+    totals = df.groupby(['Servico', 'Ano', 'Mes'], sort=False)[['Media', 'Variancia']].sum().reset_index()
+
+    services = tuple(pd.unique(df['Servico']))
+    years = np.sort(totals['Ano'].unique())
+    service_codes = pd.Categorical(totals['Servico'], categories=services).codes
+    columns = np.searchsorted(years, totals['Ano'].to_numpy()) * SEASON + totals['Mes'].to_numpy(dtype=int) - 1
+
+    means = np.full((len(services), len(years) * SEASON), np.nan)
+    variances = np.full_like(means, np.nan)
+    means[service_codes, columns] = totals['Media'].to_numpy(dtype=float)
+    variances[service_codes, columns] = totals['Variancia'].to_numpy(dtype=float)
+    return services, years, means, variances
+
+
+def _row_mean(values):
+    """Média por linha ignorando nan (0 em linhas vazias) e a quantidade de valores"""
+    count = np.sum(~np.isnan(values), axis=1)
+    return np.nansum(values, axis=1) / np.maximum(count, 1), count
+
+
+def _parameter_grid():
+    """Combinações (alpha, beta, gamma) da grade, como três arrays"""
+    alpha, beta, gamma = np.meshgrid(ALPHAS, BETAS, GAMMAS, indexing='ij')
+    return alpha.ravel(), beta.ravel(), gamma.ravel()
+
+
+def fit_holt_winters(series, ends=None):
+    """Ajusta o Holt-Winters aditivo em todas as séries de uma vez
+
+    ``series`` tem forma (serviços, meses), começando em janeiro, com pelo
+    menos dois anos. ``ends`` é o índice do último mês de cada série (por
+    padrão, o último da matriz); depois dele os estados ficam parados. Cada
+    série começa no próprio primeiro ano com dado: os estados iniciais vêm
+    dos seus dois primeiros anos observados e os erros de um passo são
+    acumulados a partir do ano seguinte ao primeiro; antes disso os estados
+    ficam parados. Meses sem dado no meio da série só avançam o nível pela
+    tendência. Retorna (nível, tendência, sazonalidade
+    (serviços, 12), (alpha, beta, gamma) escolhidos, desvio do erro de um
+    passo), todos por serviço, com os estados no fim de cada série.
+    """
+    alpha, beta, gamma = _parameter_grid()
+    n_series, n_months = series.shape
+    if ends is None:
+        ends = np.full(n_series, n_months - 1)
+
+    # Primeiro e segundo anos com dado de cada série
+    n_years = -(-n_months // SEASON)
+    yearly = np.full((n_series, n_years * SEASON), np.nan)
+    yearly[:, :n_months] = series
+    yearly = yearly.reshape(n_series, n_years, SEASON)
+    has_year = ~np.isnan(yearly).all(axis=2)
+    first_year = np.argmax(has_year, axis=1)
+    later = has_year & (np.arange(n_years)[None, :] > first_year[:, None])
+    has_second = later.any(axis=1)
+    second_year = np.where(has_second, np.argmax(later, axis=1), first_year)
+
+    rows = np.arange(n_series)
+    first = yearly[rows, first_year]
+    level0, _ = _row_mean(first)
+    gap = SEASON * np.maximum(second_year - first_year, 1)
+    trend0 = np.where(has_second, (_row_mean(yearly[rows, second_year])[0] - level0) / gap, 0.0)
+    season0 = np.nan_to_num(first - level0[:, None])
+    begins = (first_year + 1) * SEASON
+
+    # Estados com forma (serviços, grade)
+    grid = len(alpha)
+    level = np.repeat(level0[:, None], grid, axis=1)
+    trend = np.repeat(trend0[:, None], grid, axis=1)
+    season = np.repeat(season0[:, :, None], grid, axis=2)
+    sse = np.zeros((n_series, grid))
+    count = np.zeros(n_series)
+
+    # Forma de correção de erro: tendência e sazonalidade reagem ao mesmo erro do nível
+    trend_gain = alpha * beta
+    season_gain = gamma * (1 - alpha)
+    for t in range(int(begins.min()), n_months):
+        month = t % SEASON
+        y = series[:, t]
+        active = (begins <= t) & (t <= ends)
+        observed = ~np.isnan(y) & active
+        error = np.where(observed[:, None], np.nan_to_num(y)[:, None] - (level + trend + season[:, month]), 0.0)
+        sse += error * error
+        count += observed
+        level = np.where(active[:, None], level + trend + alpha * error, level)
+        trend = trend + trend_gain * error
+        season[:, month] += season_gain * error
+
+    best = np.argmin(sse, axis=1)
+    # Graus de liberdade: observações menos os três parâmetros
+    sigma = np.sqrt(sse[rows, best] / np.maximum(count - 3, 1))
+    return (level[rows, best], trend[rows, best], season[rows, :, best],
+            (alpha[best], beta[best], gamma[best]), sigma)
+
+
+def _holt_winters_variance_factor(alpha, beta, gamma, horizons):
+    """Fator de variância (1 + soma c_j²) do erro de previsão a ``h`` passos
+
+    ``horizons`` tem forma (serviços, meses); ``beta`` e ``gamma`` são os
+    ganhos de tendência e sazonalidade da forma de correção de erro (os
+    mesmos da recursão de fit_holt_winters), com c_j = alpha + beta·j +
+    gamma·[j múltiplo de 12].
+    """
+    max_h = int(horizons.max())
+    steps = np.arange(1, max_h)
+    c = alpha[:, None] + steps * beta[:, None] + gamma[:, None] * (steps % SEASON == 0)
+    cumulative = np.concatenate([np.zeros((len(alpha), 1)), np.cumsum(c * c, axis=1)], axis=1)
+    return 1 + np.take_along_axis(cumulative, horizons - 1, axis=1)
+
+
+def forecast_next_year(df, level=INTERVAL_LEVEL):
+    """Previsão de cada serviço para a próxima ocorrência de cada mês
+
+    Retorna (DataFrame no formato dos dados sazonais com os limites do
+    intervalo, {serviço: ForecastFit}).
+    """
+    services, years, means, variances = monthly_series(df)
+    n_series = len(services)
+    observed = ~np.isnan(means)
+
+    # Último mês com dado de cada serviço e horizonte até a próxima ocorrência de cada mês
+    last = np.where(observed.any(axis=1), means.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1), -1)
+    months = np.arange(SEASON)
+    horizons = (months[None, :] - last[:, None] % SEASON - 1) % SEASON + 1
+
+    # Variação do próprio mês: desvio do último ano em que o mês aparece
+    by_year = variances.reshape(n_series, len(years), SEASON)
+    seen = ~np.isnan(by_year)
+    latest_year = len(years) - 1 - np.argmax(seen[:, ::-1, :], axis=1)
+    intrinsic = np.nan_to_num(np.take_along_axis(by_year, latest_year[:, None, :], axis=1)[:, 0, :])
+
+    # Sazonal ingênuo com tendência para todos; o Holt-Winters substitui onde houver anos suficientes
+    yearly = means.reshape(n_series, len(years), SEASON)
+    last_value = np.take_along_axis(yearly, latest_year[:, None, :], axis=1)[:, 0, :]
+    changes = np.diff(yearly, axis=1).reshape(n_series, -1)
+    drift, n_changes = _row_mean(changes)
+    residuals = np.nan_to_num(changes - drift[:, None])
+    naive_sigma = np.sqrt((residuals ** 2).sum(axis=1) / np.maximum(n_changes - 1, 1)) * (n_changes > 1)
+    forecast = last_value + drift[:, None]
+    model_variance = np.repeat((naive_sigma ** 2)[:, None], SEASON, axis=1)
+    method = np.full(n_series, SEASONAL_NAIVE, dtype=object)
+    parameters = np.full((n_series, 3), np.nan)
+    sigma = naive_sigma.copy()
+
+    years_observed = seen.any(axis=2).sum(axis=1)
+    use_hw = (years_observed >= MIN_HW_YEARS) & (len(years) >= MIN_HW_YEARS)
+    if use_hw.any():
+        # Cada série termina no último mês observado do serviço
+        rows = np.flatnonzero(use_hw)
+        span = int(last[rows].max()) + 1
+        hw_level, hw_trend, hw_season, (alpha, beta, gamma), hw_sigma = fit_holt_winters(
+            means[rows, :span], ends=last[rows]
+        )
+
+        h = horizons[rows]
+        forecast[rows] = hw_level[:, None] + h * hw_trend[:, None] + hw_season[:, months]
+        factor = _holt_winters_variance_factor(alpha, alpha * beta, gamma * (1 - alpha), h)
+        model_variance[rows] = hw_sigma[:, None] ** 2 * factor
+        method[rows] = HOLT_WINTERS
+        parameters[rows] = np.column_stack([alpha, beta, gamma])
+        sigma[rows] = hw_sigma
+
+    forecast = np.clip(forecast, 0.0, None)
+    std_dev = np.sqrt(model_variance + intrinsic)
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+
+    has_month = seen.any(axis=1)
+    service_index, month_index = np.nonzero(has_month)
+    result = pd.DataFrame({
+        'Mes': month_index + 1,
+        'Servico': np.asarray(services, dtype=object)[service_index],
+        'Media': forecast[service_index, month_index],
+        'Desvio_padrao': std_dev[service_index, month_index],
+    })
+    result['Limite_inferior'] = np.clip(result['Media'] - z * result['Desvio_padrao'], 0.0, None)
+    result['Limite_superior'] = result['Media'] + z * result['Desvio_padrao']
+
+    fits = {
+        service: ForecastFit(
+            method=method[i],
+            alpha=None if np.isnan(parameters[i, 0]) else float(parameters[i, 0]),
+            beta=None if np.isnan(parameters[i, 1]) else float(parameters[i, 1]),
+            gamma=None if np.isnan(parameters[i, 2]) else float(parameters[i, 2]),
+            sigma=float(sigma[i]),
+            years=int(years_observed[i]),
+        )
+        for i, service in enumerate(services)
+    }
+    return result, fits
+
+
+# Intervalo de previsão de um serviço em um mês
+ForecastInterval = namedtuple('ForecastInterval', ['lower', 'upper', 'level'])
+
+
+class SeasonalForecast(SeasonalStore):
+    """Previsão do próximo ano com a mesma interface dos dados sazonais
+
+    ``lookup`` retorna a média e o desvio previstos; ``interval`` o
+    intervalo de previsão e ``fits`` o método usado em cada serviço.
+    """
+
+    def __init__(self, df, version, fits, level=INTERVAL_LEVEL):
+        super().__init__(df, version)
+        self.fits = fits
+        self.level = level
+        self._intervals = {
+            (service, int(month)): ForecastInterval(float(lower), float(upper), level)
+            for service, month, lower, upper in zip(
+                df['Servico'], df['Mes'], df['Limite_inferior'], df['Limite_superior']
+            )
+        }
+
+    def interval(self, service, month):
+        """Retorna o ForecastInterval do serviço no mês ou None"""
+        return self._intervals.get((service, int(month)))
+
+
+_forecasts = FileCache()  # chave: caminho absoluto
+
+
+def get_forecast(path=DEFAULT_PATH):
+    """Retorna a SeasonalForecast do histórico, reajustando só quando os dados mudam"""
+    path = os.path.abspath(path)
+
+    def build(version, load):
+        df, fits = forecast_next_year(load())
+        return SeasonalForecast(df, version, fits)
+
+    return _forecasts.get(path, path, build)
@@ -0,0 +1,110 @@
+"""Mede o tempo de importação a frio do núcleo, dos relatórios e do app.
+
+Cada alvo é importado em um processo Python novo (sem cache de módulos), e o
+relatório mostra a mediana das repetições e quais dependências pesadas foram
+carregadas junto, para detectar importações que deixaram de ser preguiçosas.
+
+Importar o app.py executa o script: abre o histórico de cenários e converte
+os dados sazonais para Parquet. Por isso as medições rodam em um diretório
+temporário com cópias dos arquivos de dados, preparado por uma importação
+descartada, e não tocam nos arquivos do usuário.
+
+Uso:
+    python -m precificador.importtime [--repeat 5] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Arquivos de dados copiados para o diretório de trabalho das medições
+DATA_FILES = ('dados_sazonais.csv', 'historico_precos.csv')
+
+# Alvos medidos: nome exibido -> módulo importado
+TARGETS = {
+    'precificador (núcleo)': 'precificador',
+    'precificador.charts': 'precificador.charts',
+    'precificador.pdf_report': 'precificador.pdf_report',
+    'app.py (script completo)': 'app',
+}
+
+# Dependências cuja presença indica custo extra na partida
+HEAVY_MODULES = ('streamlit', 'pandas', 'plotly', 'reportlab', 'PIL', 'kaleido')
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+sys.__stdout__.write('\\n' + json.dumps({{'seconds': elapsed, 'loaded': loaded}}) + '\\n')
+"""
+
+
+def _probe(code, cwd):
+    """Roda o código em um Python novo, com o projeto no caminho de importação"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_DIR, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(module, repeat=5, cwd=None):
+    """Importa o módulo em processos novos e retorna (segundos por repetição, módulos pesados)
+
+    Sem ``cwd`` as importações rodam em um diretório temporário com cópias dos
+    dados (ver o docstring do módulo).
+    """
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    if cwd is None:
+        with tempfile.TemporaryDirectory(prefix='precificador_importtime_') as workdir:
+            for name in DATA_FILES:
+                if os.path.exists(os.path.join(PROJECT_DIR, name)):
+                    shutil.copy2(os.path.join(PROJECT_DIR, name), workdir)
+            # Importação descartada: cria o Parquet e o banco antes das medições
+            _probe(code, workdir)
+            return measure(module, repeat, cwd=workdir)
+
+    timings = []
+    loaded = []
+    for _ in range(repeat):
+        sample = _probe(code, cwd)
+        timings.append(sample['seconds'])
+        loaded = sample['loaded']
+    return timings, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação a frio do precificador")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetições por alvo")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    report = {}
+    for label, module in TARGETS.items():
+        timings, loaded = measure(module, repeat=args.repeat)
+        report[label] = {
+            'module': module,
+            'median_ms': statistics.median(timings) * 1000,
+            'min_ms': min(timings) * 1000,
+            'loaded': loaded,
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"{'Alvo':<28} {'mediana':>10} {'mínimo':>10}  dependências pesadas carregadas")
+    for label, row in report.items():
+        print(f"{label:<28} {row['median_ms']:>8.0f}ms {row['min_ms']:>8.0f}ms  {', '.join(row['loaded']) or '-'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
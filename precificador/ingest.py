@@ -0,0 +1,307 @@
+"""Ingestão incremental de exportações de agendamentos (um registro por atendimento).
+
+Cada arquivo é lido em blocos (``chunksize``), só com as colunas de data e
+serviço, e reduzido a contagens por (serviço, ano-mês). Quando um mês fecha,
+a contagem dele vira uma observação do acumulador de Welford do par
+(serviço, mês do ano), que guarda apenas ``n``, média e soma dos quadrados
+dos desvios. A memória usada não depende do tamanho da exportação.
+
+O estado fica em um JSON ao lado dos dados: a cada nova exportação só os
+agendamentos novos são lidos, sem reprocessar o histórico. O mês mais recente
+fica aberto (pode estar incompleto) até chegar um dado de um mês posterior ou
+até a ingestão ser feita com ``--close-all``.
+
+Exportações podem se sobrepor (ex.: a de outubro repete o mês aberto de
+setembro). O estado guarda a data do agendamento mais recente já incorporado
+e as exportações seguintes só contam agendamentos posteriores a ela, que são
+contabilizados à parte como repetidos. Por isso cada exportação deve terminar
+em um dia fechado. Datas são lidas no padrão brasileiro (dia/mês) e linhas
+sem data válida ou sem serviço são contadas e informadas, não incorporadas.
+
+Uso:
+    python -m precificador.ingest agendamentos_2026_09.csv [--state estado_ingestao.json]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+from collections import namedtuple
+
+import pandas as pd
+
+DEFAULT_STATE_PATH = 'estado_ingestao.json'
+DEFAULT_OUTPUT_PATH = 'dados_sazonais.csv'
+DEFAULT_CHUNKSIZE = 500_000
+STATE_FORMAT = 1
+
+# Resultado da leitura de uma exportação: {(serviço, período): agendamentos},
+# linhas descartadas e a data do agendamento mais recente contado
+BookingCounts = namedtuple('BookingCounts', ['counts', 'invalid_rows', 'repeated_rows', 'latest'])
+
+
+def _period(year, month):
+    """Índice contínuo do mês (ano * 12 + mês - 1)"""
+    return year * 12 + month - 1
+
+
+def _period_label(period):
+    """'AAAA-MM' de um índice de período"""
+    return f"{period // 12:04d}-{period % 12 + 1:02d}"
+
+
+def _parse_period(label):
+    """Índice de período de um rótulo 'AAAA-MM'"""
+    year, month = label.split('-')
+    return _period(int(year), int(month))
+
+
+class WelfordAccumulator:
+    """Média e variância em uma passada, numericamente estável"""
+
+    __slots__ = ('n', 'mean', 'm2')
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        """Inclui uma observação"""
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self):
+        """Desvio padrão amostral (0 com menos de duas observações)"""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def to_list(self):
+        return [self.n, self.mean, self.m2]
+
+
+class IngestState:
+    """Acumuladores fechados e contagens dos meses ainda abertos"""
+
+    def __init__(self):
+        self.accumulators = {}   # serviço -> {mês do ano: WelfordAccumulator}
+        self.open_counts = {}    # serviço -> {período: contagem}
+        self.first_period = {}   # serviço -> primeiro período com agendamento
+        self.closed_until = None  # períodos anteriores a este já foram fechados
+        self.high_water = None    # data do agendamento mais recente já incorporado
+        self.late_rows = 0
+        self.invalid_rows = 0
+        self.repeated_rows = 0
+
+    @classmethod
+    def load(cls, path):
+        """Carrega o estado salvo ou retorna um estado vazio"""
+        state = cls()
+        if not os.path.exists(path):
+            return state
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != STATE_FORMAT:
+            raise ValueError(f"Formato de estado de ingestão não suportado em {path}")
+
+        state.accumulators = {
+            service: {int(month): WelfordAccumulator(*values) for month, values in months.items()}
+            for service, months in data['accumulators'].items()
+        }
+        state.open_counts = {
+            service: {_parse_period(label): count for label, count in periods.items()}
+            for service, periods in data['open_counts'].items()
+        }
+        state.first_period = {service: _parse_period(label) for service, label in data['first_period'].items()}
+        if data['closed_until'] is not None:
+            state.closed_until = _parse_period(data['closed_until'])
+        if data.get('high_water') is not None:
+            state.high_water = pd.Timestamp(data['high_water'])
+        state.late_rows = data.get('late_rows', 0)
+        state.invalid_rows = data.get('invalid_rows', 0)
+        state.repeated_rows = data.get('repeated_rows', 0)
+        return state
+
+    def save(self, path):
+        """Grava o estado de forma atômica"""
+        data = {
+            'format': STATE_FORMAT,
+            'closed_until': None if self.closed_until is None else _period_label(self.closed_until),
+            'first_period': {service: _period_label(period) for service, period in self.first_period.items()},
+            'accumulators': {
+                service: {str(month): acc.to_list() for month, acc in months.items()}
+                for service, months in self.accumulators.items()
+            },
+            'open_counts': {
+                service: {_period_label(period): count for period, count in periods.items()}
+                for service, periods in self.open_counts.items()
+            },
+            'high_water': None if self.high_water is None else self.high_water.isoformat(),
+            'late_rows': self.late_rows,
+            'invalid_rows': self.invalid_rows,
+            'repeated_rows': self.repeated_rows,
+        }
+        _atomic_write(path, lambda f: json.dump(data, f, ensure_ascii=False, indent=1), mode='w')
+
+    def add_counts(self, counts):
+        """Soma contagens {(serviço, período): agendamentos} às contagens abertas
+
+        Agendamentos em meses já fechados não podem mais ser incorporados e
+        são apenas contabilizados em ``late_rows``.
+        """
+        for (service, period), count in counts.items():
+            if self.closed_until is not None and period < self.closed_until:
+                self.late_rows += count
+                continue
+            periods = self.open_counts.setdefault(service, {})
+            periods[period] = periods.get(period, 0) + count
+            if service not in self.first_period or period < self.first_period[service]:
+                self.first_period[service] = period
+
+    def add_bookings(self, bookings):
+        """Incorpora a leitura de uma exportação e avança a marca do mais recente"""
+        self.add_counts(bookings.counts)
+        self.invalid_rows += bookings.invalid_rows
+        self.repeated_rows += bookings.repeated_rows
+        if bookings.latest is not None and (self.high_water is None or bookings.latest > self.high_water):
+            self.high_water = bookings.latest
+
+    def latest_period(self):
+        """Período mais recente com agendamento, ou None"""
+        periods = [period for counts in self.open_counts.values() for period in counts]
+        return max(periods, default=None)
+
+    def close_until(self, until):
+        """Fecha os meses anteriores a ``until``, alimentando os acumuladores
+
+        Meses sem nenhum agendamento de um serviço (a partir do primeiro mês
+        em que ele aparece) entram como demanda zero.
+        """
+        start = self.closed_until
+        for service, first in self.first_period.items():
+            periods = self.open_counts.get(service, {})
+            accumulators = self.accumulators.setdefault(service, {})
+            for period in range(max(first, start if start is not None else first), until):
+                month = period % 12 + 1
+                accumulators.setdefault(month, WelfordAccumulator()).add(periods.pop(period, 0))
+        self.closed_until = until if start is None else max(start, until)
+
+    def seasonal_table(self):
+        """Tabela no formato de dados_sazonais.csv a partir dos acumuladores"""
+        rows = [
+            (month, service, round(acc.mean, 2), round(acc.std, 2))
+            for service, months in self.accumulators.items()
+            for month, acc in sorted(months.items())
+        ]
+        return pd.DataFrame(rows, columns=['Mes', 'Servico', 'Media', 'Desvio_padrao'])
+
+
+def _atomic_write(path, write, mode='wb'):
+    """Grava em arquivo temporário no mesmo diretório e substitui o destino"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **({'encoding': 'utf-8'} if 'b' not in mode else {})) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def count_bookings(path, date_column='Data', service_column='Servico', chunksize=DEFAULT_CHUNKSIZE,
+                   date_format=None, dayfirst=True, after=None):
+    """Conta agendamentos por (serviço, período) lendo o arquivo em blocos
+
+    Sem ``date_format``, as datas são inferidas com o dia antes do mês
+    (``dayfirst``). Agendamentos até ``after`` (inclusive) já foram
+    incorporados e só entram em ``repeated_rows``.
+    """
+    totals = {}
+    invalid_rows = repeated_rows = 0
+    latest = None
+    chunks = pd.read_csv(path, usecols=[date_column, service_column], chunksize=chunksize)
+    for chunk in chunks:
+        dates = pd.to_datetime(chunk[date_column], format=date_format, dayfirst=dayfirst, errors='coerce')
+        valid = dates.notna() & chunk[service_column].notna()
+        invalid_rows += int((~valid).sum())
+        if after is not None:
+            repeated = valid & (dates <= after)
+            repeated_rows += int(repeated.sum())
+            valid &= ~repeated
+        if not valid.any():
+            continue
+        chunk_latest = dates[valid].max()
+        latest = chunk_latest if latest is None else max(latest, chunk_latest)
+        periods = dates[valid].dt.year * 12 + dates[valid].dt.month - 1
+        grouped = periods.groupby([chunk.loc[valid, service_column], periods]).size()
+        for (service, period), count in grouped.items():
+            key = (service, int(period))
+            totals[key] = totals.get(key, 0) + int(count)
+    return BookingCounts(totals, invalid_rows, repeated_rows, latest)
+
+
+def ingest(paths, state_path=DEFAULT_STATE_PATH, output_path=DEFAULT_OUTPUT_PATH, close_all=False,
+           **read_options):
+    """Incorpora exportações ao estado salvo e regrava a tabela sazonal
+
+    Retorna o IngestState atualizado.
+    """
+    state = IngestState.load(state_path)
+    for path in paths:
+        state.add_bookings(count_bookings(path, after=state.high_water, **read_options))
+
+    latest = state.latest_period()
+    if latest is not None:
+        state.close_until(latest + 1 if close_all else latest)
+
+    state.save(state_path)
+    table = state.seasonal_table()
+    if not table.empty:
+        _atomic_write(output_path, lambda f: table.to_csv(f, index=False), mode='w')
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agrega exportações de agendamentos em dados sazonais")
+    parser.add_argument('exports', nargs='+', help="CSVs de agendamentos (um registro por atendimento)")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, help="Arquivo de estado da ingestão")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help="Tabela sazonal gerada")
+    parser.add_argument('--date-column', default='Data')
+    parser.add_argument('--service-column', default='Servico')
+    parser.add_argument('--date-format', help="Formato da data, ex.: %%d/%%m/%%Y (padrão: inferido, dia antes do mês)")
+    parser.add_argument('--month-first', action='store_true',
+                        help="Sem --date-format, lê datas ambíguas como mês/dia (exportações em inglês)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Linhas por bloco lido")
+    parser.add_argument('--close-all', action='store_true',
+                        help="Fecha também o mês mais recente (exportação completa até o fim do mês)")
+    args = parser.parse_args(argv)
+
+    state = ingest(
+        args.exports, args.state, args.output, close_all=args.close_all,
+        date_column=args.date_column, service_column=args.service_column,
+        chunksize=args.chunksize, date_format=args.date_format, dayfirst=not args.month_first,
+    )
+
+    open_periods = sorted({_period_label(p) for counts in state.open_counts.values() for p in counts})
+    print(f"Tabela sazonal gravada em {args.output} ({len(state.accumulators)} serviços)")
+    if state.closed_until is not None:
+        print(f"Meses fechados até {_period_label(state.closed_until - 1)}; "
+              f"abertos: {', '.join(open_periods) or '-'}")
+    if state.high_water is not None:
+        print(f"Agendamentos incorporados até {state.high_water:%d/%m/%Y %H:%M}")
+    if state.invalid_rows:
+        print(f"Aviso: {state.invalid_rows} linhas sem data válida ou sem serviço foram ignoradas")
+    if state.repeated_rows:
+        print(f"{state.repeated_rows} agendamentos de exportações sobrepostas já tinham sido incorporados")
+    if state.late_rows:
+        print(f"Aviso: {state.late_rows} agendamentos em meses já fechados foram ignorados")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""Teste de carga do dashboard com sessões simultâneas do AppTest.
+
+Cada sessão simulada é um ``AppTest`` do app.py rodando em sua própria
+thread, no mesmo processo, como as sessões do servidor do Streamlit: os
+caches e a fila de relatórios do processo são compartilhados entre elas.
+O AppTest troca estado global a cada rerun (o singleton ``Runtime`` e a
+configuração), então os reruns passam por um lock, um de cada vez; como o
+script é limitado pelo GIL, o servidor real também os intercala. A latência
+medida inclui a espera pelo lock, isto é, o tempo que o usuário espera com
+as outras sessões disputando o servidor; a coluna "execução" é só o rerun.
+Os relatórios PDF rodam de fato em paralelo, nos processos da fila. Uma
+sessão percorre as abas da Análise Sazonal e depois, na Precificação
+Inteligente, calcula um cenário e pede o relatório PDF até o download ficar
+disponível, repetindo ``--iterations`` vezes com preços diferentes.
+
+O relatório traz as latências dos reruns (p50/p95/p99) por ação, a espera
+pelo PDF, a vazão em reruns por segundo e o pico de RSS do processo somado
+ao de todos os descendentes: o servidor forkserver da fila de relatórios e
+os processos de trabalho, que ele cria por fork (netos deste processo). Eles
+contam as páginas compartilhadas com o servidor, então o total é um limite
+superior.
+Antes da medição um rerun de aquecimento carrega módulos e caches do
+processo, como em um servidor já no ar, para que o RSS por sessão reflita
+só o custo das sessões. Roda offline, em um diretório temporário com cópia
+dos dados, sem tocar no histórico de cenários real.
+
+Uso:
+    python -m precificador.loadtest --sessions 12 --iterations 3
+    python -m precificador.loadtest --sessions 4 --no-pdf --json
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from .importtime import DATA_FILES
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(PROJECT_DIR, 'app.py')
+
+SEASONAL_PAGE = "📊 Análise Sazonal"
+PRICING_PAGE = "💰 Precificação Inteligente"
+
+DEFAULT_SESSIONS = 8
+DEFAULT_ITERATIONS = 3
+DEFAULT_TIMEOUT = 120.0
+PDF_POLL_INTERVAL = 0.2
+RSS_SAMPLE_INTERVAL = 0.1
+
+PERCENTILES = (50, 95, 99)
+
+# Um rerun do AppTest por vez (ver o docstring do módulo)
+_apptest_lock = threading.Lock()
+
+
+def _rss_bytes(pid):
+    """RSS atual de um processo pelo /proc (Linux), ou 0"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _descendant_pids(pid):
+    """Todos os descendentes do processo, pelo /proc
+
+    Os processos de trabalho dos relatórios são filhos do servidor
+    forkserver, e não deste processo: é preciso descer a árvore inteira.
+    """
+    children = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # O nome do processo pode ter espaços: os campos seguem o último ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    descendants = []
+    pending = [pid]
+    while pending:
+        found = children.get(pending.pop(), [])
+        descendants.extend(found)
+        pending.extend(found)
+    return descendants
+
+
+class RssSampler:
+    """Amostra em segundo plano o RSS do processo e dos descendentes, guardando o pico"""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.has_proc = os.path.exists('/proc/self/statm')
+        self.start_bytes = self.sample()
+        self.peak_bytes = self.start_bytes
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self):
+        if not self.has_proc:
+            # Sem /proc: só o pico do próprio processo (ru_maxrss em KiB no Linux, bytes no macOS)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == 'darwin' else peak * 1024
+        pid = os.getpid()
+        return _rss_bytes(pid) + sum(_rss_bytes(child) for child in _descendant_pids(pid))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, self.sample())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.sample())
+
+
+class SimulatedSession:
+    """Uma sessão do dashboard dirigida pelo AppTest, registrando o tempo de cada rerun"""
+
+    def __init__(self, index, timeout=DEFAULT_TIMEOUT):
+        self.index = index
+        self.timeout = timeout
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.samples = []  # (ação, latência em s, execução em s)
+        self.errors = []
+
+    def _run(self, action, widget=None):
+        """Executa um rerun (pelo widget, se informado) e registra latência e tempo de execução"""
+        start = time.perf_counter()
+        with _apptest_lock:
+            run_start = time.perf_counter()
+            (widget or self.app).run()
+        end = time.perf_counter()
+        self.samples.append((action, end - start, end - run_start))
+        if self.app.exception:
+            self.errors.append(f"{action}: {self.app.exception[0].value}")
+            return False
+        return True
+
+    def seasonal_flow(self):
+        """Abre a Análise Sazonal e visita cada aba de serviço"""
+        self.app.sidebar.radio[0].set_value(SEASONAL_PAGE)
+        if not self._run('sazonal.pagina'):
+            return
+        for tab in list(self.app.tabs):
+            self.app.session_state['seasonal_tab'] = tab.label
+            if not self._run('sazonal.aba'):
+                return
+
+    def pricing_flow(self, promotional_price, pdf=True):
+        """Calcula um cenário na Precificação e, com ``pdf``, espera o relatório ficar pronto"""
+        self.app.sidebar.radio[0].set_value(PRICING_PAGE)
+        if not self._run('precificacao.pagina'):
+            return
+        self._number_input("Preço Promocional").set_value(promotional_price)
+        if not self._run('precificacao.calcular', self._button("Calcular").click()):
+            return
+        if not pdf:
+            return
+
+        if not self._run('precificacao.pedir_pdf', self._button("Gerar Relatório").click()):
+            return
+        start = time.perf_counter()
+        while not self.app.get('download_button'):
+            if self.app.error or time.perf_counter() - start > self.timeout:
+                self.errors.append(f"pdf: relatório não ficou pronto ({[e.value for e in self.app.error]})")
+                return
+            time.sleep(PDF_POLL_INTERVAL)
+            if not self._run('precificacao.acompanhar_pdf'):
+                return
+        waited = time.perf_counter() - start
+        self.samples.append(('pdf.espera', waited, waited))
+
+    def _button(self, text):
+        return next(button for button in self.app.button if text in button.label)
+
+    def _number_input(self, text):
+        return next(field for field in self.app.number_input if field.label.startswith(text))
+
+    def run(self, iterations, pdf=True, think=0.0):
+        self._run('inicial')
+        for i in range(iterations):
+            self.seasonal_flow()
+            time.sleep(think)
+            # Preços diferentes por sessão e iteração, para não cair só no cache de relatórios
+            self.pricing_flow(round(60.0 + (self.index * 7 + i * 3) % 35, 2), pdf=pdf)
+            time.sleep(think)
+
+
+def _summary(samples):
+    """Percentis de latência e mediana de execução (ms) de uma lista de amostras"""
+    latency = np.array([sample[1] for sample in samples]) * 1000
+    service = np.array([sample[2] for sample in samples]) * 1000
+    summary = {'count': len(samples), 'mean_ms': float(latency.mean())}
+    for p, value in zip(PERCENTILES, np.percentile(latency, PERCENTILES)):
+        summary[f'p{p}_ms'] = float(value)
+    summary['run_p50_ms'] = float(np.median(service))
+    return summary
+
+
+def run(sessions=DEFAULT_SESSIONS, iterations=DEFAULT_ITERATIONS, pdf=True, think=0.0,
+        timeout=DEFAULT_TIMEOUT):
+    """Executa o teste de carga e retorna o resultado em um dict"""
+    results = [None] * sessions
+
+    def worker(index):
+        session = SimulatedSession(index, timeout)
+        try:
+            session.run(iterations, pdf=pdf, think=think)
+        except Exception as exc:  # a sessão falhou: registra e segue com as outras
+            session.errors.append(f"{type(exc).__name__}: {exc}")
+        results[index] = session
+
+    workdir = tempfile.mkdtemp(prefix='precificador_carga_')
+    previous_cwd = os.getcwd()
+    try:
+        for name in DATA_FILES:
+            if os.path.exists(os.path.join(PROJECT_DIR, name)):
+                shutil.copy2(os.path.join(PROJECT_DIR, name), workdir)
+        os.chdir(workdir)
+
+        # Aquecimento: módulos, dados e caches do processo já carregados
+        AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+
+        with RssSampler() as rss:
+            start = time.perf_counter()
+            threads = [threading.Thread(target=worker, args=(i,), name=f'sessao-{i}') for i in range(sessions)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - start
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    by_action = {}
+    for session in results:
+        for sample in session.samples:
+            by_action.setdefault(sample[0], []).append(sample)
+    reruns = [sample for action, samples in by_action.items() if action != 'pdf.espera' for sample in samples]
+
+    return {
+        'sessions': sessions,
+        'iterations': iterations,
+        'wall_s': wall,
+        'reruns': len(reruns),
+        'throughput_rps': len(reruns) / wall if wall else 0.0,
+        'latency': _summary(reruns) if reruns else None,
+        'actions': {action: _summary(samples) for action, samples in sorted(by_action.items())},
+        'rss_start_mb': rss.start_bytes / 2**20,
+        'rss_peak_mb': rss.peak_bytes / 2**20,
+        'rss_per_session_mb': (rss.peak_bytes - rss.start_bytes) / 2**20 / sessions,
+        'errors': [f"sessão {session.index}: {error}" for session in results for error in session.errors],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do dashboard com sessões simultâneas do AppTest")
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help="Sessões simultâneas")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help="Repetições do roteiro por sessão")
+    parser.add_argument('--no-pdf', action='store_true', help="Não pede o relatório PDF na precificação")
+    parser.add_argument('--think', type=float, default=0.0, help="Pausa (s) entre as páginas, simulando o usuário")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="Tempo máximo (s) por rerun e por PDF")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.sessions, args.iterations, pdf=not args.no_pdf, think=args.think, timeout=args.timeout)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(f"{result['sessions']} sessões × {result['iterations']} iterações em {result['wall_s']:.1f}s: "
+              f"{result['reruns']} reruns, {result['throughput_rps']:.1f} reruns/s")
+        print(f"{'Ação':<28} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'execução':>9}")
+        rows = list(result['actions'].items())
+        if result['latency']:
+            rows.append(('todos os reruns', result['latency']))
+        for action, summary in rows:
+            print(f"{action:<28} {summary['count']:>5} {summary['p50_ms']:>7.0f}ms "
+                  f"{summary['p95_ms']:>7.0f}ms {summary['p99_ms']:>7.0f}ms {summary['run_p50_ms']:>7.0f}ms")
+        print(f"RSS: {result['rss_start_mb']:.0f} MB no início, pico de {result['rss_peak_mb']:.0f} MB "
+              f"(~{result['rss_per_session_mb']:.1f} MB por sessão)")
+        for error in result['errors']:
+            print(f"Erro: {error}")
+
+    return 1 if result['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Valores monetários em centavos inteiros (int64), vetorizados com NumPy.
+
+O motor de precificação converte preços e custos para centavos e
+percentuais para pontos-base (centésimos de ponto percentual) na entrada e
+faz todas as contas em inteiros: cada valor exibido é um número exato de
+centavos, as parcelas impressas somam exatamente os totais e divisões que
+dão inteiro não ganham um atendimento a mais por erro de ponto flutuante.
+
+Cada valor é arredondado para centavo uma única vez: parcelas percentuais
+(comissão, meta) meio para cima, na divisão inteira; conversões de reais e
+produtos por quantidade fracionária para o centavo mais próximo. As funções
+aceitam escalares ou arrays e retornam arrays int64 (ou float, em
+``from_cents``).
+
+Em lotes de milhões de valores o custo é dominado pela alocação dos arrays
+de saída, não pelas contas: ``to_cents`` e ``from_cents_inplace`` convertem
+float <-> int64 sobre o próprio buffer (mesmo tamanho de elemento), bloco a
+bloco, em vez de alocar um segundo array.
+"""
+import numpy as np
+
+CENTS = 100
+# Percentuais em pontos-base: 30,5% -> 3050
+BASIS_POINTS = 10_000
+
+# Elementos por bloco nas conversões sobre o próprio buffer (o bloco cabe no cache)
+_BLOCK = 1 << 14
+
+
+def _blocks(size):
+    """Fatias consecutivas de até _BLOCK elementos"""
+    return (slice(start, start + _BLOCK) for start in range(0, size, _BLOCK))
+
+
+def _rounded_int64(value, scale):
+    """``value * scale`` arredondado para o inteiro mais próximo, convertido no buffer do produto"""
+    scaled = np.asarray(np.multiply(value, scale, dtype=float))
+    rounded = scaled.view(np.int64)
+    flat_scaled, flat_rounded = scaled.reshape(-1), rounded.reshape(-1)
+    for block in _blocks(flat_scaled.size):
+        np.rint(flat_scaled[block], out=flat_rounded[block], casting='unsafe')
+    return rounded
+
+
+def to_cents(value):
+    """Reais (float) para centavos inteiros, arredondando para o centavo mais próximo"""
+    return _rounded_int64(value, CENTS)
+
+
+def to_basis_points(percentage):
+    """Percentual (ex.: 30.5) para pontos-base inteiros (3050)"""
+    return _rounded_int64(percentage, BASIS_POINTS // 100)
+
+
+def from_cents(cents):
+    """Centavos para reais; o float resultante é o mais próximo do valor exato em centavos"""
+    return np.divide(cents, CENTS, dtype=float)
+
+
+def from_cents_inplace(cents, divisor=CENTS):
+    """Como ``from_cents``, reaproveitando o buffer de um array int64 contíguo
+
+    Retorna a visão float64 do mesmo buffer; o array de centavos deixa de
+    valer. Com ``divisor=1`` só converte o tipo (ex.: quantidades).
+    """
+    if cents.dtype != np.int64 or not cents.flags.c_contiguous or not cents.flags.writeable:
+        return np.divide(cents, divisor, out=np.empty(np.shape(cents)))
+    reais = cents.view(np.float64)
+    flat_cents, flat_reais = cents.reshape(-1), reais.reshape(-1)
+    for block in _blocks(flat_cents.size):
+        # Conversão exata para float (|centavos| < 2**53) e depois divisão em float, mais rápida
+        flat_reais[block] = flat_cents[block]
+        if divisor != 1:
+            flat_reais[block] /= divisor
+    return reais
+
+
+def round_div(numerator, denominator):
+    """Divisão inteira arredondada, meio para cima (``denominator`` positivo)"""
+    return (np.asarray(numerator, dtype=np.int64) + denominator // 2) // denominator
+
+
+def percent_of(cents, basis_points):
+    """Parcela percentual de um valor em centavos, arredondada para o centavo"""
+    # O mesmo que round_div, no lugar sobre o produto (um array novo)
+    share = np.asarray(np.multiply(cents, basis_points, dtype=np.int64))
+    share += BASIS_POINTS // 2
+    share //= BASIS_POINTS
+    return share
+
+
+def times_quantity(cents, quantity):
+    """Valor unitário × quantidade (que pode ser fracionária, ex.: demanda média), em centavos"""
+    if np.issubdtype(np.asarray(quantity).dtype, np.integer):
+        return np.multiply(cents, quantity, dtype=np.int64)
+    return np.rint(np.multiply(cents, quantity, dtype=float)).astype(np.int64)
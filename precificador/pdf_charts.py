@@ -0,0 +1,83 @@
+"""Gráficos vetoriais nativos do ReportLab para os relatórios PDF.
+
+Desenha o comparativo Receita/Comissão/Custo/Lucro diretamente com
+``reportlab.graphics``, sem exportar uma figura Plotly para PNG via kaleido
+(que inicia um navegador headless). O resultado é um Flowable vetorial que
+pode ser inserido diretamente na lista de elementos do documento.
+"""
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.shapes import Drawing, Group, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+from .palette import COR_SEM_PROMO, COR_COM_PROMO
+
+CATEGORIES = ['Receita', 'Comissão', 'Custo', 'Lucro']
+TITLE = "Comparação: Sem Promoção vs Com Promoção"
+
+
+def _format_currency(value):
+    """Formata os rótulos do eixo de valores"""
+    return f"R$ {value:,.0f}"
+
+
+def comparison_drawing(sem_promo, com_promo, width=6 * inch, height=4 * inch):
+    """Cria o gráfico de barras agrupadas Sem Promoção vs Com Promoção
+
+    ``sem_promo`` e ``com_promo`` são sequências com receita, comissão, custo
+    e lucro, na ordem de CATEGORIES.
+    """
+    drawing = Drawing(width, height)
+
+    drawing.add(String(width / 2, height - 16, TITLE, fontName='Helvetica-Bold',
+                       fontSize=12, textAnchor='middle'))
+
+    chart = VerticalBarChart()
+    chart.x = 60
+    chart.y = 45
+    chart.width = width - 80
+    chart.height = height - 95
+    chart.data = [list(sem_promo), list(com_promo)]
+    chart.groupSpacing = 12
+    chart.barSpacing = 2
+    chart.bars[0].fillColor = colors.HexColor(COR_SEM_PROMO)
+    chart.bars[1].fillColor = colors.HexColor(COR_COM_PROMO)
+    chart.bars.strokeColor = None
+
+    chart.categoryAxis.categoryNames = CATEGORIES
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 9
+    chart.categoryAxis.labels.dy = -4
+
+    lowest = min(0, *chart.data[0], *chart.data[1])
+    chart.valueAxis.valueMin = lowest * 1.1
+    chart.valueAxis.labelTextFormat = _format_currency
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.gridStrokeColor = colors.HexColor('#DDDDDD')
+    chart.valueAxis.visibleGrid = True
+    drawing.add(chart)
+
+    # Título do eixo Y rotacionado 90°
+    y_title = Group(String(0, 0, "Valor (R$)", fontName='Helvetica', fontSize=9, textAnchor='middle'))
+    y_title.transform = (0, 1, -1, 0, 14, chart.y + chart.height / 2)
+    drawing.add(y_title)
+
+    legend = Legend()
+    legend.x = width / 2 - 90
+    legend.y = 14
+    legend.alignment = 'right'
+    legend.columnMaximum = 1
+    legend.fontName = 'Helvetica'
+    legend.fontSize = 9
+    legend.dx = 8
+    legend.dy = 8
+    legend.deltax = 100
+    legend.colorNamePairs = [
+        (colors.HexColor(COR_SEM_PROMO), 'Sem Promoção'),
+        (colors.HexColor(COR_COM_PROMO), 'Com Promoção'),
+    ]
+    drawing.add(legend)
+
+    return drawing
@@ -0,0 +1,466 @@
+"""Geração dos relatórios PDF de estratégia de promoção.
+
+Módulo independente do Streamlit: é usado tanto pelo dashboard quanto pela
+geração em lote (batch_reports.py). Importa o ReportLab, então o dashboard só
+o carrega quando um relatório é de fato gerado; Plotly/kaleido só são
+carregados com ``chart_renderer='plotly'``.
+"""
+import io
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, KeepTogether, PageBreak, Table, TableStyle
+
+from .palette import (VERDE_SALVIA, VERDE_MUSGO, BEGE_NEUTRO, CREME_SUAVE, MARROM_TERRA,
+                     VERDE_OLIVA_ESCURO)
+from .pricing import Scenario, compute_scenario, compute_scenarios
+from .pdf_charts import comparison_drawing
+from .seasonal_store import MONTHS, service_plural
+
+# Renderizadores do gráfico do PDF: vetorial nativo ou Plotly exportado via kaleido
+PDF_CHART_RENDERERS = ('reportlab', 'plotly')
+DEFAULT_PDF_CHART_RENDERER = 'reportlab'
+
+# Estilos compartilhados por todos os relatórios do processo
+ReportStyles = namedtuple('ReportStyles', ['title', 'subtitle', 'heading', 'section', 'normal',
+                                           'footer', 'table_cell', 'table_header'])
+
+
+@lru_cache(maxsize=None)
+def report_styles():
+    """Cria os estilos do relatório uma única vez por processo"""
+    styles = getSampleStyleSheet()
+    normal = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor(VERDE_OLIVA_ESCURO),
+        spaceAfter=6,
+        leading=14
+    )
+    return ReportStyles(
+        title=ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor(VERDE_SALVIA),
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        subtitle=ParagraphStyle('subtitle', parent=styles['Normal'], fontSize=10,
+                                textColor=colors.HexColor(MARROM_TERRA), alignment=TA_CENTER),
+        heading=ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor(VERDE_MUSGO),
+            spaceAfter=12,
+            spaceBefore=12,
+            fontName='Helvetica-Bold'
+        ),
+        section=ParagraphStyle('CustomSection', parent=styles['Heading3'], fontSize=12,
+                               textColor=colors.HexColor(VERDE_MUSGO), spaceAfter=6, spaceBefore=6,
+                               fontName='Helvetica-Bold'),
+        normal=normal,
+        footer=ParagraphStyle('footer', parent=styles['Normal'], fontSize=8,
+                              textColor=colors.HexColor(MARROM_TERRA), alignment=TA_CENTER),
+        table_cell=ParagraphStyle('TableCell', parent=normal, fontSize=8, leading=10, spaceAfter=0),
+        table_header=ParagraphStyle('TableHeader', parent=normal, fontSize=8, leading=10, spaceAfter=0,
+                                    fontName='Helvetica-Bold', textColor=colors.white),
+    )
+
+
+def _service_plural(service, is_custom=False):
+    """Nome do serviço no plural usado nos textos do relatório"""
+    if is_custom:
+        return "do serviço"
+    return service_plural(service)
+
+
+def _without_promo_text(revenue, commission, cost, profit):
+    """Texto do cenário sem promoção"""
+    return f"""
+    <b>Receita Total:</b> R$ {revenue:,.2f}<br/>
+    <b>Comissão Massagista:</b> R$ {commission:,.2f}<br/>
+    <b>Custo Total:</b> R$ {cost:,.2f}<br/>
+    <b>Lucro Real sem Estratégia:</b> R$ {profit:,.2f}
+    """
+
+
+def _with_promo_text(required_quantity, service_text, revenue, commission, cost, profit):
+    """Texto do cenário com promoção"""
+    return f"""
+    <b>Quantidade Necessária:</b> {required_quantity} {service_text}<br/>
+    <b>Receita Total:</b> R$ {revenue:,.2f}<br/>
+    <b>Comissão Massagista:</b> R$ {commission:,.2f}<br/>
+    <b>Custo Total:</b> R$ {cost:,.2f}<br/>
+    <b>Lucro Real da Estratégia:</b> R$ {profit:,.2f}
+    """
+
+
+def _chart_flowable(scenario, chart_renderer, normal_style, comparison_chart=None,
+                    width=6*inch, height=4*inch):
+    """Gráfico comparativo como Flowable, vetorial ou exportado via kaleido"""
+    if chart_renderer == 'reportlab':
+        # Desenha o gráfico diretamente como vetor, sem kaleido
+        return comparison_drawing(scenario.without_promo, scenario.with_promo, width=width, height=height)
+    # Salva o gráfico como imagem com fundo branco e texto preto
+    try:
+        # Plotly e kaleido só são carregados neste caminho
+        import plotly.io as pio
+        from .charts import create_comparison_chart
+        if comparison_chart is None:
+            comparison_chart = create_comparison_chart(scenario, theme='light')
+        img_buffer = io.BytesIO()
+        pio.write_image(comparison_chart, img_buffer, format='png', width=600, height=400)
+        img_buffer.seek(0)
+        return Image(img_buffer, width=width, height=height)
+    except:
+        return Paragraph("Gráfico não disponível nesta versão", normal_style)
+
+
+def _footer(styles):
+    """Rodapé com a data de geração"""
+    footer_text = f"<i>Relatório gerado automaticamente pelo Living Spa Dashboard em {datetime.now().strftime('%d/%m/%Y às %H:%M:%S')}</i>"
+    return Paragraph(footer_text, styles.footer)
+
+
+def _new_document(buffer):
+    """Documento A4 com as margens padrão dos relatórios"""
+    return SimpleDocTemplate(buffer, pagesize=A4,
+                             rightMargin=0.5*inch, leftMargin=0.5*inch,
+                             topMargin=0.5*inch, bottomMargin=0.5*inch)
+
+
+# Função para gerar PDF
+def generate_pdf_report(scenario, service, month, std_dev, comparison_chart=None, is_custom=False,
+                        chart_renderer=DEFAULT_PDF_CHART_RENDERER):
+    """Gera um relatório em PDF com todas as informações da estratégia de promoção
+
+    ``scenario`` é o Scenario já calculado (viável). Com
+    ``chart_renderer='reportlab'`` o gráfico é desenhado como vetor a partir
+    dos valores do cenário; com ``'plotly'`` a figura ``comparison_chart`` (ou
+    a de tema claro criada a partir do cenário) é exportada para PNG via kaleido.
+    """
+    if chart_renderer not in PDF_CHART_RENDERERS:
+        raise ValueError(f"Renderizador de gráfico inválido: {chart_renderer!r}")
+    
+    # Nome do serviço exibido no relatório
+    service_name_display = "Outros" if is_custom else service
+    
+    # Cria buffer para o PDF
+    pdf_buffer = io.BytesIO()
+    
+    # Cria o documento PDF
+    doc = _new_document(pdf_buffer)
+    
+    # Lista de elementos do PDF
+    elements = []
+    
+    # Estilos (compartilhados entre relatórios)
+    styles = report_styles()
+    title_style = styles.title
+    heading_style = styles.heading
+    normal_style = styles.normal
+    
+    # Título
+    elements.append(Paragraph("🌿 RELATÓRIO DE ESTRATÉGIA DE PROMOÇÃO", title_style))
+    elements.append(Paragraph(f"Living Spa - {datetime.now().strftime('%d/%m/%Y às %H:%M')}", styles.subtitle))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Seção 1: Informações Gerais
+    elements.append(Paragraph("1. INFORMAÇÕES GERAIS", heading_style))
+    
+    if is_custom:
+        info_text = f"""
+        <b>Serviço:</b> {service_name_display}<br/>
+        <b>Demanda Esperada:</b> {int(scenario.demand)} atendimentos<br/>
+        <b>Data do Relatório:</b> {datetime.now().strftime('%d/%m/%Y')}
+        """
+    else:
+        info_text = f"""
+        <b>Serviço:</b> {service_name_display}<br/>
+        <b>Mês da Promoção:</b> {month}<br/>
+        <b>Data do Relatório:</b> {datetime.now().strftime('%d/%m/%Y')}
+        """
+    elements.append(Paragraph(info_text, normal_style))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Seção 2: Análise de Demanda (apenas se não for custom)
+    if not is_custom:
+        elements.append(Paragraph("2. ANÁLISE DE DEMANDA", heading_style))
+        
+        demand_text = f"""
+        <b>Demanda Esperada:</b> {int(scenario.demand)} atendimentos<br/>
+        <b>Desvio Padrão:</b> ±{std_dev:.2f}
+        """
+        elements.append(Paragraph(demand_text, normal_style))
+        elements.append(Spacer(1, 0.2*inch))
+        
+        section_number = 3
+    else:
+        section_number = 2
+    
+    # Seção de Parâmetros de Precificação
+    elements.append(Paragraph(f"{section_number}. PARÂMETROS DE PRECIFICAÇÃO", heading_style))
+    
+    pricing_text = f"""
+    <b>Preço Original:</b> R$ {scenario.original_price:.2f}<br/>
+    <b>Preço Promocional:</b> R$ {scenario.promotional_price:.2f}<br/>
+    <b>Desconto:</b> {scenario.discount_percentage:.1f}%<br/>
+    <b>Custo por Serviço:</b> R$ {scenario.service_cost:.2f}<br/>
+    <b>Comissão Massagista:</b> {scenario.commission_percentage:.1f}%<br/>
+    <b>Lucro Adicional Desejado:</b> {scenario.desired_profit_increase:.1f}%
+    """
+    elements.append(Paragraph(pricing_text, normal_style))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Seção de Cenário Sem Promoção
+    section_number += 1
+    elements.append(Paragraph(f"{section_number}. CENÁRIO SEM PROMOÇÃO (BASELINE)", heading_style))
+    
+    without_text = _without_promo_text(*scenario.without_promo)
+    elements.append(Paragraph(without_text, normal_style))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Seção de Cenário Com Promoção
+    section_number += 1
+    elements.append(Paragraph(f"{section_number}. CENÁRIO COM PROMOÇÃO (META)", heading_style))
+    
+    service_text = _service_plural(service, is_custom)
+    with_text = _with_promo_text(scenario.required_quantity, service_text, *scenario.with_promo)
+    elements.append(Paragraph(with_text, normal_style))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Seção de Resumo Executivo
+    section_number += 1
+    elements.append(Paragraph(f"{section_number}. RESUMO EXECUTIVO", heading_style))
+    
+    lucro_diff = scenario.spa_revenue_with_promo - scenario.spa_revenue_without_promo
+    lucro_diff_pct = scenario.profit_change_percentage
+    
+    summary_text = f"""
+    <b>Estratégia:</b> Reduzir o preço de R$ {scenario.original_price:.2f} para R$ {scenario.promotional_price:.2f} (desconto de {scenario.discount_percentage:.1f}%)<br/><br/>
+    
+    <b>Objetivo:</b> Aumentar o lucro em {scenario.desired_profit_increase:.1f}% em relação ao cenário atual<br/><br/>
+    
+    <b>Meta de Vendas:</b> {scenario.required_quantity} {service_text} ao preço promocional<br/><br/>
+    
+    <b>Impacto no Lucro:</b> Aumento de R$ {lucro_diff:,.2f} ({lucro_diff_pct:+.1f}%)<br/><br/>
+    
+    <b>Lucro Esperado:</b> R$ {scenario.spa_revenue_with_promo:,.2f} (vs R$ {scenario.spa_revenue_without_promo:,.2f} sem promoção)
+    """
+    
+    elements.append(Paragraph(summary_text, normal_style))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Seção de Gráfico Comparativo
+    section_number += 1
+    elements.append(Paragraph(f"{section_number}. GRÁFICO COMPARATIVO", heading_style))
+    
+    elements.append(_chart_flowable(scenario, chart_renderer, normal_style, comparison_chart))
+    
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Rodapé
+    elements.append(Spacer(1, 0.1*inch))
+    elements.append(_footer(styles))
+    
+    # Constrói o PDF
+    doc.build(elements)
+    pdf_buffer.seek(0)
+    
+    return pdf_buffer
+
+
+# Gera o PDF completo de um cenário a partir das entradas
+def render_pdf_report(scenario, service, month, std_dev, is_custom=False,
+                      chart_renderer=DEFAULT_PDF_CHART_RENDERER):
+    """Retorna os bytes do relatório PDF de um cenário já calculado
+
+    Lança ValueError se o preço promocional não cobre comissão e custo.
+    """
+    if not scenario.feasible:
+        raise ValueError(f"Preço promocional R$ {scenario.promotional_price:.2f} não cobre comissão e custo")
+
+    pdf_buffer = generate_pdf_report(scenario, service, month, std_dev, is_custom=is_custom,
+                                     chart_renderer=chart_renderer)
+    return pdf_buffer.getvalue()
+
+
+def render_scenario_report(service, month, demand, std_dev, original_price, service_cost,
+                           commission_percentage, desired_profit_increase, promotional_price,
+                           is_custom=False, chart_renderer=DEFAULT_PDF_CHART_RENDERER):
+    """Calcula o cenário e retorna os bytes do relatório PDF"""
+    scenario = compute_scenario(demand, original_price, promotional_price, service_cost,
+                                commission_percentage, desired_profit_increase)
+    return render_pdf_report(scenario, service, month, std_dev, is_custom=is_custom,
+                             chart_renderer=chart_renderer)
+
+
+# Estilo base da tabela de resumo anual
+_SUMMARY_TABLE_COMMANDS = (
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(VERDE_MUSGO)),
+    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor(MARROM_TERRA)),
+    ('TOPPADDING', (0, 0), (-1, -1), 3),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+)
+
+
+def annual_totals(scenarios):
+    """Lucro sem e com promoção somados nos cenários
+
+    O lucro sem promoção soma todos os cenários. Nos inviáveis a promoção não
+    é feita, então eles entram no total com promoção pelo lucro sem promoção.
+    """
+    without = sum(scenario.spa_revenue_without_promo for scenario in scenarios)
+    with_promo = sum(scenario.spa_revenue_with_promo if scenario.feasible else scenario.spa_revenue_without_promo
+                     for scenario in scenarios)
+    return without, with_promo
+
+
+def generate_annual_pdf_report(store, original_price, service_cost, commission_percentage,
+                               desired_profit_increase, promotional_price, services=None,
+                               chart_renderer=DEFAULT_PDF_CHART_RENDERER):
+    """Gera o relatório anual consolidado com uma seção por serviço e mês
+
+    Todos os cenários do ano são calculados em uma única chamada vetorizada e
+    os estilos são os mesmos de generate_pdf_report, criados uma única vez.
+    A primeira página traz a tabela de lucro sem vs com promoção do ano todo.
+    """
+    if chart_renderer not in PDF_CHART_RENDERERS:
+        raise ValueError(f"Renderizador de gráfico inválido: {chart_renderer!r}")
+
+    styles = report_styles()
+    services = [s for s in store.services if services is None or s in services]
+
+    # Uma linha por serviço × mês com dados
+    rows = [(service, month_num, store.lookup(service, month_num))
+            for service in services for month_num in MONTHS]
+    rows = [(service, month_num, stats) for service, month_num, stats in rows if stats is not None]
+    if not rows:
+        raise ValueError("Nenhum dado sazonal para os serviços informados")
+
+    inputs = dict(demand=np.array([stats.media for _, _, stats in rows]), original_price=original_price,
+                  promotional_price=promotional_price, service_cost=service_cost,
+                  commission_percentage=commission_percentage,
+                  desired_profit_increase=desired_profit_increase)
+    results = compute_scenarios(**inputs)
+    scenarios = [Scenario.from_results(inputs, results, i) for i in range(len(rows))]
+
+    pdf_buffer = io.BytesIO()
+    doc = _new_document(pdf_buffer)
+    elements = []
+
+    # Capa e parâmetros
+    elements.append(Paragraph("🌿 RELATÓRIO ANUAL DE PROMOÇÕES", styles.title))
+    elements.append(Paragraph(f"Living Spa - {datetime.now().strftime('%d/%m/%Y às %H:%M')}", styles.subtitle))
+    elements.append(Spacer(1, 0.3*inch))
+
+    elements.append(Paragraph("PARÂMETROS DE PRECIFICAÇÃO", styles.heading))
+    pricing_text = f"""
+    <b>Preço Original:</b> R$ {original_price:.2f}<br/>
+    <b>Preço Promocional:</b> R$ {promotional_price:.2f}<br/>
+    <b>Desconto:</b> {scenarios[0].discount_percentage:.1f}%<br/>
+    <b>Custo por Serviço:</b> R$ {service_cost:.2f}<br/>
+    <b>Comissão Massagista:</b> {commission_percentage:.1f}%<br/>
+    <b>Lucro Adicional Desejado:</b> {desired_profit_increase:.1f}%
+    """
+    elements.append(Paragraph(pricing_text, styles.normal))
+
+    # Resumo anual: lucro sem vs com promoção
+    elements.append(Paragraph("RESUMO ANUAL", styles.heading))
+    header = ['Mês', 'Demanda', 'Qtd. Necessária', 'Lucro sem Promoção', 'Lucro com Promoção', 'Diferença']
+    table_data = [[Paragraph(h, styles.table_header) for h in header]]
+    commands = list(_SUMMARY_TABLE_COMMANDS)
+
+    def add_total_row(label, without, with_promo):
+        commands.append(('BACKGROUND', (0, len(table_data)), (-1, len(table_data)), colors.HexColor(BEGE_NEUTRO)))
+        commands.append(('FONTNAME', (0, len(table_data)), (-1, len(table_data)), 'Helvetica-Bold'))
+        table_data.append([label, '', '', f"R$ {without:,.2f}", f"R$ {with_promo:,.2f}",
+                           f"R$ {with_promo - without:,.2f}"])
+
+    grand_without = grand_with = 0.0
+    for service in services:
+        indices = [i for i, (row_service, _, _) in enumerate(rows) if row_service == service]
+        if not indices:
+            continue
+        commands.append(('SPAN', (0, len(table_data)), (-1, len(table_data))))
+        commands.append(('BACKGROUND', (0, len(table_data)), (-1, len(table_data)), colors.HexColor(CREME_SUAVE)))
+        table_data.append([Paragraph(f"<b>{service}</b>", styles.table_cell), '', '', '', '', ''])
+
+        for i in indices:
+            scenario = scenarios[i]
+            without = scenario.spa_revenue_without_promo
+            if scenario.feasible:
+                with_promo = scenario.spa_revenue_with_promo
+                table_data.append([MONTHS[rows[i][1]], f"{scenario.demand:.0f}",
+                                   f"{scenario.required_quantity}", f"R$ {without:,.2f}",
+                                   f"R$ {with_promo:,.2f}", f"R$ {with_promo - without:,.2f}"])
+            else:
+                table_data.append([MONTHS[rows[i][1]], f"{scenario.demand:.0f}", "inviável",
+                                   f"R$ {without:,.2f}", "—", "—"])
+        service_without, service_with = annual_totals([scenarios[i] for i in indices])
+        add_total_row("Total", service_without, service_with)
+        grand_without += service_without
+        grand_with += service_with
+
+    add_total_row("TOTAL GERAL", grand_without, grand_with)
+    commands.append(('LINEABOVE', (0, -1), (-1, -1), 1, colors.HexColor(VERDE_MUSGO)))
+    summary_table = Table(table_data, repeatRows=1,
+                          colWidths=[1.3*inch, 0.9*inch, 1.1*inch, 1.45*inch, 1.45*inch, 1.2*inch])
+    summary_table.setStyle(TableStyle(commands))
+    summary_table.hAlign = 'LEFT'
+    elements.append(summary_table)
+    if not all(scenario.feasible for scenario in scenarios):
+        elements.append(Paragraph(
+            "Meses inviáveis ficam sem promoção: entram nos totais com o lucro sem promoção.", styles.footer))
+
+    # Uma seção por serviço e mês
+    for i, ((service, month_num, stats), scenario) in enumerate(zip(rows, scenarios)):
+        if i == 0 or rows[i - 1][0] != service:
+            elements.append(PageBreak())
+            elements.append(Paragraph(service.upper(), styles.heading))
+
+        section = [Paragraph(f"{MONTHS[month_num]} — {service}", styles.section)]
+        section.append(Paragraph(
+            f"<b>Demanda Esperada:</b> {int(stats.media)} atendimentos "
+            f"(desvio padrão ±{stats.desvio_padrao:.2f})", styles.normal))
+        without_paragraph = Paragraph(_without_promo_text(*scenario.without_promo), styles.normal)
+
+        if scenario.feasible:
+            with_paragraph = Paragraph(
+                _with_promo_text(scenario.required_quantity, _service_plural(service), *scenario.with_promo),
+                styles.normal)
+        else:
+            with_paragraph = Paragraph(
+                "<b>Cenário inviável:</b> o preço promocional não cobre comissão e custo.", styles.normal)
+
+        # Cenários lado a lado para caber duas seções por página
+        side_by_side = Table([[without_paragraph, with_paragraph]], colWidths=[3.6*inch, 3.6*inch])
+        side_by_side.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                                          ('LEFTPADDING', (0, 0), (-1, -1), 0)]))
+        section.append(side_by_side)
+
+        if scenario.feasible:
+            section.append(_chart_flowable(scenario, chart_renderer, styles.normal,
+                                           width=6*inch, height=2.6*inch))
+        section.append(Spacer(1, 0.2*inch))
+        elements.append(KeepTogether(section))
+
+    elements.append(_footer(styles))
+
+    doc.build(elements)
+    pdf_buffer.seek(0)
+
+    return pdf_buffer
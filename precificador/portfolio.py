@@ -0,0 +1,205 @@
+"""Planejamento anual das promoções de todos os serviços sob a capacidade das massagistas.
+
+O solver de preço (promo_solver) olha um serviço e um mês por vez; aqui os
+preços de todos os serviços × 12 meses são escolhidos juntos, porque
+drenagem e massagem disputam as mesmas horas de massagistas e salas. O
+objetivo é o lucro anual esperado, com a demanda reagindo ao preço pelo
+mesmo modelo de elasticidade constante do otimizador, e nenhum mês pode
+agendar mais horas do que a capacidade.
+
+Os meses são independentes (a capacidade é mensal), e em cada mês a
+restrição de capacidade é tratada por relaxação lagrangiana: com um preço
+``λ`` por hora ocupada, cada serviço escolhe sozinho o preço que maximiza
+``(margem(p) - λ · horas) · demanda(p)``, que com elasticidade constante tem
+solução fechada. O uso de horas cai com ``λ``, então ``λ`` é achado por
+bisseção, vetorizada nos 12 meses. Quando nem o preço cheio cabe na
+capacidade, os atendimentos são racionados pelo lucro por hora. O custo é
+independente do número de serviços além das operações em arrays; 20+
+serviços são planejados em milissegundos.
+
+Preços são arredondados para cima, em centavos: com demanda elástica isso só
+reduz a ocupação, então o plano final continua dentro da capacidade. Se o
+arredondamento deixar o lucro de um mês abaixo do lucro sem promoção, o mês
+fica sem promoção; assim o plano nunca é pior que não fazer promoção.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .seasonal_store import MONTHS
+
+SLOT_MINUTES = 50
+BISECTION_STEPS = 60
+
+# Plano anual; matrizes com forma (serviços, 12)
+PortfolioPlan = namedtuple('PortfolioPlan', [
+    'services', 'prices', 'discount', 'demand', 'sessions', 'profit',
+    'baseline_sessions', 'baseline_profit',
+    'capacity_hours', 'used_hours', 'shadow_price',
+])
+
+
+def _best_prices(shadow_price, margin_rate, service_cost, hours, elasticity, lower, upper):
+    """Preço que maximiza ``(margem(p) - λ · horas) · demanda(p)`` em [lower, upper]
+
+    Com demanda ``p ** e``, o ótimo sem limites é ``k / a · e / (1 + e)``
+    (``a`` = 1 - comissão, ``k`` = custo + λ · horas), que só existe para
+    e < -1; com demanda pouco elástica o lucro cresce com o preço e o ótimo é
+    o preço cheio.
+    """
+    effective_cost = service_cost + shadow_price * hours
+    with np.errstate(divide='ignore', invalid='ignore'):
+        optimum = effective_cost / margin_rate * elasticity / (1 + elasticity)
+    optimum = np.where(elasticity < -1, optimum, upper)
+    return np.clip(optimum, lower, upper)
+
+
+def _allocate(shadow_price, demand, margin_rate, service_cost, hours, elasticity,
+              original_price, lower, upper, viable):
+    """Preços, demanda e atendimentos de cada serviço para os preços-sombra ``λ`` dos meses"""
+    prices = _best_prices(shadow_price, margin_rate, service_cost, hours, elasticity, lower, upper)
+    expected = demand * (prices / original_price) ** elasticity
+    worth = margin_rate * prices - service_cost - shadow_price * hours
+    sessions = np.where(viable & (worth > 0), expected, 0.0)
+    return prices, expected, sessions
+
+
+def _ration(prices, expected, sessions, dropped, margin_rate, service_cost, hours, spare_hours):
+    """Preenche as horas que sobraram com os serviços cortados no λ final, pelo lucro por hora"""
+    profit_per_hour = np.where(dropped, (margin_rate * prices - service_cost) / hours, -np.inf)
+    for month in np.flatnonzero(dropped.any(axis=0)):
+        for service in np.argsort(-profit_per_hour[:, month]):
+            if not dropped[service, month] or spare_hours[month] <= 0:
+                break
+            extra = min(expected[service, month], spare_hours[month] / hours[service, month])
+            sessions[service, month] += extra
+            spare_hours[month] -= extra * hours[service, month]
+    return sessions
+
+
+def _solve(demand, margin_rate, service_cost, hours, elasticity, original_price, lower, upper,
+           viable, capacity_hours):
+    """Resolve os 12 meses de uma vez; retorna (preços, demanda, atendimentos, λ)"""
+    args = (demand, margin_rate, service_cost, hours, elasticity, original_price, lower, upper, viable)
+    low = np.zeros(demand.shape[1])
+    prices, expected, sessions = _allocate(low, *args)
+    constrained = (sessions * hours).sum(axis=0) > capacity_hours
+    if not constrained.any():
+        return prices, expected, sessions, low
+
+    # λ acima do maior lucro por hora a preço cheio zera todos os serviços
+    high = np.full_like(low, np.max(np.where(viable, (margin_rate * upper - service_cost) / hours, 0.0)) + 1.0)
+    high = np.where(constrained, high, 0.0)
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        used = (_allocate(middle, *args)[2] * hours).sum(axis=0)
+        over = constrained & (used > capacity_hours)
+        low = np.where(over, middle, low)
+        high = np.where(constrained & ~over, middle, high)
+
+    # O lado alto da bisseção é viável; serviços cortados exatamente em λ* recebem a folga
+    prices, expected, sessions = _allocate(high, *args)
+    dropped = constrained & (sessions == 0) & (_allocate(low, *args)[2] > 0)
+    spare_hours = capacity_hours - (sessions * hours).sum(axis=0)
+    sessions = _ration(prices, expected, sessions, dropped, margin_rate, service_cost, hours, spare_hours)
+    return prices, expected, sessions, high
+
+
+def plan_portfolio(services, demand, original_price, service_cost, commission_percentage, elasticity,
+                   capacity_hours, slot_minutes=SLOT_MINUTES, max_discount=None):
+    """Escolhe o preço de cada serviço em cada mês maximizando o lucro anual sob a capacidade
+
+    ``demand`` tem forma (serviços, 12) com a demanda ao preço cheio; os
+    parâmetros por serviço aceitam escalares ou arrays (serviços,) e
+    ``capacity_hours`` (horas de atendimento disponíveis no mês) um escalar
+    ou um array (12,). ``max_discount`` (0 a 1) limita o desconto. Sem
+    elasticidade (0 ou acima de -1) o serviço fica no preço cheio e só é
+    racionado se faltar capacidade.
+    """
+    demand = np.asarray(demand, dtype=float)
+    n_services = demand.shape[0]
+
+    def column(value):
+        return np.broadcast_to(np.asarray(value, dtype=float), (n_services,))[:, None]
+
+    original_price = column(original_price)
+    service_cost = column(service_cost)
+    margin_rate = 1 - column(commission_percentage) / 100
+    elasticity = column(elasticity)
+    hours = np.broadcast_to(column(slot_minutes) / 60, demand.shape)
+    capacity_hours = np.broadcast_to(np.asarray(capacity_hours, dtype=float), (demand.shape[1],))
+
+    # Faixa de preços com lucro por atendimento positivo (como em promo_solver.price_bounds)
+    with np.errstate(divide='ignore'):
+        breakeven = np.where(margin_rate > 0, service_cost / margin_rate, np.inf)
+    lower = np.maximum(breakeven, 0.0)
+    if max_discount is not None:
+        lower = np.maximum(lower, original_price * (1 - max_discount))
+    upper = original_price
+    viable = np.broadcast_to((lower < upper) & (demand.sum(axis=1, keepdims=True) > 0), demand.shape)
+    lower = np.minimum(lower, upper)
+
+    # Sem promoção: preço cheio e demanda fixa, racionada pela mesma capacidade
+    no_promo = np.zeros_like(elasticity)
+    _, _, baseline_sessions, baseline_shadow_price = _solve(demand, margin_rate, service_cost, hours, no_promo,
+                                                            original_price, upper, upper, viable, capacity_hours)
+    baseline_profit = (margin_rate * upper - service_cost) * baseline_sessions
+
+    prices, expected, sessions, shadow_price = _solve(demand, margin_rate, service_cost, hours, elasticity,
+                                                      original_price, lower, upper, viable, capacity_hours)
+
+    # Centavos, arredondando para cima: a demanda só diminui e o plano segue viável
+    prices = np.minimum(np.ceil(np.round(prices * 100, 6)) / 100, upper)
+    expected = demand * (prices / original_price) ** elasticity
+    sessions = np.minimum(sessions, expected)
+    profit = (margin_rate * prices - service_cost) * sessions
+
+    # O arredondamento pode deixar um mês um pouco abaixo do plano sem promoção: esse mês fica sem promoção
+    worse = profit.sum(axis=0) < baseline_profit.sum(axis=0)
+    if worse.any():
+        prices = np.where(worse, upper, prices)
+        expected = np.where(worse, demand, expected)
+        sessions = np.where(worse, baseline_sessions, sessions)
+        profit = np.where(worse, baseline_profit, profit)
+        shadow_price = np.where(worse, baseline_shadow_price, shadow_price)
+
+    return PortfolioPlan(
+        services=tuple(services),
+        prices=prices,
+        discount=1 - prices / original_price,
+        demand=expected,
+        sessions=sessions,
+        profit=profit,
+        baseline_sessions=baseline_sessions,
+        baseline_profit=baseline_profit,
+        capacity_hours=np.array(capacity_hours),
+        used_hours=(sessions * hours).sum(axis=0),
+        shadow_price=shadow_price,
+    )
+
+
+def demand_matrix(store, services):
+    """Demanda média (serviços, 12) dos dados sazonais, com 0 nos meses sem dado"""
+    matrix = np.zeros((len(services), 12))
+    for i, service in enumerate(services):
+        for month in MONTHS:
+            stats = store.lookup(service, month)
+            if stats is not None:
+                matrix[i, month - 1] = stats.media
+    return matrix
+
+
+def plan_frame(plan):
+    """Plano em formato longo (uma linha por serviço e mês) para exibição"""
+    n_services = len(plan.services)
+    return pd.DataFrame({
+        'Servico': np.repeat(plan.services, 12),
+        'Mes': np.tile([MONTHS[month] for month in MONTHS], n_services),
+        'Preco': plan.prices.ravel(),
+        'Desconto (%)': plan.discount.ravel() * 100,
+        'Demanda': plan.demand.ravel(),
+        'Atendimentos': plan.sessions.ravel(),
+        'Lucro': plan.profit.ravel(),
+        'Lucro sem Promoção': plan.baseline_profit.ravel(),
+    })
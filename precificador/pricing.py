@@ -0,0 +1,292 @@
+"""Motor de precificação vetorizado.
+
+Todas as funções aceitam escalares ou arrays NumPy (com broadcast), de modo
+que o mesmo código atende tanto o cenário único da interface quanto grades
+com dezenas de milhares de combinações avaliadas em uma só chamada.
+
+Os valores monetários são calculados em centavos inteiros (ver ``money``):
+cada resultado é um número exato de centavos e a quantidade necessária é a
+divisão exata da meta pelo lucro por atendimento, arredondada para cima.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .money import (BASIS_POINTS, CENTS, from_cents, from_cents_inplace, percent_of, times_quantity, to_basis_points,
+                    to_cents)
+
+# Versão das fórmulas; entra na chave do histórico para cenários gravados por
+# versões anteriores não serem reaproveitados (2: centavos inteiros)
+ENGINE_VERSION = 2
+
+# Parâmetros de entrada de um cenário, na ordem de compute_scenarios
+INPUT_COLUMNS = (
+    'demand', 'original_price', 'promotional_price', 'service_cost',
+    'commission_percentage', 'desired_profit_increase',
+)
+
+# Colunas derivadas retornadas por compute_scenarios
+RESULT_COLUMNS = (
+    'revenue_without_promo', 'commission_without_promo',
+    'total_service_cost_without_promo', 'spa_revenue_without_promo',
+    'desired_spa_revenue', 'profit_per_promo_service', 'required_quantity',
+    'total_promo_revenue', 'final_commission',
+    'total_service_cost_with_promo', 'spa_revenue_with_promo', 'feasible',
+)
+
+# Totais com promoção; só são calculados se alguma delas for pedida
+_PROMO_TOTALS = (
+    'total_promo_revenue', 'final_commission', 'total_service_cost_with_promo', 'spa_revenue_with_promo',
+)
+
+# Colunas que dependem da quantidade necessária (nan nos cenários inviáveis)
+_PROMO_COLUMNS = ('required_quantity',) + _PROMO_TOTALS
+
+
+def revenue_breakdown(price, quantity, service_cost, commission_percentage):
+    """Retorna receita, comissão, custo e lucro do spa para preço × quantidade"""
+    revenue = times_quantity(to_cents(price), quantity)
+    commission = percent_of(revenue, to_basis_points(commission_percentage))
+    cost = times_quantity(to_cents(service_cost), quantity)
+    return from_cents(revenue), from_cents(commission), from_cents(cost), from_cents(revenue - commission - cost)
+
+
+def _check_columns(columns):
+    unknown = [name for name in columns if name not in RESULT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Colunas desconhecidas: {unknown}")
+
+
+def _scenario_values_cents(demand, original_cents, promotional_cents, service_cost_cents,
+                           commission_basis_points, profit_increase_basis_points, columns=RESULT_COLUMNS):
+    """Colunas derivadas pedidas em ``columns``, em centavos, e o formato do broadcast
+
+    As colunas sem promoção mantêm o formato das próprias entradas (em geral
+    escalares); o broadcast fica a cargo de quem chama.
+    """
+    original_cents = np.asarray(original_cents, dtype=np.int64)
+    promotional_cents = np.asarray(promotional_cents, dtype=np.int64)
+    service_cost_cents = np.asarray(service_cost_cents, dtype=np.int64)
+    commission_basis_points = np.asarray(commission_basis_points, dtype=np.int64)
+
+    # ===== CENÁRIO SEM PROMOÇÃO =====
+    revenue_without_promo = times_quantity(original_cents, demand)
+    commission_without_promo = percent_of(revenue_without_promo, commission_basis_points)
+    total_service_cost_without_promo = times_quantity(service_cost_cents, demand)
+    spa_revenue_without_promo = np.subtract(
+        revenue_without_promo, commission_without_promo,
+        out=np.empty(np.broadcast_shapes(np.shape(commission_without_promo),
+                                         np.shape(total_service_cost_without_promo)), np.int64)
+    )
+    spa_revenue_without_promo -= total_service_cost_without_promo
+
+    # ===== META DE LUCRO =====
+    desired_spa_revenue = percent_of(spa_revenue_without_promo, profit_increase_basis_points)
+    desired_spa_revenue += spa_revenue_without_promo
+
+    # ===== CENÁRIO COM PROMOÇÃO =====
+    # Operações no lugar sobre arrays do formato final: em lotes de milhões de
+    # cenários o custo é dominado pela alocação de temporários
+    shape = np.broadcast_shapes(np.shape(desired_spa_revenue), promotional_cents.shape,
+                                service_cost_cents.shape, commission_basis_points.shape)
+
+    # Lucro por atendimento exato, em 1/10000 de centavo
+    margin = np.subtract(BASIS_POINTS, commission_basis_points, out=np.empty(shape, np.int64))
+    margin *= promotional_cents
+    margin -= service_cost_cents * BASIS_POINTS
+
+    # Sem lucro por atendimento nenhuma quantidade atinge a meta: marca como
+    # inviável. A quantidade necessária é a divisão exata da meta pelo lucro,
+    # arredondada para cima (meta já atingida -> 0 atendimentos)
+    feasible = np.greater(margin, 0)
+    all_feasible = feasible.all()
+    required_quantity = np.multiply(desired_spa_revenue, -BASIS_POINTS, out=np.empty(shape, np.int64))
+    # Divisão inteira sem máscara quando todos os cenários são viáveis (o caso comum, e bem mais rápido)
+    np.floor_divide(required_quantity, margin, out=required_quantity, where=True if all_feasible else feasible)
+    np.negative(required_quantity, out=required_quantity)
+    if not all_feasible:
+        required_quantity[~feasible] = 0
+    if np.any(desired_spa_revenue < 0):
+        np.maximum(required_quantity, 0, out=required_quantity)
+
+    # O array da margem vira o lucro por atendimento arredondado para centavos
+    profit_per_promo_service = margin
+    profit_per_promo_service += BASIS_POINTS // 2
+    profit_per_promo_service //= BASIS_POINTS
+
+    values = {
+        'revenue_without_promo': revenue_without_promo,
+        'commission_without_promo': commission_without_promo,
+        'total_service_cost_without_promo': total_service_cost_without_promo,
+        'spa_revenue_without_promo': spa_revenue_without_promo,
+        'desired_spa_revenue': desired_spa_revenue,
+        'profit_per_promo_service': profit_per_promo_service,
+        'required_quantity': required_quantity,
+        'feasible': feasible,
+    }
+    if not any(name in columns for name in _PROMO_TOTALS):
+        return {name: values[name] for name in columns}, shape
+
+    total_promo_revenue = np.multiply(required_quantity, promotional_cents)
+    final_commission = np.multiply(total_promo_revenue, commission_basis_points)
+    final_commission += BASIS_POINTS // 2
+    final_commission //= BASIS_POINTS
+    total_service_cost_with_promo = np.multiply(required_quantity, service_cost_cents)
+    spa_revenue_with_promo = np.subtract(total_promo_revenue, final_commission)
+    spa_revenue_with_promo -= total_service_cost_with_promo
+
+    values.update(
+        total_promo_revenue=total_promo_revenue,
+        final_commission=final_commission,
+        total_service_cost_with_promo=total_service_cost_with_promo,
+        spa_revenue_with_promo=spa_revenue_with_promo,
+    )
+    return {name: values[name] for name in columns}, shape
+
+
+def compute_scenarios_cents(demand, original_cents, promotional_cents, service_cost_cents,
+                            commission_basis_points, profit_increase_basis_points, columns=RESULT_COLUMNS):
+    """Núcleo inteiro de compute_scenarios: valores em centavos e percentuais em pontos-base
+
+    Retorna um dict {coluna: ndarray int64} (``feasible`` é bool) com as
+    colunas pedidas em ``columns``. Cenários inviáveis ficam com quantidade
+    e totais com promoção zerados. Para lotes grandes, chamar direto com os
+    arrays já em centavos evita as conversões.
+    """
+    _check_columns(columns)
+    values, shape = _scenario_values_cents(demand, original_cents, promotional_cents, service_cost_cents,
+                                           commission_basis_points, profit_increase_basis_points, columns)
+    return {name: np.broadcast_to(value, shape) for name, value in values.items()}
+
+
+def compute_scenarios(demand, original_price, promotional_price, service_cost,
+                      commission_percentage, desired_profit_increase, columns=RESULT_COLUMNS):
+    """Calcula as colunas derivadas de um lote de cenários
+
+    Retorna um dict {coluna: ndarray} com o formato resultante do broadcast
+    das entradas, em reais. As contas são feitas em centavos inteiros
+    (compute_scenarios_cents); cenários inviáveis ficam com quantidade e
+    totais com promoção nan. Avaliações em lote que usam poucas colunas
+    (otimizador, Monte Carlo) pedem só essas em ``columns``: os totais com
+    promoção e as conversões das demais não são feitos.
+    """
+    _check_columns(columns)
+    values, shape = _scenario_values_cents(
+        np.asarray(demand, dtype=float), to_cents(original_price), to_cents(promotional_price),
+        to_cents(service_cost), to_basis_points(commission_percentage), to_basis_points(desired_profit_increase),
+        tuple(columns) + ('feasible',)
+    )
+    feasible = np.broadcast_to(values['feasible'], shape)
+    infeasible = None if feasible.all() else ~feasible
+
+    results = {}
+    for name in columns:
+        value = values[name]
+        if name == 'feasible':
+            results[name] = feasible
+        elif name in _PROMO_COLUMNS:
+            # Arrays novos, já no formato final: convertidos no próprio buffer; nan onde é inviável
+            value = from_cents_inplace(value, 1 if name == 'required_quantity' else CENTS)
+            if infeasible is not None:
+                value[infeasible] = np.nan
+            results[name] = value
+        elif np.shape(value) == shape:
+            results[name] = from_cents_inplace(value)
+        else:
+            results[name] = np.broadcast_to(from_cents(value), shape)
+    return results
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """Resultado imutável de um cenário, calculado uma vez e usado por todos os renderizadores
+
+    Se o preço promocional não cobre comissão e custo, ``feasible`` é False,
+    ``required_quantity`` é None e os totais com promoção são nan.
+    """
+    demand: float
+    original_price: float
+    promotional_price: float
+    service_cost: float
+    commission_percentage: float
+    desired_profit_increase: float
+    revenue_without_promo: float
+    commission_without_promo: float
+    total_service_cost_without_promo: float
+    spa_revenue_without_promo: float
+    desired_spa_revenue: float
+    profit_per_promo_service: float
+    required_quantity: int | None
+    total_promo_revenue: float
+    final_commission: float
+    total_service_cost_with_promo: float
+    spa_revenue_with_promo: float
+    feasible: bool
+
+    @classmethod
+    def from_results(cls, inputs, results, index=()):
+        """Cria o cenário a partir das entradas e do dict de compute_scenarios
+
+        ``index`` seleciona uma posição quando os arrays têm mais de um cenário.
+        """
+        values = {name: float(np.broadcast_to(inputs[name], results['feasible'].shape)[index])
+                  for name in INPUT_COLUMNS}
+        values.update({name: float(results[name][index]) for name in RESULT_COLUMNS})
+        values['feasible'] = bool(results['feasible'][index])
+        values['required_quantity'] = int(values['required_quantity']) if values['feasible'] else None
+        return cls(**values)
+
+    @property
+    def without_promo(self):
+        """Receita, comissão, custo e lucro sem promoção"""
+        return (self.revenue_without_promo, self.commission_without_promo,
+                self.total_service_cost_without_promo, self.spa_revenue_without_promo)
+
+    @property
+    def with_promo(self):
+        """Receita, comissão, custo e lucro com promoção"""
+        return (self.total_promo_revenue, self.final_commission,
+                self.total_service_cost_with_promo, self.spa_revenue_with_promo)
+
+    @property
+    def discount_percentage(self):
+        """Desconto do preço promocional sobre o original (%); 0 sem preço original"""
+        if self.original_price > 0:
+            return (1 - self.promotional_price / self.original_price) * 100
+        return 0
+
+    @property
+    def profit_change_percentage(self):
+        """Variação do lucro com promoção sobre o lucro atual (%)"""
+        if self.spa_revenue_without_promo > 0:
+            return (self.spa_revenue_with_promo / self.spa_revenue_without_promo - 1) * 100
+        return 0
+
+
+def compute_scenario(demand, original_price, promotional_price, service_cost,
+                     commission_percentage, desired_profit_increase):
+    """Calcula um único cenário e o retorna como Scenario"""
+    inputs = dict(zip(INPUT_COLUMNS, (demand, original_price, promotional_price, service_cost,
+                                      commission_percentage, desired_profit_increase)))
+    return Scenario.from_results(inputs, compute_scenarios(**inputs))
+
+
+def scenario_grid(**axes):
+    """Avalia o produto cartesiano dos valores informados para cada entrada
+
+    Cada argumento (ver INPUT_COLUMNS) recebe um escalar ou uma sequência de
+    valores. Retorna um DataFrame com uma linha por combinação, contendo as
+    entradas e todas as colunas derivadas.
+    """
+    missing = [name for name in INPUT_COLUMNS if name not in axes]
+    unknown = [name for name in axes if name not in INPUT_COLUMNS]
+    if missing or unknown:
+        raise ValueError(f"Parâmetros ausentes: {missing}; desconhecidos: {unknown}")
+
+    import pandas as pd
+
+    grids = np.meshgrid(*(np.atleast_1d(np.asarray(axes[name], dtype=float)) for name in INPUT_COLUMNS),
+                        indexing='ij')
+    inputs = {name: grid.ravel() for name, grid in zip(INPUT_COLUMNS, grids)}
+    results = compute_scenarios(*inputs.values())
+    return pd.DataFrame({**inputs, **results})
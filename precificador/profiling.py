@@ -0,0 +1,139 @@
+"""Cronometragem das etapas de cada rerun e captura opcional com cProfile.
+
+``rerun_timer(enabled)`` devolve um RerunTimer quando a depuração está ligada
+e, caso contrário, um timer nulo cujos métodos não fazem nada: com a
+depuração desligada o custo é só o de algumas chamadas vazias por rerun.
+
+O timer funciona por voltas (``lap``): cada marca atribui à etapa informada
+o tempo decorrido desde a marca anterior, sem precisar reindentar o script.
+Cada rerun concluído vira uma linha JSON em ``TIMING_LOG_PATH``; trabalhos
+fora da thread do script (ex.: geração do PDF) são gravados com ``timed``.
+"""
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+TIMING_LOG_PATH = 'timings.jsonl'
+
+# Variável de ambiente que liga a depuração em todas as sessões
+DEBUG_ENV_VAR = 'PRECIFICADOR_DEBUG'
+
+_log_lock = threading.Lock()
+
+
+def debug_enabled(query_value=None):
+    """Depuração ligada pela variável de ambiente ou por ``?debug=1`` na URL"""
+    return os.environ.get(DEBUG_ENV_VAR, '') not in ('', '0') or query_value == '1'
+
+
+def append_jsonl(record, path=TIMING_LOG_PATH):
+    """Acrescenta um registro JSON ao log (uma linha por registro)"""
+    line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+    with _log_lock, open(path, 'a', encoding='utf-8') as f:
+        f.write(line + '\n')
+
+
+class RerunTimer:
+    """Tempo por etapa de um rerun, em segundos"""
+
+    enabled = True
+
+    def __init__(self, log_path=TIMING_LOG_PATH):
+        self.log_path = log_path
+        self.stages = {}
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, name):
+        """Atribui a ``name`` o tempo desde a marca anterior"""
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + (now - self._last)
+        self._last = now
+
+    @property
+    def total(self):
+        return time.perf_counter() - self._start
+
+    def finish(self, **fields):
+        """Fecha a última volta, grava a linha no log e retorna o registro"""
+        self.lap('outros')
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'total_ms': round(self.total * 1000, 3),
+            'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            **fields,
+        }
+        append_jsonl(record, self.log_path)
+        return record
+
+
+class _DisabledTimer:
+    """Timer nulo usado com a depuração desligada"""
+
+    enabled = False
+    stages = {}
+    total = 0.0
+
+    def lap(self, name):
+        pass
+
+    def finish(self, **fields):
+        return None
+
+
+DISABLED_TIMER = _DisabledTimer()
+
+
+def rerun_timer(enabled, log_path=TIMING_LOG_PATH):
+    """RerunTimer quando ``enabled``; caso contrário o timer nulo compartilhado"""
+    return RerunTimer(log_path) if enabled else DISABLED_TIMER
+
+
+@contextmanager
+def timed(stage, log_path=TIMING_LOG_PATH, enabled=None, **fields):
+    """Cronometra um trabalho avulso e grava uma linha no log, se a depuração estiver ligada"""
+    if not (debug_enabled() if enabled is None else enabled):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        append_jsonl({
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'total_ms': round(elapsed * 1000, 3),
+            'stages_ms': {stage: round(elapsed * 1000, 3)},
+            **fields,
+        }, log_path)
+
+
+class RerunProfiler:
+    """Captura com cProfile de um único rerun"""
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self.enabled = True
+
+    def stop(self):
+        self._profile.disable()
+        self.enabled = False
+        return self
+
+    def summary(self, limit=25, sort='cumulative'):
+        """Texto das funções mais caras, no formato do pstats"""
+        buffer = io.StringIO()
+        pstats.Stats(self._profile, stream=buffer).strip_dirs().sort_stats(sort).print_stats(limit)
+        return buffer.getvalue()
+
+    def dump(self):
+        """Bytes do perfil no formato do pstats (abre com snakeviz, pstats etc.)"""
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
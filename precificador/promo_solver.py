@@ -0,0 +1,154 @@
+"""Otimizador de preço promocional.
+
+Em vez de o gestor testar preços por tentativa e erro, o solver calcula a faixa
+viável de preços de forma fechada e avalia todos os preços dessa faixa (em
+centavos) em uma única chamada vetorizada do motor de precificação.
+
+A resposta da demanda ao desconto segue um modelo de elasticidade constante:
+``demanda(p) = Media * (p / preço original) ** elasticidade``, com o desvio
+padrão escalado na mesma proporção. Com elasticidade 0 a demanda não reage ao
+preço.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .pricing import compute_scenarios
+
+OBJECTIVES = ('min_volume', 'max_profit')
+
+# Colunas do motor usadas na avaliação dos preços; os totais com promoção não são calculados
+SCENARIO_COLUMNS = ('required_quantity', 'profit_per_promo_service', 'feasible')
+
+# Limite de pontos avaliados; acima disso o passo da grade passa a ser de vários centavos
+MAX_GRID_POINTS = 200_000
+
+SolverResult = namedtuple('SolverResult', [
+    'feasible', 'price', 'required_quantity', 'expected_demand',
+    'expected_profit', 'reach_probability', 'min_price', 'max_price', 'message',
+])
+
+
+def price_bounds(original_price, service_cost, commission_percentage, max_price=None):
+    """Retorna a faixa (mín. exclusivo, máx.) de preços com lucro por atendimento positivo
+
+    O lucro por atendimento é ``p * (1 - comissão) - custo``, positivo apenas
+    para ``p > custo / (1 - comissão)``. Retorna None se nenhum preço é viável
+    (comissão >= 100% ou limite inferior acima do teto).
+    """
+    margin_rate = 1 - commission_percentage / 100
+    upper = original_price if max_price is None else min(max_price, original_price)
+    if margin_rate <= 0:
+        return None
+    lower = service_cost / margin_rate
+    if lower >= upper:
+        return None
+    return lower, upper
+
+
+def _normal_sf(x):
+    """Função de sobrevivência da normal padrão (Abramowitz-Stegun 7.1.26)"""
+    z = np.abs(x) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erfc = poly * np.exp(-z * z)
+    return np.where(x >= 0, 0.5 * erfc, 1 - 0.5 * erfc)
+
+
+def evaluate_prices(prices, demand, std_dev, original_price, service_cost,
+                    commission_percentage, desired_profit_increase, elasticity=0.0):
+    """Avalia um vetor de preços promocionais de uma só vez
+
+    Retorna o dict de compute_scenarios com as colunas SCENARIO_COLUMNS,
+    acrescido de ``expected_demand``, ``expected_profit`` (lucro por
+    atendimento × demanda esperada) e ``reach_probability`` (chance de a
+    demanda atingir a quantidade necessária).
+    """
+    prices = np.asarray(prices, dtype=float)
+    results = compute_scenarios(demand, original_price, prices, service_cost,
+                                commission_percentage, desired_profit_increase, columns=SCENARIO_COLUMNS)
+
+    scale = (prices / original_price) ** elasticity
+    expected_demand = demand * scale
+    spread = std_dev * scale
+    required = results['required_quantity']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if std_dev > 0:
+            reach_probability = _normal_sf((required - expected_demand) / spread)
+        else:
+            reach_probability = (expected_demand >= required).astype(float)
+    reach_probability = np.where(results['feasible'], reach_probability, 0.0)
+
+    results['expected_demand'] = expected_demand
+    results['expected_profit'] = results['profit_per_promo_service'] * expected_demand
+    results['reach_probability'] = reach_probability
+    return results
+
+
+def solve_promotional_price(demand, std_dev, original_price, service_cost,
+                            commission_percentage, desired_profit_increase,
+                            objective='min_volume', elasticity=0.0, max_price=None,
+                            min_discount=0.0, max_discount=None):
+    """Busca o preço promocional ótimo para um serviço/mês
+
+    A busca fica dentro da faixa de desconto escolhida (``min_discount`` a
+    ``max_discount``, frações do preço original). ``min_volume`` escolhe o
+    menor preço entre os que exigem a menor quantidade de atendimentos (a
+    quantidade só cai com o preço, então sem desconto mínimo a resposta é o
+    próprio preço original); ``max_profit`` escolhe o preço de maior lucro
+    esperado.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Objetivo inválido: {objective!r} (use {OBJECTIVES})")
+    if max_discount is not None and max_discount < min_discount:
+        raise ValueError(f"Faixa de desconto inválida: {min_discount!r} a {max_discount!r}")
+
+    discount_ceiling = original_price * (1 - min_discount)
+    max_price = discount_ceiling if max_price is None else min(max_price, discount_ceiling)
+    bounds = price_bounds(original_price, service_cost, commission_percentage, max_price)
+    floor_price = None if max_discount is None else original_price * (1 - max_discount)
+    if bounds is None or (floor_price is not None and floor_price > bounds[1]):
+        return SolverResult(False, None, None, None, None, 0.0, None, max_price,
+                            "Nenhum preço da faixa de desconto cobre comissão e custo: o lucro "
+                            "por atendimento seria zero ou negativo.")
+    lower, upper = bounds
+
+    # Grade em centavos acima do limite inferior exclusivo e a partir do desconto máximo
+    start = np.floor(lower * 100 + 1) / 100
+    if floor_price is not None:
+        start = max(start, np.ceil(round(floor_price * 100, 6)) / 100)
+        if start > upper:
+            start = upper
+    start_cents = int(round(start * 100))
+    upper_cents = int(np.floor(round(upper * 100, 6)))
+    # Faixas largas são percorridas com passo de vários centavos; o teto entra sempre
+    stride = max(1, -(-(upper_cents - start_cents + 1) // MAX_GRID_POINTS))
+    cents = np.arange(start_cents, upper_cents + 1, stride)
+    if cents.size and cents[-1] != upper_cents:
+        cents = np.append(cents, upper_cents)
+    prices = cents / 100
+    prices = prices[prices > lower]
+    if prices.size == 0:
+        prices = np.array([upper])
+
+    results = evaluate_prices(prices, demand, std_dev, original_price, service_cost,
+                              commission_percentage, desired_profit_increase, elasticity)
+
+    if objective == 'min_volume':
+        # argmin devolve a primeira ocorrência, isto é, o menor preço empatado
+        best = int(np.nanargmin(results['required_quantity']))
+    else:
+        best = int(np.nanargmax(results['expected_profit']))
+
+    return SolverResult(
+        feasible=True,
+        price=float(prices[best]),
+        required_quantity=int(results['required_quantity'][best]),
+        expected_demand=float(results['expected_demand'][best]),
+        expected_profit=float(results['expected_profit'][best]),
+        reach_probability=float(results['reach_probability'][best]),
+        min_price=float(lower if floor_price is None else max(lower, floor_price)),
+        max_price=float(upper),
+        message=None,
+    )
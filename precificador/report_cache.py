@@ -0,0 +1,71 @@
+"""Cache LRU dos relatórios PDF já gerados.
+
+Os PDFs são gerados sob demanda (apenas quando o usuário pede o download) e
+guardados em um cache limitado, compartilhado por todas as sessões do
+processo e indexado por um hash das entradas do cenário. Baixar de novo ou
+voltar a um cenário anterior devolve os bytes prontos.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 32
+
+
+def report_key(*values):
+    """Gera a chave do cache a partir das entradas do cenário"""
+    return hashlib.sha256(repr(values).encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """Cache LRU thread-safe de bytes de relatórios"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        """Busca e marca como recente; chamar com o lock"""
+        data = self._items.get(key)
+        if data is not None:
+            self._items.move_to_end(key)
+        return data
+
+    def get(self, key):
+        """Retorna os bytes do relatório ou None, marcando-o como recente"""
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, key, data):
+        """Armazena um relatório, descartando o menos usado se necessário"""
+        with self._lock:
+            self._items[key] = data
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """Retorna o relatório em cache ou o gera com factory() e o armazena
+
+        A geração acontece fora do lock, para não bloquear outras sessões.
+        """
+        # Os contadores são atualizados sob o lock: o cache é compartilhado entre sessões
+        with self._lock:
+            data = self._lookup(key)
+            if data is not None:
+                self.hits += 1
+                return data
+            self.misses += 1
+        data = factory()
+        self.put(key, data)
+        return data
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Instância compartilhada pelo dashboard
+pdf_cache = ReportCache()
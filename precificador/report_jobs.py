@@ -0,0 +1,224 @@
+"""Fila de geração dos relatórios PDF em processos de trabalho.
+
+Os relatórios pedidos no dashboard não são mais gerados na thread da sessão:
+viram tarefas de uma fila local atendida por um pool limitado de processos,
+compartilhado por todas as sessões do servidor. Pedidos idênticos (mesma
+chave) são deduplicados: enquanto um relatório está na fila ou sendo gerado,
+um novo pedido recebe a mesma tarefa, e um relatório já pronto sai direto do
+``pdf_cache``.
+
+Relatórios com o gráfico exportado via kaleido (``chart_renderer='plotly'``)
+abrem um navegador headless cada um; por isso vão para um pool próprio, com
+``DEFAULT_KALEIDO_WORKERS`` processos, trocado por um pool novo a cada
+``KALEIDO_TASKS_PER_POOL`` relatórios para a memória não crescer.
+
+Os pools só são criados no primeiro pedido de cada tipo e usam
+``forkserver`` onde existe (``spawn`` no Windows). ``fork`` a partir do
+servidor do Streamlit, que tem várias threads, pode copiar um lock preso e
+travar o processo filho; o servidor ``forkserver`` tem uma thread só e
+pré-carrega apenas o report_worker. O Streamlit registra o app.py como
+``__main__``, e o multiprocessing o reexecutaria em cada processo novo; o
+report_worker, carregado no servidor antes de qualquer fork, desliga essa
+reexecução nos processos de trabalho, sem tocar no ``__main__`` do servidor
+do Streamlit. Com ``spawn`` (Windows) não há pré-carregamento, e o app.py é
+reexecutado como ``__mp_main__`` em cada processo de trabalho.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from .report_cache import pdf_cache, report_key
+
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+DEFAULT_KALEIDO_WORKERS = 1
+KALEIDO_TASKS_PER_POOL = 20
+
+# Único módulo carregado pelo servidor forkserver
+WORKER_MODULE = 'precificador.report_worker'
+
+# Estados de uma tarefa
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+def _render(inputs, timing):
+    """Gera o relatório no processo de trabalho (já com o report_worker carregado)"""
+    from .report_worker import render
+    return render(inputs, timing)
+
+
+_context = None
+_context_lock = threading.Lock()
+
+
+def _worker_context():
+    """Contexto ``forkserver`` com o report_worker pré-carregado (``spawn`` onde não existe)
+
+    Criado uma vez por processo: o pré-carregamento vale para o servidor
+    forkserver, que é um só e sobe junto com o primeiro processo de trabalho.
+    """
+    global _context
+    with _context_lock:
+        if _context is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                _context = multiprocessing.get_context('forkserver')
+                _context.set_forkserver_preload([WORKER_MODULE])
+            else:
+                _context = multiprocessing.get_context('spawn')
+        return _context
+
+
+class ReportJob:
+    """Um relatório pedido à fila; o mesmo objeto é entregue a todos que pedirem a mesma chave"""
+
+    def __init__(self, key, future, kaleido=False):
+        self.key = key
+        self.future = future
+        self.kaleido = kaleido
+        self.submitted_at = time.monotonic()
+        self.finished_at = None
+
+    def _exception(self):
+        """Exceção da geração já concluída (cancelamento incluído), ou None"""
+        if self.future.cancelled():
+            return CancelledError("Geração cancelada")
+        return self.future.exception()
+
+    @property
+    def state(self):
+        if not self.future.done():
+            return RUNNING if self.future.running() else QUEUED
+        return FAILED if self._exception() is not None else DONE
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def data(self):
+        """Bytes do PDF, ou None enquanto não estiver pronto (ou se falhou)"""
+        if self.future.done() and self._exception() is None:
+            return self.future.result()
+        return None
+
+    @property
+    def error(self):
+        """Mensagem do erro da geração, ou None"""
+        if self.future.done():
+            exception = self._exception()
+            return None if exception is None else str(exception) or type(exception).__name__
+        return None
+
+    @property
+    def elapsed(self):
+        """Segundos desde o pedido (até a conclusão, se já terminou)"""
+        return (self.finished_at or time.monotonic()) - self.submitted_at
+
+
+class ReportQueue:
+    """Fila deduplicada de relatórios com pools de processos limitados"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, kaleido_workers=DEFAULT_KALEIDO_WORKERS, cache=pdf_cache):
+        self.workers = workers
+        self.kaleido_workers = kaleido_workers
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # chave -> ReportJob ainda não concluído, em ordem de pedido
+        self._executors = {}  # kaleido (bool) -> ProcessPoolExecutor
+        self._kaleido_submitted = 0  # relatórios enviados ao pool kaleido atual
+        atexit.register(self.shutdown)
+
+    def _executor(self, kaleido):
+        """Pool do tipo de relatório, criado (ou renovado, no kaleido) sob demanda; chamar com o lock"""
+        if kaleido:
+            if self._kaleido_submitted >= KALEIDO_TASKS_PER_POOL and True in self._executors:
+                # O pool antigo termina o que já recebeu e encerra seus processos
+                self._executors.pop(True).shutdown(wait=False)
+            if True not in self._executors:
+                self._kaleido_submitted = 0
+            self._kaleido_submitted += 1
+
+        executor = self._executors.get(kaleido)
+        if executor is None:
+            executor = ProcessPoolExecutor(self.kaleido_workers if kaleido else self.workers,
+                                           mp_context=_worker_context())
+            self._executors[kaleido] = executor
+        return executor
+
+    def submit(self, scenario, service, month, std_dev, is_custom=False, chart_renderer=None, timing=False):
+        """Pede o relatório do cenário e retorna o ReportJob (novo, em andamento ou já pronto)"""
+        inputs = (scenario, service, month, std_dev, is_custom, chart_renderer)
+        # A data entra na chave porque é impressa no relatório
+        key = report_key(datetime.now().strftime('%d/%m/%Y'), *inputs)
+        kaleido = chart_renderer == 'plotly'
+
+        data = self.cache.get(key)
+        if data is not None:
+            future = Future()
+            future.set_result(data)
+            job = ReportJob(key, future, kaleido)
+            job.finished_at = job.submitted_at
+            return job
+
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                return job
+            try:
+                future = self._executor(kaleido).submit(_render, inputs, timing)
+            except BrokenProcessPool:
+                # Um processo morreu (ex.: falta de memória): recria o pool e tenta de novo
+                self._executors.pop(kaleido).shutdown(wait=False, cancel_futures=True)
+                future = self._executor(kaleido).submit(_render, inputs, timing)
+            job = self._jobs[key] = ReportJob(key, future, kaleido)
+        future.add_done_callback(lambda _: self._finish(job))
+        return job
+
+    def _finish(self, job):
+        """Guarda o PDF pronto no cache e tira a tarefa da fila"""
+        job.finished_at = time.monotonic()
+        if job.data is not None:
+            self.cache.put(job.key, job.data)
+        with self._lock:
+            self._jobs.pop(job.key, None)
+
+    def position(self, job):
+        """Quantas tarefas do mesmo pool estão à frente do job na fila (0 se já está rodando)"""
+        with self._lock:
+            ahead = 0
+            for other in self._jobs.values():
+                if other is job:
+                    break
+                if other.kaleido == job.kaleido and other.state == QUEUED:
+                    ahead += 1
+        return ahead if job.state == QUEUED else 0
+
+    def pending(self):
+        """Quantidade de relatórios na fila ou em geração"""
+        return len(self._jobs)
+
+    def shutdown(self, wait=False):
+        """Encerra os pools, descartando o que ainda não começou"""
+        with self._lock:
+            executors, self._executors = list(self._executors.values()), {}
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_report_queue():
+    """Retorna a fila de relatórios compartilhada pelo processo"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ReportQueue()
+    return _queue
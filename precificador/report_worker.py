@@ -0,0 +1,33 @@
+"""Ponto de entrada dos processos que geram os relatórios PDF.
+
+É o único módulo pré-carregado pelo servidor ``forkserver`` da fila de
+relatórios (report_jobs): importa só o pdf_report (ReportLab) e o profiling,
+nunca o Streamlit nem o app.py. Cada processo de trabalho é um fork desse
+servidor de thread única, então já nasce com o ReportLab carregado.
+
+Ao preparar um processo novo, o multiprocessing reexecuta o script
+principal do pai; no servidor do Streamlit esse script é o app.py. Este
+módulo troca essa etapa por uma que não faz nada, e os processos criados a
+partir do servidor herdam a troca. No processo do Streamlit ela não tem
+efeito: a preparação só roda nos processos filhos.
+"""
+from multiprocessing import spawn
+
+from . import pdf_report
+from .profiling import timed
+
+
+def _keep_main_module(main_path):
+    """Substitui ``spawn._fixup_main_from_path``: mantém o ``__main__`` do servidor forkserver"""
+
+
+spawn._fixup_main_from_path = _keep_main_module
+
+
+def render(inputs, timing):
+    """Gera o relatório no processo de trabalho e retorna os bytes"""
+    scenario, service, month, std_dev, is_custom, chart_renderer = inputs
+    chart_renderer = chart_renderer or pdf_report.DEFAULT_PDF_CHART_RENDERER
+    with timed(f"pdf_{chart_renderer}", enabled=timing, page="download_pdf"):
+        return pdf_report.render_pdf_report(scenario, service, month, std_dev, is_custom=is_custom,
+                                            chart_renderer=chart_renderer)
@@ -0,0 +1,200 @@
+"""Histórico persistente dos cenários calculados (SQLite).
+
+Cada cenário calculado na página de precificação é gravado com entradas e
+resultados. As gravações ficam em um buffer e vão para o banco em lote (uma
+transação a cada ``batch_size`` cenários ou ``flush_interval`` segundos, e na
+saída do processo). Um cálculo repetido com as mesmas entradas é respondido
+pelo histórico, sem recalcular.
+
+O painel de histórico pagina por cursor (created_at, id), usando os índices,
+e nunca carrega a tabela inteira.
+"""
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from dataclasses import astuple, fields
+
+from .pricing import ENGINE_VERSION, INPUT_COLUMNS, Scenario, compute_scenario
+
+DEFAULT_PATH = 'historico_cenarios.db'
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_PAGE_SIZE = 25
+
+SCENARIO_FIELDS = tuple(field.name for field in fields(Scenario))
+
+# Linha do histórico: metadados + cenário
+HistoryEntry = namedtuple('HistoryEntry', ['id', 'created_at', 'service', 'month', 'scenario'])
+
+# Página do histórico; ``cursor`` é passado de volta para buscar a próxima
+HistoryPage = namedtuple('HistoryPage', ['entries', 'cursor'])
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    input_key TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL,
+    service TEXT NOT NULL,
+    month INTEGER,
+    {', '.join(f'{name} REAL' for name in SCENARIO_FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_created ON scenarios (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_scenarios_service ON scenarios (service, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_scenarios_month ON scenarios (month, created_at, id);
+"""
+
+_COLUMNS = ('input_key', 'created_at', 'service', 'month') + SCENARIO_FIELDS
+_INSERT = (f"INSERT OR IGNORE INTO scenarios ({', '.join(_COLUMNS)}) "
+           f"VALUES ({', '.join('?' for _ in _COLUMNS)})")
+_SELECT = f"SELECT id, created_at, service, month, {', '.join(SCENARIO_FIELDS)} FROM scenarios"
+
+
+def input_key(service, month, inputs):
+    """Chave das entradas de um cálculo (serviço, mês e INPUT_COLUMNS) na versão atual do motor"""
+    values = (ENGINE_VERSION, service, month) + tuple(float(inputs[name]) for name in INPUT_COLUMNS)
+    return hashlib.sha256(repr(values).encode('utf-8')).hexdigest()
+
+
+def _scenario_from_row(values):
+    """Reconstrói o Scenario a partir das colunas gravadas"""
+    data = dict(zip(SCENARIO_FIELDS, values))
+    data['feasible'] = bool(data['feasible'])
+    data['required_quantity'] = int(data['required_quantity']) if data['feasible'] else None
+    return Scenario(**{name: (float('nan') if value is None and name != 'required_quantity' else value)
+                       for name, value in data.items()})
+
+
+def _entry_from_row(row):
+    return HistoryEntry(row[0], row[1], row[2], row[3], _scenario_from_row(row[4:]))
+
+
+class ScenarioHistory:
+    """Armazenamento dos cenários com escrita em lote
+
+    Uma única conexão é compartilhada entre as sessões (threads) do
+    Streamlit, protegida por lock.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = {}  # input_key -> linha ainda não gravada
+        self._last_flush = time.monotonic()
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(_SCHEMA)
+        atexit.register(self.flush)
+
+    def get(self, key):
+        """Retorna o Scenario gravado para a chave, ou None"""
+        with self._lock:
+            row = self._pending.get(key)
+            if row is not None:
+                return _scenario_from_row(row[4:])
+            row = self._connection.execute(
+                f"SELECT {', '.join(SCENARIO_FIELDS)} FROM scenarios WHERE input_key = ?", (key,)
+            ).fetchone()
+        return None if row is None else _scenario_from_row(row)
+
+    def record(self, key, service, month, scenario):
+        """Enfileira o cenário para gravação; grava o lote se estiver cheio ou antigo"""
+        row = (key, time.time(), service, month) + astuple(scenario)
+        with self._lock:
+            self._pending.setdefault(key, row)
+            if (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        """Grava os cenários pendentes em uma única transação"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(_INSERT, list(self._pending.values()))
+            self._pending.clear()
+        self._last_flush = time.monotonic()
+
+    def get_or_compute(self, service, month, demand, original_price, promotional_price, service_cost,
+                       commission_percentage, desired_profit_increase):
+        """Retorna (Scenario, veio_do_histórico), calculando e registrando só se for novo"""
+        inputs = dict(zip(INPUT_COLUMNS, (demand, original_price, promotional_price, service_cost,
+                                          commission_percentage, desired_profit_increase)))
+        key = input_key(service, month, inputs)
+        scenario = self.get(key)
+        if scenario is not None:
+            return scenario, True
+
+        scenario = compute_scenario(**inputs)
+        self.record(key, service, month, scenario)
+        return scenario, False
+
+    def count(self, service=None):
+        """Quantidade de cenários gravados (opcionalmente de um serviço)"""
+        self.flush()
+        with self._lock:
+            if service is None:
+                return self._connection.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM scenarios WHERE service = ?", (service,)
+            ).fetchone()[0]
+
+    def page(self, limit=DEFAULT_PAGE_SIZE, cursor=None, service=None, month=None):
+        """Retorna uma HistoryPage com os cenários mais recentes antes do cursor"""
+        self.flush()
+        where, params = [], []
+        if service is not None:
+            where.append("service = ?")
+            params.append(service)
+        if month is not None:
+            where.append("month = ?")
+            params.append(month)
+        if cursor is not None:
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(cursor)
+
+        sql = _SELECT
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        entries = [_entry_from_row(row) for row in rows]
+        next_cursor = (entries[-1].created_at, entries[-1].id) if len(entries) == limit else None
+        return HistoryPage(entries, next_cursor)
+
+    def close(self):
+        """Grava o pendente e fecha a conexão"""
+        self.flush()
+        atexit.unregister(self.flush)
+        with self._lock:
+            self._connection.close()
+
+
+_histories_lock = threading.Lock()
+_histories = {}  # caminho absoluto -> ScenarioHistory
+
+
+def get_history(path=DEFAULT_PATH):
+    """Retorna o ScenarioHistory do arquivo, compartilhado pelo processo"""
+    key = os.path.abspath(path)
+    history = _histories.get(key)
+    if history is None:
+        with _histories_lock:
+            history = _histories.get(key)
+            if history is None:
+                history = _histories[key] = ScenarioHistory(key)
+    return history
@@ -0,0 +1,121 @@
+"""Gráficos e tabelas da página de Análise Sazonal.
+
+As visões de cada serviço (figura de demanda, figura de desvio padrão e tabela
+de exibição) são montadas uma única vez por versão do arquivo de dados e
+compartilhadas por todas as sessões. Elas são criadas sob demanda, na primeira
+vez que a aba do serviço é aberta, então serviços novos no CSV não aumentam o
+custo de um rerun.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+import plotly.graph_objects as go
+
+from .palette import BRANCO_PURO, VERDE_MUSGO, VERDE_SALVIA
+from .seasonal_store import MONTHS, short_name
+
+# Visão pronta de um serviço; compartilhada entre sessões, não modificar
+SeasonalView = namedtuple('SeasonalView', ['demand_figure', 'std_figure', 'table'])
+
+# Ícones das abas dos serviços conhecidos
+SERVICE_ICONS = {
+    'Drenagem': '🌿',
+    'Massagem': '🧘',
+}
+DEFAULT_SERVICE_ICON = '✨'
+
+# Cores alternadas da linha de demanda (linha, marcador) entre serviços
+_DEMAND_COLORS = (
+    (VERDE_SALVIA, VERDE_MUSGO),
+    (VERDE_MUSGO, VERDE_SALVIA),
+)
+
+# Layout comum aos gráficos da página
+_LAYOUT = dict(
+    xaxis_title="Mês",
+    hovermode='x unified',
+    template='plotly_dark',
+    height=400,
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color=BRANCO_PURO)
+)
+
+# Quantas versões dos dados manter em memória
+MAX_VERSIONS = 2
+
+
+def tab_label(service):
+    """Rótulo da aba do serviço com ícone"""
+    icon = next((icon for prefix, icon in SERVICE_ICONS.items() if service.startswith(prefix)),
+                DEFAULT_SERVICE_ICON)
+    return f"{icon} {short_name(service)}"
+
+
+def build_view(service_data, service, position=0):
+    """Monta as figuras e a tabela de exibição de um serviço"""
+    month_names = [MONTHS[m] for m in service_data['Mes']]
+    line_color, marker_color = _DEMAND_COLORS[position % len(_DEMAND_COLORS)]
+
+    # Gráfico de linha para demanda
+    demand_figure = go.Figure()
+    demand_figure.add_trace(go.Scatter(
+        x=month_names,
+        y=service_data['Media'],
+        mode='lines+markers',
+        name='Demanda Média',
+        line=dict(color=line_color, width=3),
+        marker=dict(size=8, color=marker_color)
+    ))
+    demand_figure.update_layout(
+        title=f"Demanda Média por Mês - {short_name(service)}",
+        yaxis_title="Quantidade de Atendimentos",
+        **_LAYOUT
+    )
+
+    # Gráfico de barras para desvio padrão
+    std_figure = go.Figure()
+    std_figure.add_trace(go.Bar(
+        x=month_names,
+        y=service_data['Desvio_padrao'],
+        name='Desvio Padrão',
+        marker=dict(color=VERDE_SALVIA)
+    ))
+    std_figure.update_layout(
+        title="Variação da Demanda (Desvio Padrão)",
+        yaxis_title="Desvio Padrão",
+        **_LAYOUT
+    )
+
+    # Tabela com dados
+    table = service_data[['Mes', 'Media', 'Desvio_padrao']].copy()
+    table['Mes'] = month_names
+    table = table.rename(
+        columns={'Mes': 'Mês', 'Media': 'Demanda Média', 'Desvio_padrao': 'Desvio Padrão'}
+    )
+
+    return SeasonalView(demand_figure, std_figure, table)
+
+
+_lock = threading.Lock()
+_views = OrderedDict()  # versão dos dados -> {serviço: SeasonalView}
+
+
+def get_view(store, service):
+    """Retorna a SeasonalView do serviço, criando-a na primeira chamada da versão"""
+    views = _views.get(store.version)
+    if views is not None and service in views:
+        return views[service]
+
+    with _lock:
+        views = _views.setdefault(store.version, {})
+        _views.move_to_end(store.version)
+        while len(_views) > MAX_VERSIONS:
+            _views.popitem(last=False)
+
+        view = views.get(service)
+        if view is None:
+            position = store.services.index(service) if service in store.services else 0
+            view = build_view(store.service_data(service), service, position)
+            views[service] = view
+        return view
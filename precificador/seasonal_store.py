@@ -0,0 +1,189 @@
+"""Camada de acesso aos dados sazonais (dados_sazonais.csv ou .parquet).
+
+O arquivo é lido uma única vez por processo e o resultado é compartilhado por
+todas as sessões do Streamlit. A cada chamada só é feito um ``os.stat``: se o
+mtime/tamanho mudar, o conteúdo é re-hasheado e os
+dados só são reprocessados quando o hash de fato for diferente. O mesmo
+cache (``FileCache``) serve a previsão e a elasticidade.
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = 'dados_sazonais.csv'
+
+# Meses para referência
+MONTHS = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
+}
+
+# Plural dos serviços conhecidos, pelo início do nome
+SERVICE_PLURALS = {
+    'Drenagem': 'drenagens',
+    'Massagem': 'massagens',
+}
+
+# Estatísticas de um serviço em um mês
+MonthStats = namedtuple('MonthStats', ['media', 'desvio_padrao'])
+
+
+def short_name(service):
+    """Nome do serviço sem a duração, ex.: 'Massagem Relaxante'"""
+    return service.split(' (')[0]
+
+
+def service_plural(service):
+    """Serviço no plural para os textos, ex.: 'massagens' ou 'atendimentos de Reflexologia'"""
+    return next((plural for prefix, plural in SERVICE_PLURALS.items() if service.startswith(prefix)),
+                f"atendimentos de {short_name(service)}")
+
+
+class SeasonalStore:
+    """Dados sazonais com índice (Servico, Mes) pré-construído
+
+    As estruturas expostas são compartilhadas entre sessões e não devem ser
+    modificadas; use ``.copy()`` antes de alterar um DataFrame.
+    """
+
+    def __init__(self, df, version):
+        self.df = df
+        self.version = version
+        self.services = tuple(pd.unique(df['Servico']))
+
+        # Índice O(1) por (serviço, mês)
+        self._index = {
+            (service, int(month)): MonthStats(float(media), float(std_dev))
+            for service, month, media, std_dev in zip(
+                df['Servico'], df['Mes'], df['Media'], df['Desvio_padrao']
+            )
+        }
+
+        # Fatias por serviço já ordenadas por mês
+        self._by_service = {
+            service: group.sort_values('Mes').reset_index(drop=True)
+            for service, group in df.groupby('Servico', sort=False)
+        }
+        self._empty = df.iloc[0:0]
+
+    def lookup(self, service, month):
+        """Retorna MonthStats do serviço no mês ou None se não houver dados"""
+        return self._index.get((service, int(month)))
+
+    def service_data(self, service):
+        """Retorna os dados de um serviço ordenados por mês"""
+        return self._by_service.get(service, self._empty)
+
+
+def collapse_history(df):
+    """Reduz um histórico multi-ano/multi-unidade a uma linha por (Servico, Mes)
+
+    Usa o ano mais recente de cada (Servico, Mes): um ano ainda incompleto ou
+    um serviço cujos dados param um ano antes não somem do resultado. Com
+    várias unidades, a demanda do spa é a soma das unidades e os desvios são
+    combinados supondo independência.
+    """
+    if 'Ano' in df.columns:
+        df = df[df['Ano'] == df.groupby(['Servico', 'Mes'], sort=False)['Ano'].transform('max')]
+    if 'Unidade' in df.columns:
+        totals = (df.assign(Variancia=df['Desvio_padrao'] ** 2)
+                  .groupby(['Servico', 'Mes'], sort=False)[['Media', 'Variancia']].sum())
+        df = totals.assign(Desvio_padrao=np.sqrt(totals['Variancia'])).reset_index()
+    return df[['Mes', 'Servico', 'Media', 'Desvio_padrao']].reset_index(drop=True)
+
+
+def file_signature(path):
+    """Assinatura barata do arquivo (mtime em ns e tamanho)"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_source(path, columns=None):
+    """Retorna (versão, função que carrega o DataFrame) conforme o formato do arquivo
+
+    A versão é o hash do conteúdo. ``columns`` limita as colunas lidas
+    (colunas ausentes no arquivo são ignoradas).
+    """
+    from . import columnar
+
+    if path.endswith(columnar.PARQUET_SUFFIX):
+        # Parquet: versão pelo hash do arquivo e leitura colunar com memory map
+        return columnar.file_version(path), partial(columnar.read_parquet, path, columns=columns)
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    def load():
+        usecols = None if columns is None else (lambda column: column in columns)
+        return pd.read_csv(io.BytesIO(raw), usecols=usecols)
+
+    return hashlib.sha1(raw).hexdigest(), load
+
+
+class FileCache:
+    """Objetos derivados de arquivos, compartilhados entre sessões
+
+    A cada consulta só é feito um ``os.stat``; quando mtime/tamanho mudam o
+    conteúdo é re-hasheado, e o objeto só é reconstruído se o hash mudou.
+    Os objetos guardados precisam expor a versão em ``.version``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # chave -> (assinatura do arquivo, objeto)
+
+    def get(self, key, path, build, source=read_source):
+        """Retorna o objeto de ``key``, reconstruindo-o só se o conteúdo de ``path`` mudou
+
+        ``source(path)`` retorna (versão, carregador) e ``build(versão,
+        carregador)`` monta o objeto. Levanta FileNotFoundError sem o arquivo.
+        """
+        signature = file_signature(path)
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with self._lock:
+            # Outra sessão pode ter recarregado enquanto esperávamos o lock
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            version, load = source(path)
+            if cached is not None and cached[1].version == version:
+                # Só os metadados mudaram (ex.: touch); reaproveita o objeto
+                value = cached[1]
+            else:
+                value = build(version, load)
+
+            self._entries[key] = (signature, value)
+            return value
+
+    def discard(self, key):
+        """Esquece o objeto de ``key``; a próxima consulta relê o arquivo"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+_stores = FileCache()  # chave: caminho absoluto
+
+
+def get_store(path=DEFAULT_PATH):
+    """Retorna o SeasonalStore do arquivo, recarregando apenas se ele mudou
+
+    Aceita CSV ou Parquet (``.parquet``). Cada (serviço, mês) usa o ano mais
+    recente do histórico, somando as unidades (ver ``collapse_history``), então
+    o arquivo é lido inteiro.
+    """
+    path = os.path.abspath(path)
+    return _stores.get(
+        path, path, lambda version, load: SeasonalStore(collapse_history(load()), version)
+    )
@@ -0,0 +1,110 @@
+"""Análise de sensibilidade do cenário promocional.
+
+A grade preço promocional × comissão é avaliada em uma única chamada
+vetorizada (broadcast de uma coluna de preços contra uma linha de comissões)
+e o tornado varia custo, comissão e lucro adicional em torno do cenário
+atual. Os resultados são memorizados por tupla de entradas, então um rerun
+com as mesmas entradas não recalcula nada.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .promo_solver import evaluate_prices
+
+DEFAULT_GRID_SIZE = 200
+MAX_COMMISSION = 130.0
+
+# Variação relativa aplicada a cada fator do tornado
+DEFAULT_TORNADO_SWING = 0.2
+
+# Grade de sensibilidade; matrizes com forma (len(prices), len(commissions))
+SensitivityGrid = namedtuple('SensitivityGrid', [
+    'prices', 'commissions', 'required_quantity', 'expected_profit',
+])
+
+# Fatores do tornado: nome exibido -> parâmetro de evaluate_prices
+TORNADO_FACTORS = {
+    'Custo por Serviço': 'service_cost',
+    'Comissão': 'commission_percentage',
+    'Lucro Adicional Desejado': 'desired_profit_increase',
+}
+
+# Uma barra do tornado: quantidade necessária e lucro esperado com o fator
+# reduzido (low) e aumentado (high)
+TornadoBar = namedtuple('TornadoBar', [
+    'factor', 'low_value', 'high_value',
+    'low_quantity', 'high_quantity', 'low_profit', 'high_profit',
+])
+
+Tornado = namedtuple('Tornado', ['base_quantity', 'base_profit', 'swing', 'bars'])
+
+
+def _readonly(array):
+    """Marca o array como somente leitura, já que o resultado é compartilhado pelo cache"""
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=64)
+def price_commission_grid(demand, std_dev, original_price, service_cost, desired_profit_increase,
+                          elasticity=0.0, size=DEFAULT_GRID_SIZE, max_commission=MAX_COMMISSION):
+    """Quantidade necessária e lucro esperado sobre preço promocional × comissão
+
+    Os preços vão do custo do serviço (ponto de equilíbrio sem comissão) até
+    o preço original e as comissões de 0 a ``max_commission``. Combinações
+    inviáveis ficam com quantidade nan.
+    """
+    low_price = service_cost if 0 < service_cost < original_price else original_price / size
+    prices = np.linspace(low_price, original_price, size)
+    commissions = np.linspace(0.0, max_commission, size)
+
+    results = evaluate_prices(prices[:, None], demand, std_dev, original_price, service_cost,
+                              commissions[None, :], desired_profit_increase, elasticity)
+
+    return SensitivityGrid(
+        prices=_readonly(prices),
+        commissions=_readonly(commissions),
+        required_quantity=_readonly(results['required_quantity']),
+        expected_profit=_readonly(results['expected_profit']),
+    )
+
+
+@lru_cache(maxsize=64)
+def tornado(demand, std_dev, original_price, promotional_price, service_cost, commission_percentage,
+            desired_profit_increase, elasticity=0.0, swing=DEFAULT_TORNADO_SWING):
+    """Efeito de variar cada fator em ±``swing`` (relativo) sobre o cenário atual
+
+    Todos os cenários (base e dois por fator) são avaliados em uma única
+    chamada vetorizada. As barras vêm ordenadas da maior para a menor
+    amplitude de quantidade necessária.
+    """
+    base = dict(service_cost=service_cost, commission_percentage=commission_percentage,
+                desired_profit_increase=desired_profit_increase)
+    # Coluna 0 é o cenário base; depois (baixo, alto) para cada fator
+    columns = {name: np.full(1 + 2 * len(TORNADO_FACTORS), value, dtype=float)
+               for name, value in base.items()}
+    for i, name in enumerate(TORNADO_FACTORS.values()):
+        columns[name][1 + 2 * i] = base[name] * (1 - swing)
+        columns[name][2 + 2 * i] = base[name] * (1 + swing)
+
+    results = evaluate_prices(promotional_price, demand, std_dev, original_price,
+                              columns['service_cost'], columns['commission_percentage'],
+                              columns['desired_profit_increase'], elasticity)
+    quantity = results['required_quantity']
+    profit = np.broadcast_to(results['expected_profit'], quantity.shape)
+
+    bars = []
+    for i, (label, name) in enumerate(TORNADO_FACTORS.items()):
+        low, high = 1 + 2 * i, 2 + 2 * i
+        bars.append(TornadoBar(
+            factor=label,
+            low_value=float(columns[name][low]), high_value=float(columns[name][high]),
+            low_quantity=float(quantity[low]), high_quantity=float(quantity[high]),
+            low_profit=float(profit[low]), high_profit=float(profit[high]),
+        ))
+    bars.sort(key=lambda bar: np.nan_to_num(abs(bar.high_quantity - bar.low_quantity), nan=np.inf),
+              reverse=True)
+
+    return Tornado(float(quantity[0]), float(profit[0]), swing, tuple(bars))
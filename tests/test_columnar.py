@@ -0,0 +1,111 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from precificador import columnar  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados_sazonais.csv')
+
+
+def _write_history(path, df):
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def history():
+    return columnar.synthetic_history(years=2, units=2, services=3)
+
+
+def test_round_trip_and_filters(tmp_path, history):
+    csv_path = _write_history(tmp_path / 'historico.csv', history)
+    parquet_path = columnar.convert_csv(csv_path)
+
+    full = columnar.read_parquet(parquet_path)
+    assert len(full) == len(history)
+    assert set(full.columns) == set(columnar.HISTORY_COLUMNS)
+
+    service = history['Servico'].iloc[0]
+    filtered = columnar.read_parquet(parquet_path, services=[service], months=[1, 2], years=[2025])
+    expected = columnar.read_csv(csv_path, services=[service], months=[1, 2], years=[2025])
+    key = ['Servico', 'Unidade', 'Ano', 'Mes']
+    pd.testing.assert_frame_equal(
+        filtered.sort_values(key).reset_index(drop=True)[expected.columns],
+        expected.sort_values(key).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_file_version_changes_on_single_value_edit(tmp_path):
+    data = pd.read_csv(DATA)
+    parquet_path = str(tmp_path / 'dados_sazonais.parquet')
+    columnar.write_parquet(data, parquet_path)
+    before = columnar.file_version(parquet_path)
+
+    # 14 -> 15 fica dentro de min/max do row group: o rodapé não muda
+    edited = data.copy()
+    edited.loc[0, 'Media'] = 15
+    columnar.write_parquet(edited, parquet_path)
+    assert columnar.file_version(parquet_path) != before
+
+    columnar.write_parquet(data, parquet_path)
+    assert columnar.file_version(parquet_path) == before
+
+
+def test_file_version_rejects_non_parquet(tmp_path):
+    path = tmp_path / 'dados.parquet'
+    path.write_bytes(b'nao sou parquet')
+    with pytest.raises(ValueError):
+        columnar.file_version(str(path))
+
+
+def test_ensure_parquet_reconverts_newer_csv(tmp_path, history):
+    csv_path = _write_history(tmp_path / 'historico.csv', history)
+    parquet_path = columnar.ensure_parquet(csv_path)
+    assert parquet_path.endswith(columnar.PARQUET_SUFFIX)
+
+    edited = history.copy()
+    edited.loc[0, 'Media'] = 999
+    _write_history(csv_path, edited)
+    stat = os.stat(parquet_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    columnar.ensure_parquet(csv_path)
+    assert 999 in columnar.read_parquet(parquet_path)['Media'].tolist()
+
+
+def test_ensure_parquet_reconverts_older_csv_with_the_same_size(tmp_path, history):
+    csv_path = _write_history(tmp_path / 'historico.csv', history)
+    parquet_path = columnar.ensure_parquet(csv_path)
+    assert columnar.source_hash(parquet_path) is not None
+    size = os.path.getsize(csv_path)
+
+    # Um CSV restaurado: mesmo tamanho e mtime mais antigo que o do Parquet
+    edited = history.copy()
+    media = history.loc[0, 'Media']
+    edited.loc[0, 'Media'] = media + 1 if media % 10 != 9 else media - 1
+    _write_history(csv_path, edited)
+    assert os.path.getsize(csv_path) == size
+    stat = os.stat(parquet_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60_000_000_000))
+
+    columnar.ensure_parquet(csv_path)
+    assert sorted(columnar.read_parquet(parquet_path)['Media']) == sorted(edited['Media'])
+
+
+def test_ensure_parquet_keeps_file_when_csv_is_only_touched(tmp_path, history):
+    csv_path = _write_history(tmp_path / 'historico.csv', history)
+    parquet_path = columnar.ensure_parquet(csv_path)
+    version = os.stat(parquet_path).st_mtime_ns
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    columnar.ensure_parquet(csv_path)
+    assert os.stat(parquet_path).st_mtime_ns == version
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        columnar.write_parquet(pd.DataFrame({'Mes': [1], 'Servico': ['x']}), str(tmp_path / 'x.parquet'))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from precificador.demand_risk import RISK_COLUMNS, simulate_promotions
+
+ARGS = dict(demand=24.0, std_dev=4.0, original_price=100.0, service_cost=20.0,
+            commission_percentage=30.0, desired_profit_increase=5.0)
+
+
+def test_columns_and_shape():
+    result = simulate_promotions(promotional_prices=[70.0, 85.0, 100.0], n_draws=2_000, **ARGS)
+    assert set(result) == set(RISK_COLUMNS)
+    assert all(np.shape(result[name]) == (3,) for name in RISK_COLUMNS)
+    assert np.all(result['profit_p5'] <= result['profit_p50'])
+    assert np.all(result['profit_p50'] <= result['profit_p95'])
+
+
+def test_same_seed_is_reproducible():
+    first = simulate_promotions(promotional_prices=[80.0], n_draws=5_000, seed=7, **ARGS)
+    second = simulate_promotions(promotional_prices=[80.0], n_draws=5_000, seed=7, **ARGS)
+    assert first['expected_profit'] == second['expected_profit']
+
+
+def test_no_variance_is_deterministic():
+    # Sem desvio: 24 atendimentos exigidos a R$ 100 (meta 1260 / lucro 50 = 25,2 -> 26) não são atingidos
+    result = simulate_promotions(promotional_prices=[100.0], n_draws=1_000, **dict(ARGS, std_dev=0.0))
+    assert result['required_quantity'][0] == 26
+    assert result['reach_probability'][0] == 0.0
+    assert result['expected_profit'][0] == pytest.approx(24 * 50.0)
+
+
+def test_elasticity_raises_demand_and_reach_at_lower_price():
+    inelastic = simulate_promotions(promotional_prices=[80.0], n_draws=20_000, **ARGS)
+    elastic = simulate_promotions(promotional_prices=[80.0], elasticity=-2.0, n_draws=20_000, **ARGS)
+    assert elastic['expected_demand'][0] == pytest.approx(24.0 * 0.8 ** -2.0)
+    assert elastic['reach_probability'][0] > inelastic['reach_probability'][0]
+
+
+def test_infeasible_price_never_reaches_goal():
+    result = simulate_promotions(promotional_prices=[25.0], n_draws=1_000, **ARGS)
+    assert np.isnan(result['required_quantity'][0])
+    assert result['reach_probability'][0] == 0.0
@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from precificador.elasticity import MIN_OBSERVATIONS, ElasticityModel, fit_elasticities, get_model
+
+
+def _history(service, elasticity, months=(1, 2, 3), per_month=4, noise=0.05, seed=0):
+    """Histórico de preços com intercepto por mês e ruído log-normal"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for month in months:
+        prices = rng.uniform(60, 120, per_month)
+        base = 50 + 10 * month
+        quantities = base * (prices / 100) ** elasticity * np.exp(rng.normal(0, noise, per_month))
+        rows += [(service, month, price, quantity) for price, quantity in zip(prices, quantities)]
+    return pd.DataFrame(rows, columns=['Servico', 'Mes', 'Preco', 'Quantidade'])
+
+
+def _lstsq_fit(df):
+    """Mesma regressão por mínimos quadrados: um intercepto por mês e a inclinação em ln(Preco)"""
+    months = np.unique(df['Mes'])
+    design = np.column_stack([(df['Mes'].to_numpy() == month).astype(float) for month in months]
+                             + [np.log(df['Preco'].to_numpy())])
+    y = np.log(df['Quantidade'].to_numpy())
+    coef, sse, _, _ = np.linalg.lstsq(design, y, rcond=None)
+    dof = len(df) - design.shape[1]
+    covariance = sse[0] / dof * np.linalg.inv(design.T @ design)
+    return coef[-1], np.sqrt(covariance[-1, -1])
+
+
+def test_slope_and_std_error_match_lstsq():
+    a = _history('A', -1.8, seed=1)
+    b = _history('B', -0.7, months=(4, 5, 6, 7), per_month=3, noise=0.2, seed=2)
+    fits = fit_elasticities(pd.concat([b, a], ignore_index=True))
+
+    for service, df in (('A', a), ('B', b)):
+        slope, std_error = _lstsq_fit(df)
+        assert fits[service].elasticity == pytest.approx(slope)
+        assert fits[service].std_error == pytest.approx(std_error)
+        assert fits[service].n_obs == len(df)
+    assert fits['A'].elasticity == pytest.approx(-1.8, abs=0.2)
+    assert fits['A'].r_squared > 0.9
+
+
+def test_reliable_fit_is_exposed_by_the_model():
+    fits = fit_elasticities(_history('A', -1.5))
+    assert fits['A'].reliable
+
+    model = ElasticityModel(fits, 'v')
+    assert model.get('A') is fits['A']
+    assert model.get('B') is None
+    assert model.predict('A', 30.0, 100.0, 80.0) == pytest.approx(30.0 * 0.8 ** fits['A'].elasticity)
+
+
+def test_too_few_points_are_not_reliable():
+    df = _history('A', -1.5, months=(1, 2), per_month=2)
+    assert len(df) < MIN_OBSERVATIONS
+    assert not fit_elasticities(df)['A'].reliable
+
+    # Um preço por mês: sem graus de liberdade depois dos interceptos mensais
+    single = _history('A', -1.5, months=tuple(range(1, 9)), per_month=1)
+    assert not fit_elasticities(single)['A'].reliable
+
+
+def test_constant_price_is_not_reliable():
+    df = _history('A', -1.5)
+    df['Preco'] = 90.0
+    fit = fit_elasticities(df)['A']
+    assert not fit.reliable
+
+
+def test_price_only_varying_across_months_is_not_reliable():
+    # Preço muda só de um mês para outro: o intercepto mensal absorve tudo
+    df = _history('A', -1.5)
+    df['Preco'] = 80.0 + df['Mes'] * 5
+    assert not fit_elasticities(df)['A'].reliable
+
+
+def test_positive_slope_is_not_reliable():
+    assert not fit_elasticities(_history('A', 1.2))['A'].reliable
+
+
+def test_invalid_rows_are_dropped_and_missing_columns_rejected():
+    df = _history('A', -1.5)
+    with_zeros = pd.concat([df, pd.DataFrame({'Servico': ['A', 'A'], 'Mes': [1, 2],
+                                              'Preco': [0.0, 90.0], 'Quantidade': [5.0, 0.0]})])
+    assert fit_elasticities(with_zeros)['A'] == fit_elasticities(df)['A']
+    assert fit_elasticities(df.iloc[0:0]) == {}
+    with pytest.raises(ValueError):
+        fit_elasticities(df.drop(columns='Preco'))
+
+
+def test_model_is_shared_until_the_file_changes(tmp_path):
+    path = tmp_path / 'historico_precos.csv'
+    assert get_model(str(path)).fits == {}
+
+    _history('A', -1.5).to_csv(path, index=False)
+    first = get_model(str(path))
+    assert first.get('A') is not None
+    assert get_model(str(path)) is first
+
+    _history('A', -2.5, seed=3).to_csv(path, index=False)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    updated = get_model(str(path))
+    assert updated is not first
+    assert updated.get('A').elasticity < first.get('A').elasticity
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from precificador import forecast
+from precificador.forecast import (HOLT_WINTERS, SEASONAL_NAIVE, _holt_winters_variance_factor, fit_holt_winters,
+                                   forecast_next_year, get_forecast)
+
+
+def _history(service, years, values, std_dev=1.0):
+    """Histórico no formato dos dados sazonais; ``values(ano, mês)`` dá a média"""
+    return pd.DataFrame([
+        (year, month, service, values(year, month), std_dev)
+        for year in years for month in range(1, 13)
+    ], columns=['Ano', 'Mes', 'Servico', 'Media', 'Desvio_padrao'])
+
+
+def _seasonal(year, month):
+    return 20 + 3 * (year - 2021) + 5 * np.sin(month)
+
+
+def test_service_starting_later_is_fitted_from_its_own_first_years():
+    long = _history('A', range(2021, 2026), _seasonal, std_dev=2.0)
+    late = _history('B', (2024, 2025), lambda year, month: 11.0)
+
+    together, fits = forecast_next_year(pd.concat([long, late], ignore_index=True))
+    alone, _ = forecast_next_year(late)
+
+    assert fits['B'].method == HOLT_WINTERS
+    b = together[together['Servico'] == 'B'].reset_index(drop=True)
+    assert b['Media'].to_numpy() == pytest.approx(11.0)
+    assert b['Media'].to_numpy() == pytest.approx(alone['Media'].to_numpy())
+    assert b['Desvio_padrao'].to_numpy() == pytest.approx(alone['Desvio_padrao'].to_numpy())
+
+
+def test_leading_empty_years_do_not_change_the_fit():
+    rng = np.random.default_rng(7)
+    series = 30 + 4 * np.sin(np.arange(36)) + np.arange(36) * 0.2 + rng.normal(0, 1, 36)
+    padded = np.concatenate([np.full(24, np.nan), series])
+
+    fitted = fit_holt_winters(series[None, :])
+    shifted = fit_holt_winters(padded[None, :])
+    for expected, actual in zip(fitted[:3] + (fitted[4],), shifted[:3] + (shifted[4],)):
+        assert actual == pytest.approx(expected)
+    assert [p[0] for p in shifted[3]] == [p[0] for p in fitted[3]]
+
+
+def test_variance_factor_uses_error_correction_gains():
+    alpha, beta, gamma = np.array([0.5]), np.array([0.1]), np.array([0.05])
+    factor = _holt_winters_variance_factor(alpha, beta, gamma, np.array([[1, 2, 13]]))
+    steps = np.arange(1, 13)
+    c = 0.5 + 0.1 * steps + 0.05 * (steps == 12)
+    assert factor[0] == pytest.approx([1.0, 1 + 0.6 ** 2, 1 + np.sum(c ** 2)])
+
+
+def test_interval_uses_holt_trend_gain(monkeypatch):
+    monkeypatch.setattr(forecast, 'ALPHAS', (0.5,))
+    monkeypatch.setattr(forecast, 'BETAS', (0.2,))
+    monkeypatch.setattr(forecast, 'GAMMAS', (0.1,))
+    rng = np.random.default_rng(3)
+    df = _history('A', range(2021, 2025), lambda year, month: _seasonal(year, month) + rng.normal(0, 2))
+
+    result, fits = forecast_next_year(df)
+    fit = fits['A']
+    assert (fit.alpha, fit.beta, fit.gamma) == (0.5, 0.2, 0.1)
+
+    # Último mês é dezembro: janeiro está a 1 passo e dezembro a 12
+    steps = np.arange(1, 12)
+    c = fit.alpha + fit.alpha * fit.beta * steps
+    expected = fit.sigma ** 2 * np.concatenate([[1.0], 1 + np.cumsum(c ** 2)]) + 1.0
+    assert result['Desvio_padrao'].to_numpy() ** 2 == pytest.approx(expected)
+
+
+def test_single_year_repeats_current_data():
+    df = _history('A', (2025,), lambda year, month: float(month), std_dev=0.5)
+    result, fits = forecast_next_year(df)
+    assert fits['A'].method == SEASONAL_NAIVE
+    assert result['Media'].tolist() == [float(month) for month in range(1, 13)]
+    assert result['Desvio_padrao'].to_numpy() == pytest.approx(0.5)
+    assert (result['Limite_inferior'] <= result['Media']).all()
+    assert (result['Media'] <= result['Limite_superior']).all()
+
+
+def test_forecast_is_shared_until_the_file_changes(tmp_path):
+    path = tmp_path / 'sazonal.csv'
+    _history('A', (2024, 2025), _seasonal).to_csv(path, index=False)
+    first = get_forecast(str(path))
+    assert get_forecast(str(path)) is first
+
+    _history('A', (2024, 2025), lambda year, month: _seasonal(year, month) + 10).to_csv(path, index=False)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    updated = get_forecast(str(path))
+    assert updated is not first
+    assert updated.lookup('A', 1).media > first.lookup('A', 1).media
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from precificador.ingest import IngestState, _period, count_bookings, ingest, main
+
+SERVICE = 'Massagem Relaxante (50 min)'
+
+
+def _export(path, dates, service=SERVICE):
+    pd.DataFrame({'Data': dates, 'Servico': service}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_dates_are_read_day_first(tmp_path):
+    path = _export(tmp_path / 'agendamentos.csv', ['03/09/2026', '13/09/2026', '20/09/2026'])
+    bookings = count_bookings(path)
+    assert bookings.counts == {(SERVICE, _period(2026, 9)): 3}
+    assert bookings.invalid_rows == 0
+    assert bookings.latest == pd.Timestamp(2026, 9, 20)
+
+
+def test_month_first_and_explicit_format(tmp_path):
+    path = _export(tmp_path / 'agendamentos.csv', ['09/03/2026', '09/13/2026'])
+    assert count_bookings(path, dayfirst=False).counts == {(SERVICE, _period(2026, 9)): 2}
+    assert count_bookings(path, date_format='%m/%d/%Y').counts == {(SERVICE, _period(2026, 9)): 2}
+
+
+def test_unparsable_rows_are_counted(tmp_path):
+    path = tmp_path / 'agendamentos.csv'
+    pd.DataFrame({
+        'Data': ['03/09/2026', 'amanhã', None, '04/09/2026'],
+        'Servico': [SERVICE, SERVICE, SERVICE, None],
+    }).to_csv(path, index=False)
+    bookings = count_bookings(str(path), chunksize=2)
+    assert bookings.counts == {(SERVICE, _period(2026, 9)): 1}
+    assert bookings.invalid_rows == 3
+
+
+def test_overlapping_export_does_not_count_open_month_twice(tmp_path):
+    state_path = str(tmp_path / 'estado.json')
+    output_path = str(tmp_path / 'sazonal.csv')
+    first = _export(tmp_path / 'ate_15_09.csv', ['20/08/2026', '02/09/2026', '15/09/2026'])
+    second = _export(tmp_path / 'ate_10_10.csv',
+                     ['02/09/2026', '15/09/2026', '16/09/2026', '30/09/2026', '05/10/2026'])
+
+    ingest([first], state_path, output_path)
+    state = ingest([second], state_path, output_path)
+
+    assert state.repeated_rows == 2
+    assert state.high_water == pd.Timestamp(2026, 10, 5)
+    september = state.accumulators[SERVICE][9]
+    assert (september.n, september.mean) == (1, 4.0)
+    assert state.open_counts[SERVICE] == {_period(2026, 10): 1}
+
+
+def test_state_round_trip(tmp_path):
+    state_path = str(tmp_path / 'estado.json')
+    state = ingest([_export(tmp_path / 'a.csv', ['01/09/2026', 'x'])], state_path, str(tmp_path / 's.csv'))
+    loaded = IngestState.load(state_path)
+    assert loaded.high_water == state.high_water == pd.Timestamp(2026, 9, 1)
+    assert loaded.invalid_rows == 1
+    assert loaded.open_counts == {SERVICE: {_period(2026, 9): 1}}
+
+
+def test_cli_reports_discarded_rows(tmp_path, capsys):
+    path = _export(tmp_path / 'a.csv', ['01/09/2026', '31/02/2026', '01/10/2026'])
+    args = [path, '--state', str(tmp_path / 'estado.json'), '--output', str(tmp_path / 's.csv')]
+    assert main(args) == 0
+    assert main(args) == 0
+    out = capsys.readouterr().out
+    assert '1 linhas sem data válida' in out
+    assert '2 agendamentos de exportações sobrepostas' in out
+
+
+def test_closed_month_is_not_reopened(tmp_path):
+    state = IngestState()
+    state.add_counts({(SERVICE, _period(2026, 8)): 2, (SERVICE, _period(2026, 9)): 1})
+    state.close_until(_period(2026, 9))
+    state.add_counts({(SERVICE, _period(2026, 8)): 5})
+    assert state.late_rows == 5
+    assert state.accumulators[SERVICE][8].mean == pytest.approx(2.0)
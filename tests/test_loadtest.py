@@ -0,0 +1,23 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pytest.importorskip('streamlit')
+
+from precificador.loadtest import _descendant_pids
+from precificador.report_jobs import _worker_context
+
+
+def _parent_pid(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        return int(f.read().rsplit(')', 1)[1].split()[1])
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/stat'), reason="precisa do /proc")
+def test_report_workers_are_counted():
+    with ProcessPoolExecutor(1, mp_context=_worker_context()) as executor:
+        worker = executor.submit(os.getpid).result(timeout=60)
+        # O processo de trabalho é neto: o pai dele é o servidor forkserver
+        assert _parent_pid(worker) != os.getpid()
+        assert worker in _descendant_pids(os.getpid())
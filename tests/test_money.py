@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from precificador.money import (BASIS_POINTS, from_cents, from_cents_inplace, percent_of, round_div, times_quantity,
+                                to_basis_points, to_cents)
+
+
+def test_to_cents_rounds_to_nearest_cent():
+    assert to_cents(19.99) == 1999
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(-12.345) == -1234
+    assert to_cents(-0.006) == -1
+    cents = to_cents(np.array([[1.004, 1.006], [-1.004, -1.006]]))
+    assert cents.dtype == np.int64 and cents.shape == (2, 2)
+    assert cents.tolist() == [[100, 101], [-100, -101]]
+
+
+def test_to_cents_keeps_input_untouched_and_handles_scalars():
+    prices = np.linspace(0, 1, 100_000)
+    copy = prices.copy()
+    cents = to_cents(prices)
+    assert np.array_equal(prices, copy)
+    assert np.array_equal(cents, np.rint(copy * 100).astype(np.int64))
+    assert to_cents(5.0).shape == ()
+
+
+def test_to_basis_points():
+    assert to_basis_points(30.5) == 3050
+    assert to_basis_points(0.01) == 1
+    assert to_basis_points(-2.5) == -250
+    assert to_basis_points(np.array([12.346, 100.0])).tolist() == [1235, 10000]
+
+
+def test_round_div_is_half_up_for_negatives_too():
+    numerators = np.array([4, 5, 6, -4, -5, -6, 15, -15])
+    assert round_div(numerators, 10).tolist() == [0, 1, 1, 0, 0, -1, 2, -1]
+
+
+def test_percent_of_rounds_half_up_to_the_cent():
+    assert percent_of(1000, 3050) == 305
+    # 0,5 centavo sobe; -0,5 centavo também (em direção a +inf)
+    assert percent_of(5, 1000) == 1
+    assert percent_of(-5, 1000) == 0
+    assert percent_of(-6, 1000) == -1
+    assert percent_of(np.array([-1050, 1050]), 1000).tolist() == [-105, 105]
+    assert percent_of(123_456, BASIS_POINTS) == 123_456
+
+
+def test_times_quantity_integer_and_fractional():
+    assert times_quantity(1999, 3) == 5997
+    assert times_quantity(np.array([1999]), np.array([3])).dtype == np.int64
+    assert times_quantity(1999, 23.5) == 46976  # 46976,5: empate vai para o par
+    assert times_quantity(1999, 0.25) == 500
+
+
+def test_from_cents_is_the_nearest_float():
+    assert from_cents(1999) == 19.99
+    assert from_cents(np.array([-1, 30])).tolist() == [-0.01, 0.3]
+
+
+def test_from_cents_inplace_reuses_the_buffer():
+    cents = np.arange(-50_000, 50_000, dtype=np.int64).reshape(2, -1)
+    expected = from_cents(cents)
+    reais = from_cents_inplace(cents)
+    assert np.shares_memory(reais, cents)
+    assert reais.shape == (2, 50_000) and reais.dtype == np.float64
+    assert np.array_equal(reais, expected)
+
+    quantities = np.array([3, 4], dtype=np.int64)
+    assert from_cents_inplace(quantities, 1).tolist() == [3.0, 4.0]
+
+
+def test_from_cents_inplace_copies_when_it_cannot_reuse():
+    cents = np.arange(10, dtype=np.int64)
+    view = cents[::2]
+    assert from_cents_inplace(view).tolist() == pytest.approx([0.0, 0.02, 0.04, 0.06, 0.08])
+    assert cents.tolist() == list(range(10))
+    assert from_cents_inplace(np.int64(250)) == 2.5
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+pytest.importorskip('reportlab')
+
+from precificador.pdf_report import annual_totals, generate_annual_pdf_report
+from precificador.pricing import compute_scenario
+from precificador.seasonal_store import get_store
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados_sazonais.csv')
+
+
+def test_annual_totals_keep_baseline_of_infeasible_months():
+    feasible = compute_scenario(24, 100.0, 80.0, 20.0, 30.0, 5.0)
+    infeasible = compute_scenario(30, 100.0, 25.0, 20.0, 30.0, 5.0)
+    assert feasible.feasible and not infeasible.feasible
+
+    without, with_promo = annual_totals([feasible, infeasible])
+    assert without == pytest.approx(feasible.spa_revenue_without_promo + infeasible.spa_revenue_without_promo)
+    assert with_promo == pytest.approx(feasible.spa_revenue_with_promo + infeasible.spa_revenue_without_promo)
+    assert annual_totals([infeasible]) == (infeasible.spa_revenue_without_promo,) * 2
+
+
+def test_annual_report_with_zero_original_price():
+    assert compute_scenario(24, 0.0, 0.0, 20.0, 30.0, 5.0).discount_percentage == 0
+    pdf = generate_annual_pdf_report(get_store(DATA), 0.0, 20.0, 30.0, 5.0, 0.0)
+    assert pdf.getvalue().startswith(b'%PDF')
+
+
+def test_annual_report_with_infeasible_price():
+    pdf = generate_annual_pdf_report(get_store(DATA), 100.0, 20.0, 30.0, 5.0, 25.0)
+    assert pdf.getvalue().startswith(b'%PDF')
@@ -0,0 +1,97 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from precificador.portfolio import plan_frame, plan_portfolio
+
+SERVICES = ['Drenagem', 'Massagem']
+ORIGINAL = np.array([100.0, 150.0])
+COST = np.array([20.0, 40.0])
+ELASTICITY = np.array([-2.0, -1.5])
+
+
+def _demand(scale=1.0):
+    months = np.arange(12)
+    return scale * np.vstack([30 + 10 * np.sin(months), 20 + 5 * np.cos(months)])
+
+
+def test_without_binding_capacity_prices_are_the_unconstrained_optimum():
+    plan = plan_portfolio(SERVICES, _demand(), ORIGINAL, COST, 30, ELASTICITY, capacity_hours=10_000)
+    # Ótimo com elasticidade constante: custo / (1 - comissão) · e / (1 + e), arredondado para cima
+    # e limitado ao preço original (a massagem, 171,43, fica no preço cheio)
+    optimum = COST / 0.7 * ELASTICITY / (1 + ELASTICITY)
+    expected = np.minimum(np.ceil(optimum * 100) / 100, ORIGINAL)
+    assert plan.prices == pytest.approx(np.repeat(expected[:, None], 12, axis=1))
+    assert (plan.shadow_price == 0).all()
+    assert plan.sessions == pytest.approx(plan.demand)
+
+
+def test_plan_respects_monthly_capacity():
+    capacity = np.linspace(20, 60, 12)
+    plan = plan_portfolio(SERVICES, _demand(2.0), ORIGINAL, COST, 30, ELASTICITY, capacity_hours=capacity)
+    assert (plan.used_hours <= capacity + 1e-9).all()
+    assert (plan.sessions <= plan.demand + 1e-9).all()
+    assert (plan.prices <= ORIGINAL[:, None]).all()
+    assert (plan.shadow_price > 0).all()
+
+
+def test_plan_is_never_worse_than_no_promotion():
+    for capacity in (15, 40, 500):
+        plan = plan_portfolio(SERVICES, _demand(), ORIGINAL, COST, 30, ELASTICITY, capacity_hours=capacity)
+        assert ((plan.baseline_sessions * 50 / 60).sum(axis=0) <= capacity + 1e-9).all()
+        assert (plan.profit.sum(axis=0) >= plan.baseline_profit.sum(axis=0) - 1e-6).all()
+
+
+def test_cent_rounding_never_leaves_a_month_below_no_promotion():
+    # Entradas aleatórias; sem o recuo para o preço cheio, 3 desses meses ficavam abaixo do plano sem promoção
+    rng = np.random.default_rng(4)
+    for _ in range(200):
+        n = int(rng.integers(1, 5))
+        original = np.round(rng.uniform(30, 250, n), 2)
+        demand = rng.uniform(0, 60, (n, 12))
+        cost = np.round(original * rng.uniform(0.05, 0.8, n), 2)
+        plan = plan_portfolio(list(range(n)), demand, original, cost, rng.uniform(0, 60),
+                              rng.uniform(-3, -0.8, n), rng.uniform(1, 200))
+        assert (plan.profit.sum(axis=0) >= plan.baseline_profit.sum(axis=0)).all()
+        assert (plan.used_hours <= plan.capacity_hours + 1e-9).all()
+        assert plan.prices * 100 == pytest.approx(np.round(plan.prices * 100))
+
+
+@pytest.mark.parametrize('capacity', [50, 60, 80])
+def test_matches_brute_force_grid(capacity):
+    demand = np.array([[30.0], [20.0]])
+    plan = plan_portfolio(SERVICES, demand, ORIGINAL, COST, 30, ELASTICITY, capacity)
+
+    best = 0.0
+    for price_a, price_b in product(np.arange(29, 100.01, 0.25), np.arange(58, 150.01, 0.25)):
+        sessions_a = 30 * (price_a / 100) ** -2
+        sessions_b = 20 * (price_b / 150) ** -1.5
+        if 50 / 60 * (sessions_a + sessions_b) > capacity:
+            continue
+        best = max(best, (0.7 * price_a - 20) * sessions_a + (0.7 * price_b - 40) * sessions_b)
+
+    assert plan.used_hours[0] <= capacity + 1e-9
+    assert plan.profit.sum() >= best - 1e-6
+    assert plan.profit.sum() == pytest.approx(best, rel=1e-3)
+
+
+def test_max_discount_limits_prices():
+    plan = plan_portfolio(SERVICES, _demand(), ORIGINAL, COST, 30, ELASTICITY, capacity_hours=10_000,
+                          max_discount=0.2)
+    assert (plan.discount <= 0.2 + 1e-9).all()
+    assert (plan.prices >= ORIGINAL[:, None] * 0.8 - 1e-9).all()
+
+
+def test_unprofitable_service_is_not_booked():
+    plan = plan_portfolio(SERVICES, _demand(), ORIGINAL, [20.0, 120.0], 30, ELASTICITY, capacity_hours=10_000)
+    assert (plan.sessions[1] == 0).all() and (plan.profit[1] == 0).all()
+    assert (plan.baseline_sessions[1] == 0).all()
+
+
+def test_plan_frame_has_one_row_per_service_and_month():
+    plan = plan_portfolio(SERVICES, _demand(), ORIGINAL, COST, 30, ELASTICITY, capacity_hours=40)
+    frame = plan_frame(plan)
+    assert len(frame) == 24
+    assert frame['Lucro'].sum() == pytest.approx(plan.profit.sum())
+    assert frame.loc[frame['Servico'] == 'Massagem', 'Preco'].tolist() == plan.prices[1].tolist()
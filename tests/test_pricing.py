@@ -0,0 +1,95 @@
+import dataclasses
+import math
+
+import numpy as np
+import pytest
+
+from precificador.pricing import (INPUT_COLUMNS, RESULT_COLUMNS, Scenario, compute_scenario, compute_scenarios,
+                                  compute_scenarios_cents, scenario_grid)
+
+
+def test_reference_scenario():
+    scenario = compute_scenario(24, 100.0, 100.0, 20.0, 30.0, 5.0)
+    assert scenario.without_promo == (2400.0, 720.0, 480.0, 1200.0)
+    assert scenario.desired_spa_revenue == 1260.0
+    assert scenario.profit_per_promo_service == 50.0
+    assert scenario.required_quantity == 26
+    assert scenario.with_promo == (2600.0, 780.0, 520.0, 1300.0)
+    assert scenario.discount_percentage == 0.0
+    assert scenario.profit_change_percentage == pytest.approx(100 / 12)
+
+
+def test_scenario_is_immutable():
+    scenario = compute_scenario(24, 100.0, 80.0, 20.0, 30.0, 5.0)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        scenario.required_quantity = 1
+
+
+def test_infeasible_scenario():
+    scenario = compute_scenario(24, 100.0, 25.0, 20.0, 30.0, 5.0)
+    assert not scenario.feasible
+    assert scenario.required_quantity is None
+    assert all(math.isnan(value) for value in scenario.with_promo)
+
+
+def test_from_results_selects_one_batch_position():
+    prices = np.array([70.0, 80.0, 90.0])
+    inputs = dict(zip(INPUT_COLUMNS, (24, 100.0, prices, 20.0, 30.0, 5.0)))
+    results = compute_scenarios(**inputs)
+    for i, price in enumerate(prices):
+        assert Scenario.from_results(inputs, results, i) == compute_scenario(24, 100.0, price, 20.0, 30.0, 5.0)
+
+
+def test_scenario_grid_is_cartesian_product():
+    grid = scenario_grid(demand=24, original_price=100.0, promotional_price=[70.0, 80.0, 90.0],
+                         service_cost=20.0, commission_percentage=[20.0, 30.0], desired_profit_increase=5.0)
+    assert len(grid) == 6
+    assert set(INPUT_COLUMNS + RESULT_COLUMNS) <= set(grid.columns)
+    row = grid[(grid.promotional_price == 80.0) & (grid.commission_percentage == 20.0)].iloc[0]
+    assert row.required_quantity == compute_scenario(24, 100.0, 80.0, 20.0, 20.0, 5.0).required_quantity
+    with pytest.raises(ValueError):
+        scenario_grid(demand=24)
+
+
+@pytest.mark.parametrize('promotional_price, commission, expected', [
+    (100.0, 30.0, 24),   # meta 1200 / lucro 50: divisão exata não ganha um atendimento a mais
+    (31.0, 22.5, 360),   # em float a divisão dá 360.0000000000001
+    (32.0, 30.0, 525),   # em float, 525.0000000000003
+    (80.0, 30.0, 34),    # 1200 / 36 = 33,3 -> 34
+])
+def test_required_quantity_is_the_exact_ceiling(promotional_price, commission, expected):
+    increase = 0.0 if promotional_price in (100.0, 80.0) else 5.0
+    scenario = compute_scenario(24, 100.0, promotional_price, 20.0, commission, increase)
+    assert scenario.required_quantity == expected
+    # A quantidade atinge a meta e uma a menos não atinge
+    profit, target = scenario.profit_per_promo_service, scenario.desired_spa_revenue
+    assert round(expected * profit, 2) >= target > round((expected - 1) * profit, 2)
+
+
+def test_required_quantity_is_zero_when_target_is_already_met():
+    # Sem promoção o spa perde dinheiro: a meta é negativa e nenhum atendimento é necessário
+    scenario = compute_scenario(24, 30.0, 60.0, 20.0, 40.0, 5.0)
+    assert scenario.desired_spa_revenue < 0
+    assert scenario.required_quantity == 0
+
+
+def test_selected_columns_match_full_results():
+    prices = np.array([25.0, 70.0, 90.0])
+    columns = ('required_quantity', 'profit_per_promo_service', 'feasible')
+    full = compute_scenarios(24, 100.0, prices, 20.0, np.array([[20.0], [30.0]]), 5.0)
+    lean = compute_scenarios(24, 100.0, prices, 20.0, np.array([[20.0], [30.0]]), 5.0, columns=columns)
+    assert tuple(lean) == columns
+    for name in columns:
+        np.testing.assert_array_equal(lean[name], full[name])
+    with pytest.raises(ValueError):
+        compute_scenarios(24, 100.0, prices, 20.0, 30.0, 5.0, columns=('lucro',))
+
+
+def test_cents_core_matches_reais():
+    inputs = (24, 100.0, np.array([25.0, 80.0]), 20.0, 30.0, 5.0)
+    reais = compute_scenarios(*inputs)
+    cents = compute_scenarios_cents(24, 10_000, np.array([2500, 8000]), 2000, 3000, 500)
+    assert cents['required_quantity'].tolist() == [0, 35]  # 1260 / 36, exato
+    assert cents['feasible'].tolist() == [False, True]
+    assert cents['total_promo_revenue'][1] == round(reais['total_promo_revenue'][1] * 100)
+    assert np.isnan(reais['total_promo_revenue'][0])
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from precificador.pricing import compute_scenario
+from precificador import promo_solver
+from precificador.promo_solver import OBJECTIVES, evaluate_prices, price_bounds, solve_promotional_price
+
+# Cenário de referência: 24 atendimentos a R$ 100, custo R$ 20, comissão 30%, meta +5%
+ARGS = (24.0, 3.0, 100.0, 20.0, 30.0, 5.0)
+
+
+def test_price_bounds_is_breakeven_to_original():
+    lower, upper = price_bounds(100.0, 20.0, 30.0)
+    assert lower == pytest.approx(20.0 / 0.7)
+    assert upper == 100.0
+    assert price_bounds(100.0, 20.0, 100.0) is None
+    assert price_bounds(100.0, 80.0, 30.0) is None
+
+
+def test_min_volume_stays_inside_discount_range():
+    result = solve_promotional_price(*ARGS, objective='min_volume', min_discount=0.10, max_discount=0.40)
+    assert result.feasible
+    assert 60.0 <= result.price <= 90.0
+    # Nenhum preço da faixa exige menos atendimentos que o escolhido
+    prices = np.round(np.arange(60.0, 90.001, 0.01), 2)
+    quantities = evaluate_prices(prices, *ARGS)['required_quantity']
+    assert result.required_quantity == quantities.min()
+    # E ele é o menor preço com essa quantidade
+    assert result.price == prices[quantities == quantities.min()].min()
+
+
+def test_min_volume_without_discount_floor_is_original_price():
+    result = solve_promotional_price(*ARGS, objective='min_volume')
+    # Quantidade do preço cheio, ao menor preço que ainda a mantém
+    assert result.price > 90.0
+    assert result.required_quantity == compute_scenario(24.0, 100.0, 100.0, 20.0, 30.0, 5.0).required_quantity
+
+
+def test_max_profit_respects_discount_range_and_elasticity():
+    unconstrained = solve_promotional_price(*ARGS, objective='max_profit', elasticity=-3.0)
+    constrained = solve_promotional_price(*ARGS, objective='max_profit', elasticity=-3.0, max_discount=0.20)
+    assert unconstrained.price < 80.0
+    assert constrained.price == 80.0
+    # Demanda inelástica: o lucro só cresce com o preço
+    assert solve_promotional_price(*ARGS, objective='max_profit', elasticity=0.0).price == 100.0
+
+
+def test_wide_range_keeps_prices_in_whole_cents(monkeypatch):
+    monkeypatch.setattr(promo_solver, 'MAX_GRID_POINTS', 1_000)
+    for objective in OBJECTIVES:
+        result = solve_promotional_price(*ARGS, objective=objective, elasticity=-3.0, min_discount=0.05)
+        assert result.feasible
+        assert result.price * 100 == round(result.price * 100)
+        assert result.price <= 95.0
+    # O teto da faixa continua na grade
+    assert solve_promotional_price(*ARGS, objective='max_profit', min_discount=0.05).price == 95.0
+
+
+def test_infeasible_discount_range():
+    result = solve_promotional_price(*ARGS, min_discount=0.75, max_discount=0.90)
+    assert not result.feasible
+    assert result.message
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        solve_promotional_price(*ARGS, objective='qualquer')
+    with pytest.raises(ValueError):
+        solve_promotional_price(*ARGS, min_discount=0.5, max_discount=0.1)
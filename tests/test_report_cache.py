@@ -0,0 +1,39 @@
+import threading
+
+from precificador.report_cache import ReportCache, report_key
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = ReportCache(maxsize=2)
+    cache.put('a', b'A')
+    cache.put('b', b'B')
+    assert cache.get('a') == b'A'
+    cache.put('c', b'C')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'A' and cache.get('c') == b'C'
+
+
+def test_report_key_depends_on_every_input():
+    assert report_key('x', 1, 2.0) == report_key('x', 1, 2.0)
+    assert report_key('x', 1, 2.0) != report_key('x', 1, 2.5)
+
+
+def test_counters_are_exact_under_concurrency():
+    cache = ReportCache(maxsize=8)
+    cache.put('pronto', b'PDF')
+    calls_per_thread, threads = 2_000, 8
+
+    def work():
+        for _ in range(calls_per_thread):
+            cache.get_or_create('pronto', lambda: b'novo')
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert cache.hits == calls_per_thread * threads
+    assert cache.misses == 0
+
+    assert cache.get_or_create('novo', lambda: b'N') == b'N'
+    assert cache.misses == 1
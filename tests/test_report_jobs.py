@@ -0,0 +1,74 @@
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+pytest.importorskip('reportlab')
+
+from precificador.pricing import compute_scenario
+from precificador.report_cache import ReportCache
+from precificador.report_jobs import DONE, ReportQueue, _worker_context
+
+SERVICE = 'Massagem Relaxante (50 min)'
+
+
+@pytest.fixture
+def queue():
+    queue = ReportQueue(workers=1, cache=ReportCache())
+    yield queue
+    queue.shutdown(wait=True)
+
+
+@pytest.fixture
+def streamlit_main(tmp_path, monkeypatch):
+    """Simula o Streamlit: um script como ``__main__`` que deixa um rastro se for reexecutado"""
+    marker = tmp_path / 'reexecutado'
+    script = tmp_path / 'app.py'
+    script.write_text(f"open({str(marker)!r}, 'w').close()\n")
+    main = types.ModuleType('__main__')
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, '__main__', main)
+    return marker
+
+
+def _loaded(names):
+    return {name: name in sys.modules for name in names}
+
+
+def test_workers_start_from_forkserver_with_the_worker_preloaded(streamlit_main):
+    if sys.platform == 'win32':
+        pytest.skip("forkserver não existe no Windows")
+    context = _worker_context()
+    assert context.get_start_method() == 'forkserver'
+    assert _worker_context() is context
+    main = sys.modules['__main__']
+    with ProcessPoolExecutor(1, mp_context=context) as executor:
+        loaded = executor.submit(_loaded, ['precificador.pdf_report', 'streamlit']).result(timeout=120)
+        # O __main__ do processo pai nunca é trocado
+        assert sys.modules['__main__'] is main
+    assert loaded == {'precificador.pdf_report': True, 'streamlit': False}
+    assert not streamlit_main.exists()
+
+
+def test_report_is_rendered_cached_and_deduplicated(queue, streamlit_main):
+    scenario = compute_scenario(24, 100.0, 80.0, 20.0, 30.0, 5.0)
+    job = queue.submit(scenario, SERVICE, 9, 4.0)
+    assert queue.submit(scenario, SERVICE, 9, 4.0) is job
+
+    data = job.future.result(timeout=120)
+    assert data.startswith(b'%PDF')
+    assert job.state == DONE and job.error is None
+    assert queue.pending() == 0
+    assert not streamlit_main.exists(), "o processo de trabalho reexecutou o __main__"
+
+    cached = queue.submit(scenario, SERVICE, 9, 4.0)
+    assert cached is not job and cached.done and cached.data == data
+
+
+def test_failure_is_reported_on_the_job(queue):
+    job = queue.submit(None, SERVICE, 9, 4.0)
+    with pytest.raises(Exception):
+        job.future.result(timeout=120)
+    assert job.error
+    assert queue.cache.get(job.key) is None
@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+from precificador.pricing import INPUT_COLUMNS, compute_scenario
+from precificador.scenario_history import ScenarioHistory, input_key
+
+SERVICE = 'Massagem Relaxante (50 min)'
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = ScenarioHistory(str(tmp_path / 'historico.db'), batch_size=3, flush_interval=3600)
+    yield history
+    history.close()
+
+
+def _inputs(promotional_price):
+    return dict(zip(INPUT_COLUMNS, (24, 100.0, promotional_price, 20.0, 30.0, 5.0)))
+
+
+def test_repeated_inputs_come_from_history(history):
+    first, cached = history.get_or_compute(SERVICE, 9, **_inputs(80.0))
+    assert not cached
+    second, cached = history.get_or_compute(SERVICE, 9, **_inputs(80.0))
+    assert cached
+    assert second == first == compute_scenario(**_inputs(80.0))
+    assert history.count() == 1
+
+
+def test_key_depends_on_service_month_and_inputs():
+    key = input_key(SERVICE, 9, _inputs(80.0))
+    assert key == input_key(SERVICE, 9, _inputs(80))
+    assert key != input_key(SERVICE, 10, _inputs(80.0))
+    assert key != input_key('Outro', 9, _inputs(80.0))
+    assert key != input_key(SERVICE, 9, _inputs(80.01))
+
+
+def test_pending_rows_are_flushed_in_batches(history):
+    for price in (70.0, 80.0):
+        history.get_or_compute(SERVICE, 9, **_inputs(price))
+    assert len(history._pending) == 2
+    history.get_or_compute(SERVICE, 9, **_inputs(90.0))
+    assert not history._pending
+
+
+def test_infeasible_scenario_round_trip(tmp_path):
+    path = str(tmp_path / 'historico.db')
+    history = ScenarioHistory(path)
+    history.get_or_compute(SERVICE, 9, **_inputs(25.0))
+    history.close()
+
+    reopened = ScenarioHistory(path)
+    scenario, cached = reopened.get_or_compute(SERVICE, 9, **_inputs(25.0))
+    reopened.close()
+    assert cached
+    assert not scenario.feasible
+    assert scenario.required_quantity is None
+    assert all(math.isnan(value) for value in scenario.with_promo)
+
+
+def test_pages_follow_the_cursor_newest_first(history):
+    prices = [60.0 + i for i in range(7)]
+    for price in prices:
+        history.get_or_compute(SERVICE, 9 if price < 64 else 10, **_inputs(price))
+
+    seen, cursor = [], None
+    while True:
+        page = history.page(limit=3, cursor=cursor)
+        seen.extend(entry.scenario.promotional_price for entry in page.entries)
+        cursor = page.cursor
+        if cursor is None:
+            break
+    assert sorted(seen) == prices and len(seen) == len(set(seen))
+    assert all(entry.month == 10 for entry in history.page(month=10).entries)
+    assert len(history.page(month=10).entries) == 3
+    assert history.count(SERVICE) == 7 and history.count('Outro') == 0
@@ -0,0 +1,94 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from precificador import columnar
+from precificador.seasonal_store import MonthStats, SeasonalStore, collapse_history, get_store, service_plural
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dados_sazonais.csv')
+SERVICE = 'Drenagem Linfática corporal (50 min)'
+
+
+def _bump_mtime(path, reference):
+    """Garante mtime mais novo que a referência, mesmo em sistemas de arquivos com mtime grosseiro"""
+    stat = os.stat(reference)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _edit_media(csv_path, service, month, value):
+    df = pd.read_csv(csv_path)
+    df.loc[(df['Servico'] == service) & (df['Mes'] == month), 'Media'] = value
+    df.to_csv(csv_path, index=False)
+
+
+def test_lookup_and_service_data():
+    df = pd.DataFrame({'Mes': [2, 1], 'Servico': ['A', 'A'], 'Media': [5, 3], 'Desvio_padrao': [1.0, 0.5]})
+    store = SeasonalStore(df, 'v1')
+    assert store.lookup('A', 1) == MonthStats(3.0, 0.5)
+    assert store.lookup('A', 3) is None
+    assert store.service_data('A')['Mes'].tolist() == [1, 2]
+    assert store.service_data('B').empty
+
+
+def test_service_plural_covers_services_from_the_data():
+    assert service_plural(SERVICE) == 'drenagens'
+    assert service_plural('Massagem Relaxante (50 min)') == 'massagens'
+    assert service_plural('Reflexologia (30 min)') == 'atendimentos de Reflexologia'
+
+
+def test_collapse_history_uses_latest_year_and_sums_units():
+    df = pd.DataFrame({
+        'Ano': [2024, 2025, 2025], 'Unidade': ['U1', 'U1', 'U2'], 'Mes': [1, 1, 1],
+        'Servico': ['A', 'A', 'A'], 'Media': [100, 10, 20], 'Desvio_padrao': [9.0, 3.0, 4.0],
+    })
+    collapsed = collapse_history(df)
+    assert collapsed[['Media', 'Desvio_padrao']].values.tolist() == [[30, 5.0]]
+
+
+def test_collapse_history_keeps_months_and_services_missing_from_the_latest_year():
+    df = pd.DataFrame({
+        'Ano': [2024, 2024, 2025, 2024],
+        'Mes': [1, 2, 1, 1],
+        'Servico': ['A', 'A', 'A', 'B'],
+        'Media': [10, 20, 11, 30],
+        'Desvio_padrao': [1.0, 2.0, 1.5, 3.0],
+    })
+    store = SeasonalStore(collapse_history(df), 'v1')
+    # 2025 só tem janeiro de A: fevereiro de A e todo o B vêm de 2024
+    assert store.lookup('A', 1) == MonthStats(11.0, 1.5)
+    assert store.lookup('A', 2) == MonthStats(20.0, 2.0)
+    assert store.lookup('B', 1) == MonthStats(30.0, 3.0)
+
+
+@pytest.mark.parametrize('parquet', [False, True])
+def test_single_value_edit_reloads_store(tmp_path, parquet):
+    if parquet:
+        pytest.importorskip('pyarrow')
+    csv_path = str(tmp_path / 'dados_sazonais.csv')
+    shutil.copy(DATA, csv_path)
+    path = columnar.ensure_parquet(csv_path) if parquet else csv_path
+
+    store = get_store(path)
+    assert store.lookup(SERVICE, 1).media == 14
+
+    _edit_media(csv_path, SERVICE, 1, 15)
+    if parquet:
+        _bump_mtime(csv_path, path)
+        columnar.ensure_parquet(csv_path)
+    else:
+        _bump_mtime(csv_path, csv_path)
+
+    reloaded = get_store(path)
+    assert reloaded is not store
+    assert reloaded.version != store.version
+    assert reloaded.lookup(SERVICE, 1).media == 15
+
+
+def test_touch_without_changes_keeps_store(tmp_path):
+    csv_path = str(tmp_path / 'dados_sazonais.csv')
+    shutil.copy(DATA, csv_path)
+    store = get_store(csv_path)
+    _bump_mtime(csv_path, csv_path)
+    assert get_store(csv_path) is store
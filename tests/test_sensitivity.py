@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+import pytest
+
+from precificador.pricing import compute_scenario
+from precificador.sensitivity import TORNADO_FACTORS, price_commission_grid, tornado
+
+# demanda, desvio, preço original, custo, lucro adicional (%)
+BASE = (24.0, 4.0, 100.0, 20.0, 5.0)
+
+
+def test_grid_matches_single_scenarios():
+    grid = price_commission_grid(*BASE, size=21)
+    assert grid.required_quantity.shape == grid.expected_profit.shape == (21, 21)
+    assert grid.prices[0] == 20.0 and grid.prices[-1] == 100.0
+    assert grid.commissions[0] == 0.0 and grid.commissions[-1] == 130.0
+
+    for i, j in [(5, 3), (20, 4), (10, 0)]:
+        scenario = compute_scenario(24, 100.0, grid.prices[i], 20.0, grid.commissions[j], 5.0)
+        assert grid.required_quantity[i, j] == scenario.required_quantity
+        assert grid.expected_profit[i, j] == pytest.approx(scenario.profit_per_promo_service * 24)
+
+
+def test_grid_marks_infeasible_combinations():
+    grid = price_commission_grid(*BASE, size=21)
+    # Comissão acima de 100% nunca cobre o custo
+    assert np.isnan(grid.required_quantity[:, grid.commissions > 100]).all()
+    # No preço igual ao custo não sobra margem
+    assert np.isnan(grid.required_quantity[0]).all()
+
+
+def test_grid_is_cached_and_read_only():
+    grid = price_commission_grid(*BASE, size=21)
+    assert price_commission_grid(*BASE, size=21) is grid
+    with pytest.raises(ValueError):
+        grid.required_quantity[0, 0] = 1.0
+
+
+def test_tornado_base_and_bars():
+    result = tornado(24.0, 4.0, 100.0, 80.0, 20.0, 30.0, 5.0)
+    base = compute_scenario(24, 100.0, 80.0, 20.0, 30.0, 5.0)
+    assert result.base_quantity == base.required_quantity
+    assert result.base_profit == pytest.approx(base.profit_per_promo_service * 24)
+    assert {bar.factor for bar in result.bars} == set(TORNADO_FACTORS)
+
+    spans = [abs(bar.high_quantity - bar.low_quantity) for bar in result.bars]
+    assert spans == sorted(spans, reverse=True)
+
+    commission = next(bar for bar in result.bars if bar.factor == 'Comissão')
+    assert (commission.low_value, commission.high_value) == pytest.approx((24.0, 36.0))
+    assert commission.high_quantity == compute_scenario(24, 100.0, 80.0, 20.0, 36.0, 5.0).required_quantity
+    assert commission.low_quantity <= result.base_quantity < commission.high_quantity
+    assert commission.low_profit > result.base_profit > commission.high_profit
+
+
+def test_tornado_puts_infeasible_swing_first():
+    # Custo 20% maior (66) deixa a promoção sem margem: amplitude infinita
+    result = tornado(24.0, 4.0, 100.0, 80.0, 55.0, 30.0, 5.0)
+    first = result.bars[0]
+    assert first.factor == 'Custo por Serviço'
+    assert math.isnan(first.high_quantity)